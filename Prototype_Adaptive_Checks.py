@@ -0,0 +1,146 @@
+# Adaptive check-round scheduling for Prototype_Trial_2_Check_Rounds.SumOfColumnsSimulator, driven by
+# a sequential probability ratio test (Wald's SPRT) on the check rounds' pass/fail flags.
+#
+# Even on a clean channel a check round is flagged with some probability p0: the verification rule
+# flags odd X parity whenever 2+ nodes chose X, but with a Z node among them the X outcomes are
+# independent coin flips (ideal_flag_rate: 0.3125 for 4 nodes; noise adds to it). Under tampering the
+# rate rises to p1 = p0 + disturbance * (1 - p0). Each check adds to the log-likelihood ratio
+#   log(p1 / p0) if flagged, log((1 - p1) / (1 - p0)) if passed,
+# and the scheduler acts on it:
+#   - LLR >= log((1 - beta) / alpha): tampering, with false-alarm probability <= alpha; the protocol stops.
+#   - LLR <= log(beta / (1 - alpha)): the channel looks clean (missed-attack probability <= beta); the
+#     test restarts and the check interval doubles, up to max_interval sum rounds.
+#   - LLR past half the tampering threshold: evidence is building; the interval halves, down to min_interval.
+#   - LLR past half the clean threshold: the channel looks clean so far; the interval grows by one.
+# A fixed check_round_frequency aborts on the first flagged check, so with p0 > 0 clean runs rarely finish;
+# the test instead spends few checks on a clean channel and concentrates them when evidence builds.
+import math
+
+CONTINUE = "continue"
+CLEAN = "clean"
+TAMPERING = "tampering"
+
+def ideal_flag_rate(num_nodes):
+    """
+    Probability that an ideal GHZ check round with uniformly random bases is flagged. With k X nodes:
+    k = n has even parity by construction, k <= 1 checks nothing, otherwise the parity is a coin flip.
+    """
+    if num_nodes < 2:
+        return 0.0
+    return 0.5 * (1 - (num_nodes + 2) / 2**num_nodes)
+
+def calibrate_clean_flag_rate(simulator, num_rounds=20_000, seed=None):
+    """
+    Flag rate of untampered check rounds on the simulator's own channel (noise, ghz_extension), measured
+    in one batch with Prototype_Eavesdroppers. Use it as clean_flag_rate when the channel is noisy.
+    """
+    from Prototype_Eavesdroppers import NoAttack, evaluate_strategy
+    return float(evaluate_strategy(NoAttack(), simulator.num_nodes, num_rounds, "check", simulator, seed).detected.mean())
+
+class SPRTCheckScheduler:
+    def __init__(self, num_nodes, disturbance=0.25, clean_flag_rate=None, alpha=0.01, beta=0.05,
+                 initial_interval=3, min_interval=1, max_interval=64):
+        """
+        disturbance: the smallest attack the test is designed to catch, as the fraction of otherwise
+            passing check rounds it makes fail (p1 = p0 + disturbance * (1 - p0)). An X-basis intercept of
+            one of 4 qubits is ~0.29; a Z-basis one only ~0.05, which takes thousands of checks to tell apart.
+        clean_flag_rate: p0; defaults to ideal_flag_rate(num_nodes). For a noisy channel measure it
+            with calibrate_clean_flag_rate.
+        alpha: accepted probability of stopping a clean run; beta: of declaring an attacked channel clean.
+            Both hold per test, and the test restarts after every clean decision, so long runs see a few.
+        initial_interval / min_interval / max_interval: sum rounds between checks, at the start and as bounds.
+        """
+        self.clean_flag_rate = ideal_flag_rate(num_nodes) if clean_flag_rate is None else clean_flag_rate
+        self.tampered_flag_rate = self.clean_flag_rate + disturbance * (1 - self.clean_flag_rate)
+        if not 0 <= self.clean_flag_rate < self.tampered_flag_rate <= 1:
+            raise ValueError(f"Need 0 <= clean_flag_rate < tampered_flag_rate <= 1, got {self.clean_flag_rate} and "
+                             f"{self.tampered_flag_rate} (disturbance={disturbance})")
+        if not 1 <= min_interval <= initial_interval <= max_interval:
+            raise ValueError(f"Need 1 <= min_interval <= initial_interval <= max_interval, got {min_interval}, {initial_interval}, {max_interval}")
+        p0, p1 = self.clean_flag_rate, self.tampered_flag_rate
+        # p0 = 0: a clean channel never flags, so one flag settles it; p1 = 1: an attack never passes
+        self._flagged_step = math.log(p1 / p0) if p0 > 0 else math.inf
+        self._passed_step = math.log((1 - p1) / (1 - p0)) if p1 < 1 else -math.inf
+        self.alpha = alpha
+        self.beta = beta
+        self.upper_threshold = math.log((1 - beta) / alpha)
+        self.lower_threshold = math.log(beta / (1 - alpha))
+        self.initial_interval = initial_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.reset()
+
+    def reset(self):
+        """Starts a new run: fresh test, initial interval."""
+        self.interval = self.initial_interval
+        self.llr = 0.0
+        self.checks = 0
+        self.flagged_checks = 0
+        self.clean_decisions = 0
+        self.decision = None
+
+    def is_check_round(self, sum_rounds_since_check):
+        return sum_rounds_since_check >= self.interval
+
+    def record_check(self, flagged):
+        """Adds one check's outcome to the test and returns CONTINUE, CLEAN or TAMPERING."""
+        self.checks += 1
+        self.flagged_checks += bool(flagged)
+        self.llr += self._flagged_step if flagged else self._passed_step
+        if self.llr >= self.upper_threshold:
+            self.decision = TAMPERING
+        elif self.llr <= self.lower_threshold:
+            self.decision = CLEAN
+            self.clean_decisions += 1
+            self.llr = 0.0 # Keep watching: an attack may start later in the run
+            self.interval = min(self.max_interval, self.interval * 2)
+        else:
+            self.decision = CONTINUE
+            if self.llr >= self.upper_threshold / 2:
+                self.interval = max(self.min_interval, self.interval // 2)
+            elif self.llr <= self.lower_threshold / 2:
+                self.interval = min(self.max_interval, self.interval + 1)
+        return self.decision
+
+    def describe(self):
+        return (f"SPRT p0={self.clean_flag_rate:.4f} vs p1={self.tampered_flag_rate:.4f} (alpha={self.alpha}, beta={self.beta}), "
+                f"interval {self.interval} [{self.min_interval}..{self.max_interval}], LLR {self.llr:+.2f} "
+                f"in ({self.lower_threshold:.2f}, {self.upper_threshold:.2f})")
+
+
+if __name__ == "__main__":
+    import random
+    import time
+    from Prototype_Event_Log import quiet_log
+    from Prototype_Trial_2_Check_Rounds import SumOfColumnsSimulator
+
+    N_NODES = 4
+    TARGET_SUM_BITS = 400
+    TRIALS = 20
+
+    def run_trials(scheduler_factory, eavesdrop, eavesdropper_basis='X'):
+        """(finished runs, check rounds, total rounds, abort rounds) over TRIALS runs."""
+        finished, checks, rounds, aborts = 0, 0, 0, []
+        for trial in range(TRIALS):
+            random.seed(trial)
+            simulator = SumOfColumnsSimulator(num_nodes=N_NODES, num_ghz_states_for_sum=TARGET_SUM_BITS, check_round_frequency=3,
+                                              keep_round_history=False, event_log=quiet_log(), check_scheduler=scheduler_factory())
+            for record in simulator.iter_rounds(total_rounds=10 * TARGET_SUM_BITS, enable_eavesdropping_overall=eavesdrop,
+                                                eavesdropper_basis=eavesdropper_basis):
+                checks += record.kind == "check"
+                rounds += 1
+            finished += simulator.actual_sum_bits_collected >= TARGET_SUM_BITS
+            if simulator.abort_round is not None:
+                aborts.append(simulator.abort_round)
+        return finished, checks, rounds, aborts
+
+    for label, factory in (("fixed, every 3 sum rounds", lambda: None),
+                           ("SPRT, disturbance 0.25", lambda: SPRTCheckScheduler(N_NODES))):
+        for eavesdrop, eavesdropper_basis in ((False, 'Z'), (True, 'X'), (True, 'Z')):
+            start = time.perf_counter()
+            finished, checks, rounds, aborts = run_trials(factory, eavesdrop, eavesdropper_basis)
+            channel = f"eavesdropper {eavesdropper_basis} on Q0" if eavesdrop else "clean channel"
+            mean_abort = f"{sum(aborts) / len(aborts):.1f}" if aborts else "-"
+            print(f"{label:<26} {channel:<20}: {finished}/{TRIALS} runs collected {TARGET_SUM_BITS} bits, "
+                  f"{checks / max(rounds, 1):.1%} of {rounds} rounds were checks, {len(aborts)} aborted (mean abort round {mean_abort}) "
+                  f"[{time.perf_counter() - start:.1f} s]")
@@ -0,0 +1,396 @@
+# Asyncio actor model of the QMPC protocol's classical side.
+# Each QMPCNode runs as an actor with its own inbox; actors only talk through a ClassicalNetwork that
+# models per-link latency, jitter and loss (lost messages are retransmitted until acknowledged).
+# The quantum part (GHZ distribution + measurement) is treated as instantaneous and comes from a
+# pluggable engine, by default the closed-form sampler of Prototype_GHZ_Sampler.
+#
+# Classical steps per round, as in the real protocol:
+#   - Sum round: each node measures Z and announces its outcome to every peer; once all outcomes are
+#     in, it keeps the bit only if they agree and reports round completion to the source.
+#   - Check round: each node announces (basis, outcome) to every peer, verifies all announcements
+#     with the check-round rules, and reports its verdict to the source, which aborts on tampering.
+#   - Finalisation: each node broadcasts a digest of its sum, the nodes agree if all digests match,
+#     and each elects leader = sum % num_nodes.
+import asyncio
+import hashlib
+import itertools
+import random
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from Prototype_GHZ_Sampler import BASIS_X, BASIS_Z, detect_tampering, sample_check_rounds, sample_sum_rounds
+from Prototype_Trial_2_Check_Rounds import QMPCNode
+
+SOURCE = "source" # Address of the GHZ source / round coordinator
+
+class LinkModel:
+    def __init__(self, latency_s=0.001, jitter_s=0.0, loss_probability=0.0):
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.loss_probability = loss_probability
+
+class ClassicalNetwork:
+    """In-process message passing with modelled latency and loss, and ack-based retransmission."""
+    def __init__(self, default_link=None, link_overrides=None, retransmit_timeout_s=None, seed=None):
+        """link_overrides: {(src, dst): LinkModel} for individual directed links."""
+        self.default_link = default_link or LinkModel()
+        self.link_overrides = link_overrides or {}
+        self.retransmit_timeout_s = retransmit_timeout_s
+        self.rng = random.Random(seed)
+        self.inboxes = {}
+        self.stats = Counter()
+        self._sequence_numbers = defaultdict(itertools.count) # (src, dst) -> message ids on that link: 0, 1, 2, ...
+        self._pending_acks = {} # (src, dst, id) -> asyncio.Event
+        # address -> {src: [high-water mark, ids above it]}: every id below the mark has been delivered, so
+        # retransmissions are recognised while only ids that overtook an earlier one are held
+        self._seen = {}
+
+    def register(self, address):
+        self.inboxes[address] = asyncio.Queue()
+        self._seen[address] = {}
+
+    def _first_delivery(self, dst, src, message_id):
+        """Records message_id from src as delivered to dst; False if it was delivered before."""
+        window = self._seen[dst].setdefault(src, [0, set()])
+        mark, above = window
+        if message_id < mark or message_id in above:
+            return False
+        above.add(message_id)
+        while mark in above: # Ids only arrive out of order under jitter or loss, so this set stays small
+            above.remove(mark)
+            mark += 1
+        window[0] = mark
+        return True
+
+    def _link(self, src, dst):
+        return self.link_overrides.get((src, dst), self.default_link)
+
+    def _transmit(self, src, dst, message):
+        """One physical attempt: the message is lost, or lands after the link's latency."""
+        link = self._link(src, dst)
+        self.stats["transmissions"] += 1
+        if self.rng.random() < link.loss_probability:
+            self.stats["dropped"] += 1
+            return
+        delay = link.latency_s + self.rng.uniform(0.0, link.jitter_s)
+        asyncio.get_running_loop().call_later(delay, self._deliver, dst, message)
+
+    def _deliver(self, dst, message):
+        if message["type"] == "ack":
+            acked = self._pending_acks.get((dst, message["src"], message["ack_id"]))
+            if acked is not None:
+                acked.set()
+            return
+        # Acknowledge on arrival, then hand over to the actor unless it is a retransmitted duplicate
+        self._transmit(dst, message["src"], {"type": "ack", "ack_id": message["id"], "src": dst})
+        if not self._first_delivery(dst, message["src"], message["id"]):
+            self.stats["duplicates"] += 1
+            return
+        self.inboxes[dst].put_nowait(message)
+
+    async def send(self, src, dst, message_type, **payload):
+        """Reliable send: retransmits until the receiver's ack comes back."""
+        message = {"type": message_type, "id": next(self._sequence_numbers[(src, dst)]), "src": src}
+        message.update(payload)
+        link = self._link(src, dst)
+        # Default: a few worst-case round trips, plus slack for event-loop scheduling
+        timeout = self.retransmit_timeout_s or 3 * 2 * (link.latency_s + link.jitter_s) + 0.01
+        acked = asyncio.Event()
+        ack_key = (src, dst, message["id"])
+        self._pending_acks[ack_key] = acked
+        self.stats["messages"] += 1
+        try:
+            while True:
+                self._transmit(src, dst, message)
+                try:
+                    await asyncio.wait_for(acked.wait(), timeout)
+                    return
+                except asyncio.TimeoutError:
+                    self.stats["retransmissions"] += 1
+        finally:
+            del self._pending_acks[ack_key]
+
+    async def broadcast(self, src, destinations, message_type, **payload):
+        await asyncio.gather(*(self.send(src, dst, message_type, **payload) for dst in destinations))
+
+    async def receive(self, address):
+        return await self.inboxes[address].get()
+
+class ClosedFormEngine:
+    """Quantum part of a round drawn from the closed-form GHZ distribution (no circuits)."""
+    def __init__(self, num_nodes, eavesdropped_qubit_idx=None, eavesdropper_basis='Z', seed=None):
+        self.num_nodes = num_nodes
+        self.eavesdropped_qubit_idx = eavesdropped_qubit_idx
+        self.eavesdropper_basis = eavesdropper_basis
+        self.rng = np.random.default_rng(seed)
+
+    def measure(self, round_kind, node_bases_choices):
+        """Returns one outcome bit per node."""
+        if round_kind == "sum":
+            outcomes = sample_sum_rounds(self.num_nodes, 1, self.eavesdropped_qubit_idx, self.eavesdropper_basis, rng=self.rng)
+        else:
+            bases = np.array([[BASIS_X if b == 'X' else BASIS_Z for b in node_bases_choices]], dtype=np.uint8)
+            _, outcomes = sample_check_rounds(self.num_nodes, 1, self.eavesdropped_qubit_idx, self.eavesdropper_basis, rng=self.rng, bases=bases)
+        return [int(bit) for bit in outcomes[0]]
+
+class TableauEngine:
+    """
+    Quantum part of a round simulated gate by gate on a Clifford tableau (qiskit.quantum_info.StabilizerState).
+    Same operations and eavesdropper placement as the SumOfColumnsSimulator circuits, but no Aer backend,
+    no transpile and no job submission.
+    """
+    def __init__(self, num_nodes, eavesdropped_qubit_idx=None, eavesdropper_basis='Z', seed=None):
+        from qiskit import QuantumCircuit
+        from qiskit.circuit.library import HGate
+        from qiskit.quantum_info import StabilizerState
+
+        ghz = QuantumCircuit(num_nodes)
+        ghz.h(0)
+        for i in range(num_nodes - 1):
+            ghz.cx(i, i + 1)
+        self._ghz = StabilizerState(ghz) # Prepared once; measure() returns new states and leaves it intact
+        self._h = HGate()
+        self.num_nodes = num_nodes
+        self.eavesdropped_qubit_idx = eavesdropped_qubit_idx
+        self.eavesdropper_basis = eavesdropper_basis
+        self.rng = np.random.default_rng(seed)
+
+    def _measure(self, state, qubits):
+        """Measures qubits in Z; returns (bits in qubits order, post-measurement state)."""
+        state.seed(int(self.rng.integers(2**31)))
+        outcome, state = state.measure(qubits)
+        return [int(bit) for bit in reversed(outcome)], state # Outcome string is little-endian
+
+    def _eavesdrop(self, state):
+        q = self.eavesdropped_qubit_idx
+        if self.eavesdropper_basis == 'X':
+            state = state.evolve(self._h, [q])
+        bits, state = self._measure(state, [q])
+        return bits[0], state
+
+    def measure(self, round_kind, node_bases_choices):
+        """Returns one outcome bit per node."""
+        state = self._ghz
+        eavesdrop = self.eavesdropped_qubit_idx is not None
+        if round_kind == "sum":
+            outcomes, state = self._measure(state, list(range(self.num_nodes)))
+            if eavesdrop and self.eavesdropper_basis == 'X':
+                # Acts after the Z measurements and writes into the eavesdropped qubit's bit, as in the circuit
+                outcomes[self.eavesdropped_qubit_idx], _ = self._eavesdrop(state)
+            return outcomes
+        if eavesdrop:
+            _, state = self._eavesdrop(state) # Before the nodes measure; its outcome is discarded
+        for i, basis in enumerate(node_bases_choices):
+            if basis == 'X':
+                state = state.evolve(self._h, [i])
+        outcomes, _ = self._measure(state, list(range(self.num_nodes)))
+        return outcomes
+
+class QMPCNodeActor:
+    def __init__(self, node, network, num_nodes):
+        self.node = node
+        self.network = network
+        self.num_nodes = num_nodes
+        self.address = node.node_id
+        self.peers = [i for i in range(num_nodes) if i != node.node_id]
+        self.check_announcements = {} # round -> {node_id: (basis, outcome)}; peers may announce before our round starts
+        self.sum_announcements = {} # round -> {node_id: Z outcome}
+        self.sum_digests = {}
+        self._tasks = set()
+
+    def _send_later(self, coroutine):
+        """Fire-and-forget send so the actor keeps processing its inbox while waiting for acks."""
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _try_finish_check(self, round_idx):
+        announcements = self.check_announcements.get(round_idx)
+        if announcements is None or len(announcements) < self.num_nodes:
+            return
+        ordered = [announcements[i] for i in range(self.num_nodes)]
+        bases = np.array([[BASIS_X if basis == 'X' else BASIS_Z for basis, _ in ordered]], dtype=np.uint8)
+        outcomes = np.array([[outcome for _, outcome in ordered]], dtype=np.uint8)
+        detected = bool(detect_tampering(bases, outcomes)[0])
+        del self.check_announcements[round_idx]
+        self._send_later(self.network.send(self.address, SOURCE, "round_done", round=round_idx, detected=detected))
+
+    def _try_finish_sum(self, round_idx):
+        """Records the round's bit only if every node announced the same Z outcome, like _perform_sum_round."""
+        announcements = self.sum_announcements.get(round_idx)
+        if announcements is None or len(announcements) < self.num_nodes:
+            return
+        consistent = len(set(announcements.values())) == 1
+        if consistent:
+            self.node.record_sum_bit(announcements[self.address])
+        del self.sum_announcements[round_idx]
+        self._send_later(self.network.send(self.address, SOURCE, "round_done", round=round_idx, detected=False, consistent=consistent))
+
+    def _sum_digest(self):
+        return hashlib.sha256(str(self.node.calculate_sum()).encode()).hexdigest()
+
+    def _try_finish_election(self):
+        if len(self.sum_digests) < self.num_nodes:
+            return
+        agreed = len(set(self.sum_digests.values())) == 1
+        leader = self.node.sum_mod_nodes if agreed else None
+        self._send_later(self.network.send(self.address, SOURCE, "elected", leader=leader, agreed=agreed,
+                                           sum=self.node.calculate_sum()))
+
+    async def run(self):
+        while True:
+            message = await self.network.receive(self.address)
+            kind = message["type"]
+            if kind == "round_start" and message["round_kind"] == "sum":
+                round_idx = message["round"]
+                self.sum_announcements.setdefault(round_idx, {})[self.address] = message["outcome"]
+                self._send_later(self.network.broadcast(self.address, self.peers, "sum_announce", round=round_idx,
+                                                        outcome=message["outcome"]))
+                self._try_finish_sum(round_idx)
+            elif kind == "sum_announce":
+                self.sum_announcements.setdefault(message["round"], {})[message["src"]] = message["outcome"]
+                self._try_finish_sum(message["round"])
+            elif kind == "round_start":
+                round_idx = message["round"]
+                self.node.chosen_basis_for_check = message["basis"]
+                self.node.outcome_for_check = message["outcome"]
+                self.check_announcements.setdefault(round_idx, {})[self.address] = (message["basis"], message["outcome"])
+                self._send_later(self.network.broadcast(self.address, self.peers, "check_announce", round=round_idx,
+                                                        basis=message["basis"], outcome=message["outcome"]))
+                self._try_finish_check(round_idx)
+            elif kind == "check_announce":
+                self.check_announcements.setdefault(message["round"], {})[message["src"]] = (message["basis"], message["outcome"])
+                self._try_finish_check(message["round"])
+            elif kind == "finalize":
+                digest = self._sum_digest()
+                self.sum_digests[self.address] = digest
+                self._send_later(self.network.broadcast(self.address, self.peers, "sum_digest", digest=digest))
+                self._try_finish_election()
+            elif kind == "sum_digest":
+                self.sum_digests[message["src"]] = message["digest"]
+                if self.address in self.sum_digests: # Our own digest is added once finalize arrives
+                    self._try_finish_election()
+            elif kind == "stop":
+                await asyncio.gather(*self._tasks) # Let outstanding acks complete
+                return
+
+async def run_async_protocol(num_nodes, num_sum_bits, total_rounds, check_round_frequency=3,
+                             default_link=None, link_overrides=None, quantum_engine=None,
+                             eavesdropped_qubit_idx=None, eavesdropper_basis='Z', seed=None):
+    """
+    Runs the protocol with one actor per node and the source as coordinator.
+    Round scheduling matches SumOfColumnsSimulator.generate_shared_sum: a check round after every
+    check_round_frequency sum rounds, abort on a failed check, stop once num_sum_bits are collected.
+    In a sum round the nodes exchange their Z outcomes and keep the bit only if all agree; a
+    discarded round still counts towards the check schedule, as in _perform_sum_round.
+    Returns a report with end-to-end leader-election latency (None if the run aborted), rounds per second
+    and network counters.
+    """
+    rng = random.Random(seed)
+    network = ClassicalNetwork(default_link, link_overrides, seed=rng.getrandbits(32))
+    engine = quantum_engine or ClosedFormEngine(num_nodes, eavesdropped_qubit_idx, eavesdropper_basis, seed=rng.getrandbits(32))
+    network.register(SOURCE)
+    actors = []
+    for i in range(num_nodes):
+        network.register(i)
+        actors.append(QMPCNodeActor(QMPCNode(node_id=i, num_nodes=num_nodes), network, num_nodes))
+    actor_tasks = [asyncio.create_task(actor.run()) for actor in actors]
+
+    async def collect(message_type, round_idx=None):
+        replies = []
+        while len(replies) < num_nodes:
+            message = await network.receive(SOURCE)
+            if message["type"] == message_type and message.get("round", round_idx) == round_idx:
+                replies.append(message)
+        return replies
+
+    start = time.perf_counter()
+    sum_round_counter = 0
+    sum_bits = 0
+    discarded_sum_rounds = 0
+    rounds_run = 0
+    abort_round = None
+    for r_idx in range(total_rounds + 1):
+        rounds_run = r_idx + 1
+        is_check = sum_round_counter > 0 and sum_round_counter % check_round_frequency == 0
+        if is_check:
+            bases = [actor.node.choose_random_basis() for actor in actors] # Local measurement settings
+            outcomes = engine.measure("check", bases)
+        else:
+            bases = ['Z'] * num_nodes
+            outcomes = engine.measure("sum", bases)
+        await asyncio.gather(*(network.send(SOURCE, i, "round_start", round=r_idx, round_kind="check" if is_check else "sum",
+                                            basis=bases[i], outcome=outcomes[i]) for i in range(num_nodes)))
+        replies = await collect("round_done", r_idx)
+        if is_check:
+            if any(reply["detected"] for reply in replies):
+                abort_round = r_idx + 1
+                break
+            sum_round_counter = 0
+        else:
+            sum_round_counter += 1
+            if all(reply["consistent"] for reply in replies):
+                sum_bits += 1
+            else:
+                discarded_sum_rounds += 1
+        if sum_bits >= num_sum_bits:
+            break
+    rounds_elapsed = time.perf_counter() - start
+
+    leader = agreed_sum = None
+    agreed = False
+    if abort_round is None:
+        await asyncio.gather(*(network.send(SOURCE, i, "finalize") for i in range(num_nodes)))
+        elections = await collect("elected")
+        agreed = all(reply["agreed"] for reply in elections) and len({reply["leader"] for reply in elections}) == 1
+        if agreed:
+            leader, agreed_sum = elections[0]["leader"], elections[0]["sum"]
+    election_latency = time.perf_counter() - start if abort_round is None else None # No election after an abort
+
+    await asyncio.gather(*(network.send(SOURCE, i, "stop") for i in range(num_nodes)))
+    await asyncio.gather(*actor_tasks)
+    return {
+        "leader": leader,
+        "agreed_sum": agreed_sum,
+        "agreed": agreed,
+        "abort_round": abort_round,
+        "rounds_run": rounds_run,
+        "sum_bits": sum_bits,
+        "discarded_sum_rounds": discarded_sum_rounds,
+        "election_latency_s": election_latency,
+        "rounds_per_second": rounds_run / rounds_elapsed if rounds_elapsed > 0 else float("inf"),
+        "network": dict(network.stats),
+    }
+
+def run_protocol(*args, **kwargs):
+    """Synchronous wrapper around run_async_protocol."""
+    return asyncio.run(run_async_protocol(*args, **kwargs))
+
+
+if __name__ == "__main__":
+    N_NODES = 4
+    TARGET_SUM_BITS = 16
+    CHECK_FREQUENCY = 4
+    TOTAL_ROUNDS_TO_RUN = TARGET_SUM_BITS + TARGET_SUM_BITS // CHECK_FREQUENCY
+    NO_CHECKS = TOTAL_ROUNDS_TO_RUN + 1 # Never reached: sum rounds only
+
+    # Even an ideal check round is flagged ~31% of the time (see Prototype_Adaptive_Checks), so runs with
+    # check rounds usually abort before the election; the runs without them show the election latency.
+    scenarios = [
+        ("LAN, lossless, no check rounds", LinkModel(latency_s=0.0005), None, NO_CHECKS),
+        ("WAN 20 ms, 5 ms jitter, no check rounds", LinkModel(latency_s=0.020, jitter_s=0.005), None, NO_CHECKS),
+        ("WAN 20 ms, 10% loss, no check rounds", LinkModel(latency_s=0.020, loss_probability=0.10), None, NO_CHECKS),
+        ("LAN, lossless", LinkModel(latency_s=0.0005), None, CHECK_FREQUENCY),
+        ("LAN, eavesdropper X on Q0", LinkModel(latency_s=0.0005), (0, 'X'), CHECK_FREQUENCY),
+    ]
+    for label, link, eavesdropper, check_frequency in scenarios:
+        report = run_protocol(N_NODES, TARGET_SUM_BITS, TOTAL_ROUNDS_TO_RUN, check_frequency, default_link=link,
+                              eavesdropped_qubit_idx=eavesdropper[0] if eavesdropper else None,
+                              eavesdropper_basis=eavesdropper[1] if eavesdropper else 'Z', seed=42)
+        print(f"{label}:")
+        print(f"  leader={report['leader']} sum={report['agreed_sum']} abort_round={report['abort_round']} "
+              f"rounds_run={report['rounds_run']} discarded_sum_rounds={report['discarded_sum_rounds']}")
+        latency = f"{report['election_latency_s'] * 1000:.1f} ms" if report['election_latency_s'] is not None else "n/a (aborted)"
+        print(f"  leader-election latency {latency}, {report['rounds_per_second']:.1f} rounds/s, network {report['network']}")
@@ -0,0 +1,238 @@
+# Benchmark suite for the QMPC prototypes: Prototype_Test.generate_shared_sum,
+# Prototype_Trial_1.SumOfColumnsSimulator and Prototype_Trial_2_Check_Rounds.SumOfColumnsSimulator.
+# Every case runs a fresh simulator a few times and reports rounds per second, the per-round time
+# of each phase (build, transpile, run, parse; Trial_1 also draws its diagram) and peak memory.
+# Results are written as JSON lines, one row per case plus the run's metadata, so two runs can be
+# compared later to catch regressions:
+#
+#   python Prototype_Benchmark.py --output baseline.jsonl
+#   python Prototype_Benchmark.py --output current.jsonl --compare baseline.jsonl
+#
+# Peak memory comes from tracemalloc in a separate, untimed run (tracing slows Python down). It
+# covers Python-side allocations only; Aer's own C++ buffers are not included.
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+TARGETS = ("test", "trial1", "trial1_batched", "trial2", "trial2_batched")
+CHECK_ROUND_TARGETS = ("trial2", "trial2_batched") # Only these use check_round_frequency
+PHASES = ("build", "draw", "transpile", "run", "parse")
+
+def build_cases(targets, num_nodes_values, rounds_values, check_round_frequencies):
+    """
+    Cartesian product of the settings, as a list of dicts. Targets without check rounds are
+    listed once per (num_nodes, rounds) with check_round_frequency None.
+    """
+    cases = []
+    for target, num_nodes, rounds in itertools.product(targets, num_nodes_values, rounds_values):
+        if target not in TARGETS:
+            raise ValueError(f"Unknown benchmark target '{target}', expected one of {TARGETS}")
+        frequencies = check_round_frequencies if target in CHECK_ROUND_TARGETS else [None]
+        for frequency in frequencies:
+            cases.append({"target": target, "num_nodes": num_nodes, "rounds": rounds, "check_round_frequency": frequency})
+    return cases
+
+def _run_target_once(case, seed):
+    """Runs one protocol execution for case. Returns (rounds actually run, phase_times dict)."""
+    random.seed(seed)
+    target, num_nodes, rounds = case["target"], case["num_nodes"], case["rounds"]
+    if target == "test":
+        from Prototype_Test import generate_shared_sum
+        phase_times = defaultdict(float)
+        generate_shared_sum(num_nodes, rounds, verbose=False, phase_times=phase_times)
+        return rounds, phase_times
+    if target.startswith("trial1"):
+        from Prototype_Trial_1 import SumOfColumnsSimulator
+        # Trial_1 has no per-run Aer seed; a backend-wide seed_simulator would make every round identical
+        simulator = SumOfColumnsSimulator(num_nodes=num_nodes, num_ghz_states_for_sum=rounds)
+        with contextlib.redirect_stdout(io.StringIO()): # Trial_1 narrates every round with print
+            simulator.generate_shared_sum(batched=target == "trial1_batched")
+        return rounds, simulator.phase_times
+    from Prototype_Event_Log import quiet_log
+    from Prototype_Trial_2_Check_Rounds import SumOfColumnsSimulator
+    # num_ghz_states_for_sum only caps the sum bits; set it to rounds so a run is never cut short by it
+    simulator = SumOfColumnsSimulator(num_nodes=num_nodes, num_ghz_states_for_sum=rounds,
+                                      check_round_frequency=case["check_round_frequency"], event_log=quiet_log(), seed=seed)
+    simulator.generate_shared_sum(total_rounds=rounds, batched=target == "trial2_batched")
+    # A check round that flags tampering stops the run early, so count the rounds that actually ran
+    return simulator.rounds_run, simulator.phase_times
+
+def run_case(case, repeats=3, seed=2024, measure_memory=True):
+    """
+    Times repeats fresh runs of case (after one untimed warm-up) and returns one result row.
+    rounds_per_second uses the median run; phase times are per round, averaged over all runs.
+    """
+    seeds = random.Random(seed)
+    _run_target_once(case, seeds.getrandbits(31)) # Warm-up: imports, Aer initialisation
+
+    wall_times, rounds_run = [], []
+    phase_totals = defaultdict(float)
+    for _ in range(repeats):
+        start = time.perf_counter()
+        rounds, phase_times = _run_target_once(case, seeds.getrandbits(31))
+        wall_times.append(time.perf_counter() - start)
+        rounds_run.append(rounds)
+        for phase, seconds in phase_times.items():
+            phase_totals[phase] += seconds
+
+    peak_memory = None
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            _run_target_once(case, seeds.getrandbits(31))
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    total_rounds = sum(rounds_run)
+    median_index = sorted(range(repeats), key=wall_times.__getitem__)[repeats // 2]
+    row = dict(case)
+    row.update({
+        "repeats": repeats,
+        "rounds_run_mean": total_rounds / repeats,
+        "wall_seconds_median": statistics.median(wall_times),
+        "wall_seconds_min": min(wall_times),
+        "rounds_per_second": rounds_run[median_index] / wall_times[median_index] if wall_times[median_index] else None,
+        "peak_memory_bytes": peak_memory,
+    })
+    for phase in PHASES:
+        row[f"{phase}_seconds_per_round"] = phase_totals[phase] / total_rounds if phase in phase_totals and total_rounds else None
+    return row
+
+def run_benchmarks(cases, repeats=3, seed=2024, measure_memory=True, progress=True):
+    """Runs every case in order (serially, so timings do not compete for cores). Returns one row per case."""
+    rows = []
+    for i, case in enumerate(cases):
+        row = run_case(case, repeats=repeats, seed=seed + i, measure_memory=measure_memory)
+        rows.append(row)
+        if progress:
+            print(f"[{i + 1}/{len(cases)}] {_case_label(row)}: {row['rounds_per_second']:.1f} rounds/s", file=sys.stderr)
+    return rows
+
+def collect_metadata():
+    """Environment details stored with every result row, so comparisons can tell machines and versions apart."""
+    metadata = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+    for package in ("qiskit", "qiskit_aer", "numpy"):
+        try:
+            metadata[package] = __import__(package).__version__
+        except ImportError:
+            metadata[package] = None
+    try:
+        metadata["git_commit"] = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        metadata["git_commit"] = None
+    return metadata
+
+def write_results_jsonl(rows, path, metadata=None):
+    """Writes one JSON object per row, each carrying the run metadata under 'metadata'."""
+    metadata = metadata if metadata is not None else collect_metadata()
+    with open(path, "w") as f:
+        for row in rows:
+            f.write(json.dumps(dict(row, metadata=metadata)) + "\n")
+
+def load_results_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def _case_key(row):
+    return (row["target"], row["num_nodes"], row["rounds"], row["check_round_frequency"])
+
+def _case_label(row):
+    frequency = f", freq={row['check_round_frequency']}" if row["check_round_frequency"] is not None else ""
+    return f"{row['target']} (nodes={row['num_nodes']}, rounds={row['rounds']}{frequency})"
+
+def compare_results(baseline_rows, current_rows, tolerance=0.10):
+    """
+    Matches rows by case and returns one comparison dict per case present in both runs.
+    A case regresses when throughput drops, or peak memory grows, by more than tolerance (a fraction).
+    """
+    baseline = {_case_key(row): row for row in baseline_rows}
+    comparisons = []
+    for row in current_rows:
+        old = baseline.get(_case_key(row))
+        if old is None:
+            continue
+        speed_ratio = row["rounds_per_second"] / old["rounds_per_second"] if old["rounds_per_second"] else None
+        memory_ratio = (row["peak_memory_bytes"] / old["peak_memory_bytes"]
+                        if old.get("peak_memory_bytes") and row.get("peak_memory_bytes") is not None else None)
+        comparisons.append({
+            "case": _case_label(row),
+            "baseline_rounds_per_second": old["rounds_per_second"],
+            "rounds_per_second": row["rounds_per_second"],
+            "speed_ratio": speed_ratio,
+            "memory_ratio": memory_ratio,
+            "regressed": (speed_ratio is not None and speed_ratio < 1 - tolerance)
+                         or (memory_ratio is not None and memory_ratio > 1 + tolerance),
+        })
+    return comparisons
+
+def print_results_table(rows):
+    header = (f"{'case':<48} {'rounds/s':>10} {'peak MiB':>9} "
+              + " ".join(f"{phase + ' ms':>12}" for phase in PHASES))
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        memory = f"{row['peak_memory_bytes'] / 2**20:.2f}" if row["peak_memory_bytes"] is not None else "-"
+        phases = " ".join(f"{row[f'{phase}_seconds_per_round'] * 1e3:>12.3f}" if row[f"{phase}_seconds_per_round"] is not None
+                          else f"{'-':>12}" for phase in PHASES)
+        print(f"{_case_label(row):<48} {row['rounds_per_second']:>10.1f} {memory:>9} {phases}")
+
+def print_comparison(comparisons, tolerance):
+    print(f"{'case':<48} {'baseline r/s':>12} {'current r/s':>12} {'speed':>7} {'memory':>7}")
+    for c in comparisons:
+        memory = f"{c['memory_ratio']:.2f}x" if c["memory_ratio"] is not None else "-"
+        flag = "  REGRESSION" if c["regressed"] else ""
+        print(f"{c['case']:<48} {c['baseline_rounds_per_second']:>12.1f} {c['rounds_per_second']:>12.1f} "
+              f"{c['speed_ratio']:>6.2f}x {memory:>7}{flag}")
+    regressions = sum(c["regressed"] for c in comparisons)
+    print(f"\n{regressions} of {len(comparisons)} cases regressed by more than {tolerance:.0%}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the QMPC prototypes.")
+    parser.add_argument("--targets", nargs="+", default=list(TARGETS), choices=TARGETS)
+    parser.add_argument("--nodes", nargs="+", type=int, default=[4, 16])
+    parser.add_argument("--rounds", nargs="+", type=int, default=[8, 32])
+    parser.add_argument("--frequencies", nargs="+", type=int, default=[3], help="check_round_frequency values (Trial_2 only)")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--output", default="benchmark_results.jsonl")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON-lines file from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown / memory growth, as a fraction")
+    args = parser.parse_args(argv)
+
+    cases = build_cases(args.targets, args.nodes, args.rounds, args.frequencies)
+    rows = run_benchmarks(cases, repeats=args.repeats, seed=args.seed, measure_memory=not args.no_memory)
+    print_results_table(rows)
+    write_results_jsonl(rows, args.output)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        comparisons = compare_results(load_results_jsonl(args.compare), rows, args.tolerance)
+        print()
+        print_comparison(comparisons, args.tolerance)
+        if any(c["regressed"] for c in comparisons):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
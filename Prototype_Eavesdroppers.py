@@ -0,0 +1,287 @@
+# Eavesdropper strategies for the GHZ rounds of Prototype_Trial_2_Check_Rounds.SumOfColumnsSimulator,
+# and batch evaluation of their detection rate and information gain.
+#
+# A strategy acts on a round's GHZ state after preparation and before the nodes measure. It may use
+# ancilla qubits of its own, and writes what it learns into its own classical register 'eve' (the
+# protocol's built-in eavesdropper writes into a node's bit, where the node's measurement overwrites it).
+#   - InterceptResend: measure one or more qubits in Z or X and resend the collapsed state (multi-qubit
+#     attacks are intercept-resend on several qubits, each in its own basis).
+#   - Probabilistic: wraps another strategy and attacks each round only with a given probability.
+#   - EntanglingProbe: weakly couples a node qubit to an ancilla with cry(angle) and measures the
+#     ancilla; small angles learn little and disturb little, angle = pi copies the Z value.
+#
+# evaluate_strategy draws the bases and attack decisions of many rounds up front, builds one circuit
+# per distinct (bases, attacked) configuration and runs each for exactly one shot per round of that
+# configuration: configurations with the same round count share an AerSimulator call, so there are a
+# handful of calls per evaluation. For 4 nodes that is at most 32 circuits however many rounds are evaluated.
+from collections import namedtuple
+
+import numpy as np
+
+from Prototype_GHZ_Sampler import BASIS_X, bases_to_strings, detect_tampering
+from Prototype_Noise import choose_simulation_method, has_mid_circuit_measurement
+from Prototype_Trial_2_Check_Rounds import SumOfColumnsSimulator, is_clifford_circuit
+
+EVE_REGISTER = "eve"
+ANCILLA_REGISTER = "eve_ancilla"
+
+class EavesdropperStrategy:
+    """
+    Base class. Subclasses set num_ancillas / num_eve_bits and implement apply().
+    attacks() decides per round whether the strategy acts at all (always, by default).
+    """
+    name = "strategy"
+    num_ancillas = 0
+    num_eve_bits = 0
+
+    def attacks(self, rng, num_rounds):
+        """Boolean array: which of num_rounds rounds are attacked."""
+        return np.ones(num_rounds, dtype=bool)
+
+    def apply(self, qc, node_qubits, ancilla_qubits, eve_bits):
+        """Appends the attack to qc, between GHZ preparation and the nodes' measurements."""
+        raise NotImplementedError
+
+    def guess(self, eve_outcomes):
+        """Eve's guess of each round's shared Z bit from her (num_rounds, num_eve_bits) outcomes; -1 for no guess."""
+        if self.num_eve_bits == 0:
+            return np.full(len(eve_outcomes), -1, dtype=np.int8)
+        return eve_outcomes[:, 0].astype(np.int8)
+
+    def describe(self):
+        return self.name
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.describe()}>"
+
+class NoAttack(EavesdropperStrategy):
+    """Baseline: an untouched channel. Its detection rate is the protocol's false-positive rate."""
+    name = "none"
+
+    def attacks(self, rng, num_rounds):
+        return np.zeros(num_rounds, dtype=bool)
+
+    def apply(self, qc, node_qubits, ancilla_qubits, eve_bits):
+        pass
+
+class InterceptResend(EavesdropperStrategy):
+    def __init__(self, qubits=(0,), basis='Z', resend=True):
+        """
+        qubits: node qubits to intercept; several qubits make a multi-qubit attack.
+        basis: 'Z' or 'X' for all of them, or one character per qubit (e.g. 'ZX').
+        resend: send on the state the measurement prepared (|s> in Z, |+>/|-> in X). With False the
+            qubit is left as measured, like the protocol's built-in eavesdropper (no H back after an X measurement).
+        """
+        self.qubits = tuple(qubits)
+        self.bases = basis * len(self.qubits) if len(basis) == 1 else basis
+        if len(self.bases) != len(self.qubits) or set(self.bases) - {'Z', 'X'}:
+            raise ValueError(f"basis must be 'Z', 'X' or one of them per qubit, got '{basis}' for qubits {self.qubits}")
+        self.resend = resend
+        self.num_eve_bits = len(self.qubits)
+        self.name = "intercept-resend"
+
+    def apply(self, qc, node_qubits, ancilla_qubits, eve_bits):
+        for qubit, basis, eve_bit in zip(self.qubits, self.bases, eve_bits):
+            if basis == 'X':
+                qc.h(node_qubits[qubit])
+            qc.measure(node_qubits[qubit], eve_bit)
+            if basis == 'X' and self.resend:
+                qc.h(node_qubits[qubit])
+
+    def guess(self, eve_outcomes):
+        # Only a Z measurement reveals the shared bit
+        z_columns = [k for k, basis in enumerate(self.bases) if basis == 'Z']
+        if not z_columns:
+            return np.full(len(eve_outcomes), -1, dtype=np.int8)
+        return eve_outcomes[:, z_columns[0]].astype(np.int8)
+
+    def describe(self):
+        return f"intercept-resend {''.join(self.bases)} on Q{','.join(map(str, self.qubits))}" + ("" if self.resend else " (no resend)")
+
+class Probabilistic(EavesdropperStrategy):
+    def __init__(self, strategy, probability):
+        """Attacks each round independently with the given probability, using `strategy` when it does."""
+        if not 0 <= probability <= 1:
+            raise ValueError(f"probability must be in [0, 1], got {probability}")
+        self.strategy = strategy
+        self.probability = probability
+        self.num_ancillas = strategy.num_ancillas
+        self.num_eve_bits = strategy.num_eve_bits
+        self.name = f"p={probability:g} {strategy.name}"
+
+    def attacks(self, rng, num_rounds):
+        return (rng.random(num_rounds) < self.probability) & self.strategy.attacks(rng, num_rounds)
+
+    def apply(self, qc, node_qubits, ancilla_qubits, eve_bits):
+        self.strategy.apply(qc, node_qubits, ancilla_qubits, eve_bits)
+
+    def guess(self, eve_outcomes):
+        return self.strategy.guess(eve_outcomes)
+
+    def describe(self):
+        return f"p={self.probability:g} {self.strategy.describe()}"
+
+class EntanglingProbe(EavesdropperStrategy):
+    def __init__(self, qubit=0, angle=np.pi / 4):
+        """
+        Entangles node qubit `qubit` with a fresh ancilla via cry(angle) and measures the ancilla.
+        Eve reads the qubit's Z value correctly with probability (1 + sin^2(angle/2)) / 2; the X-parity
+        disturbance the nodes can detect grows the same way. Non-Clifford for general angles, so
+        these runs use statevector or MPS simulation.
+        """
+        self.qubit = qubit
+        self.angle = angle
+        self.num_ancillas = 1
+        self.num_eve_bits = 1
+        self.name = "entangling probe"
+
+    def apply(self, qc, node_qubits, ancilla_qubits, eve_bits):
+        qc.cry(self.angle, node_qubits[self.qubit], ancilla_qubits[0])
+        qc.measure(ancilla_qubits[0], eve_bits[0])
+
+    def describe(self):
+        return f"entangling probe on Q{self.qubit}, angle {self.angle:.3f}"
+
+# Per-round results of evaluate_strategy; arrays have one row per round. method names the simulation
+# method(s) used, joined with '/' when shot-count groups ran with different methods.
+StrategyEvaluation = namedtuple("StrategyEvaluation", "strategy round_kind bases attacked outcomes eve_outcomes detected method")
+
+def _strategy_circuit(simulator, strategy, round_kind, bases_row, attacked):
+    """GHZ preparation, the attack (if any), then the nodes' measurements in bases_row."""
+    from qiskit import ClassicalRegister, QuantumRegister
+    qc = simulator._prepare_ghz_circuit_for_one_round(round_name=f"{round_kind.capitalize()}Round")
+    node_qubits = qc.qubits[:simulator.num_nodes]
+    ancillas = QuantumRegister(strategy.num_ancillas, ANCILLA_REGISTER) if strategy.num_ancillas else None
+    eve = ClassicalRegister(strategy.num_eve_bits, EVE_REGISTER) if strategy.num_eve_bits else None
+    for register in (ancillas, eve): # Attacked or not, every circuit has the same registers
+        if register is not None:
+            qc.add_register(register)
+    if attacked:
+        strategy.apply(qc, node_qubits, list(ancillas or []), list(eve or []))
+        qc.barrier(label="Eavesdropped")
+    simulator._apply_measurement_gates(qc, bases_to_strings(bases_row))
+    return qc
+
+def _memory_to_bits(memory, width, register_index):
+    """Aer memory ('eve nodes' per shot, highest register first) -> uint8 array (shots, width) of one register, bit 0 first."""
+    if width == 0:
+        return np.zeros((len(memory), 0), dtype=np.uint8)
+    registers = "".join(shot.split(" ")[register_index] for shot in memory).encode()
+    return (np.frombuffer(registers, dtype=np.uint8).reshape(len(memory), width) - ord("0"))[:, ::-1]
+
+def evaluate_strategy(strategy, num_nodes, num_rounds, round_kind="check", simulator=None, rng=None):
+    """
+    Runs num_rounds rounds of round_kind ('check': random bases, 'sum': all Z) against `strategy` in one
+    Aer execution. simulator: a SumOfColumnsSimulator providing GHZ preparation (with any ghz_extension),
+    noise, backend and compiled-circuit cache; a default one for num_nodes is created if None.
+    """
+    rng = np.random.default_rng(rng)
+    simulator = simulator or SumOfColumnsSimulator(num_nodes=num_nodes, num_ghz_states_for_sum=1)
+    if round_kind == "check":
+        bases = rng.integers(0, 2, size=(num_rounds, num_nodes), dtype=np.uint8)
+    elif round_kind == "sum":
+        bases = np.zeros((num_rounds, num_nodes), dtype=np.uint8)
+    else:
+        raise ValueError(f"Unknown round kind '{round_kind}', expected 'check' or 'sum'")
+    attacked = strategy.attacks(rng, num_rounds)
+
+    # One circuit per distinct configuration, run for as many shots as it has rounds
+    configurations, configuration_index = np.unique(np.column_stack([bases, attacked]), axis=0, return_inverse=True)
+    configuration_index = configuration_index.reshape(-1)
+    counts = np.bincount(configuration_index, minlength=len(configurations))
+    backend = simulator.q_simulator
+    compiled = []
+    for configuration in configurations:
+        bases_row, attacked_row = configuration[:num_nodes], bool(configuration[num_nodes])
+        key = ("strategy", strategy, round_kind, num_nodes, tuple(bases_row.tolist()), attacked_row,
+               backend.name, simulator.simulation_method, simulator.ghz_extension)
+        compiled.append(simulator.circuit_cache.get(key, lambda: _strategy_circuit(simulator, strategy, round_kind, bases_row, attacked_row),
+                                                    backend, simulator.phase_times)[1])
+
+    # One run call per distinct shot count; Aer jobs are asynchronous, so all groups are submitted before any is awaited
+    jobs = []
+    methods = set()
+    for shots in np.unique(counts).tolist():
+        group = np.flatnonzero(counts == shots)
+        circuits = [compiled[c] for c in group]
+        method, _ = choose_simulation_method(max(qc.num_qubits for qc in circuits), all(is_clifford_circuit(qc) for qc in circuits),
+                                             simulator.noise, shots=shots, mid_circuit_measurement=any(has_mid_circuit_measurement(qc) for qc in circuits))
+        run_options = dict(simulator._noise_run_options)
+        if method != backend.options.method:
+            run_options["method"] = method
+        methods.add(method)
+        jobs.append((group, backend.run(circuits, shots=shots, memory=True, seed_simulator=int(rng.integers(2**31)), **run_options)))
+
+    outcomes = np.empty((num_rounds, num_nodes), dtype=np.uint8)
+    eve_outcomes = np.empty((num_rounds, strategy.num_eve_bits), dtype=np.uint8)
+    for group, job in jobs:
+        result = job.result()
+        for i, c in enumerate(group):
+            rows = np.flatnonzero(configuration_index == c)
+            memory = result.get_memory(i) # By index: every configuration shares the circuit name
+            outcomes[rows] = _memory_to_bits(memory, num_nodes, -1) # Node register 'c' was added first: rightmost
+            eve_outcomes[rows] = _memory_to_bits(memory, strategy.num_eve_bits, 0)
+    return StrategyEvaluation(strategy, round_kind, bases, attacked, outcomes, eve_outcomes, detect_tampering(bases, outcomes),
+                              "/".join(sorted(methods)))
+
+def summarise(evaluation):
+    """Detection and information figures of an evaluation, as one result row (dict)."""
+    attacked, detected = evaluation.attacked, evaluation.detected
+    # The shared bit is what any Z-measuring node saw (first such node); X-only rounds have none
+    z_mask = evaluation.bases != BASIS_X
+    has_z = z_mask.any(axis=1)
+    shared_bit = evaluation.outcomes[np.arange(len(z_mask)), z_mask.argmax(axis=1)]
+    guess = evaluation.strategy.guess(evaluation.eve_outcomes)
+    informed = attacked & has_z & (guess >= 0)
+    return {
+        "strategy": evaluation.strategy.describe(),
+        "round_kind": evaluation.round_kind,
+        "rounds": len(attacked),
+        "attack_rate": float(attacked.mean()),
+        "detection_rate": float(detected[attacked].mean()) if attacked.any() else None,
+        "false_positive_rate": float(detected[~attacked].mean()) if (~attacked).any() else None,
+        "detection_per_round": float(detected.mean()),
+        "eve_guess_accuracy": float((guess[informed] == shared_bit[informed]).mean()) if informed.any() else None,
+        "method": evaluation.method,
+    }
+
+def evaluate_strategies(strategies, num_nodes, num_rounds, round_kind="check", simulator=None, seed=2024):
+    """summarise(evaluate_strategy(...)) for every strategy, with independent reproducible random streams."""
+    seeds = np.random.SeedSequence(seed).spawn(len(strategies))
+    simulator = simulator or SumOfColumnsSimulator(num_nodes=num_nodes, num_ghz_states_for_sum=1)
+    return [summarise(evaluate_strategy(strategy, num_nodes, num_rounds, round_kind, simulator, np.random.default_rng(s)))
+            for strategy, s in zip(strategies, seeds)]
+
+def print_strategy_table(rows):
+    def fmt(value):
+        return f"{value:.4f}" if value is not None else "-"
+    header = f"{'strategy':<40} {'kind':>5} {'rounds':>7} {'attacked':>8} {'P(detect)':>9} {'P(false+)':>9} {'Eve acc.':>8} {'method':>20}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(f"{row['strategy']:<40} {row['round_kind']:>5} {row['rounds']:>7} {row['attack_rate']:>8.3f} {fmt(row['detection_rate']):>9} "
+              f"{fmt(row['false_positive_rate']):>9} {fmt(row['eve_guess_accuracy']):>8} {row['method']:>20}")
+
+
+if __name__ == "__main__":
+    import time
+
+    N_NODES = 4
+    NUM_ROUNDS = 20_000
+    strategies = [
+        NoAttack(),
+        InterceptResend((0,), 'Z'),
+        InterceptResend((0,), 'X'),
+        InterceptResend((0,), 'X', resend=False),
+        InterceptResend((0, 2), 'ZX'),
+        InterceptResend(range(N_NODES), 'Z'),
+        Probabilistic(InterceptResend((0,), 'Z'), 0.25),
+        EntanglingProbe(0, np.pi / 8),
+        EntanglingProbe(0, np.pi / 2),
+        EntanglingProbe(0, np.pi),
+    ]
+    for round_kind in ("check", "sum"):
+        start = time.perf_counter()
+        rows = evaluate_strategies(strategies, N_NODES, NUM_ROUNDS, round_kind)
+        print(f"\n{len(strategies)} strategies x {NUM_ROUNDS} {round_kind} rounds in {time.perf_counter() - start:.1f} s\n")
+        print_strategy_table(rows)
@@ -0,0 +1,76 @@
+# Structured, level-gated event stream for the QMPC prototypes.
+# Protocol code emits events (name + fields) instead of printing. Events below the log level are
+# dropped before any formatting happens. Circuit diagrams are passed as callables and only rendered
+# when show_diagrams is on and the event is kept, so a quiet run pays nothing for them.
+import json
+import sys
+import time
+
+DEBUG = 10    # Per-round detail: bases, raw outcomes, circuit diagrams
+INFO = 20     # Per-run summary: protocol start, final sum, leader
+WARNING = 30  # Tampering evidence, eavesdropper enabled
+ERROR = 40    # Inconsistent final sums
+SILENT = 100  # Drop everything
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+class ProtocolEventLog:
+    def __init__(self, level=INFO, echo=True, record=False, show_diagrams=False, stream=None):
+        """
+        level: minimum level an event needs to be kept at all.
+        echo: print kept events as text (the human-readable view).
+        record: keep kept events in self.events as dicts (the machine-readable view).
+        show_diagrams: render circuit diagrams attached to kept events.
+        The default emits per-run summary lines and no per-round text.
+        """
+        self.level = level
+        self.echo = echo
+        self.record = record
+        self.show_diagrams = show_diagrams
+        self.stream = stream if stream is not None else sys.stdout
+        self.events = []
+
+    def enabled(self, level):
+        """Cheap guard for callers that would otherwise build expensive fields."""
+        return level >= self.level and (self.echo or self.record)
+
+    def emit(self, level, event, message=None, diagram=None, **fields):
+        """
+        event: short machine-readable name, e.g. 'check_round'.
+        message: human-readable text for echo; fields are appended when omitted.
+        diagram: zero-argument callable returning a circuit diagram, called only if it will be shown.
+        """
+        if not self.enabled(level):
+            return
+        record = {"time": time.time(), "level": LEVEL_NAMES.get(level, str(level)), "event": event}
+        record.update(fields)
+        if diagram is not None and self.show_diagrams:
+            record["diagram"] = str(diagram())
+        if self.record:
+            self.events.append(record)
+        if self.echo:
+            if message is None:
+                message = f"{event}: " + ", ".join(f"{k}={v}" for k, v in fields.items())
+            print(message, file=self.stream)
+            if "diagram" in record:
+                print(record["diagram"], file=self.stream)
+
+    def events_of(self, event):
+        return [record for record in self.events if record["event"] == event]
+
+    def write_jsonl(self, path):
+        """Writes the recorded events to path, one JSON object per line (diagrams included if rendered)."""
+        with open(path, "w") as f:
+            for record in self.events:
+                f.write(json.dumps(record, default=str) + "\n")
+
+    def clear(self):
+        self.events = []
+
+def quiet_log():
+    """No text, no recording: the setting for sweeps and benchmarks."""
+    return ProtocolEventLog(level=SILENT, echo=False)
+
+def verbose_log():
+    """Every event with circuit diagrams, as the tutorial scenarios print them."""
+    return ProtocolEventLog(level=DEBUG, echo=True, show_diagrams=True)
@@ -0,0 +1,164 @@
+# Closed-form sampler for the GHZ rounds of Prototype_Trial_2_Check_Rounds.SumOfColumnsSimulator.
+# An ideal GHZ state (|00...0> + |11...1>)/sqrt(2) measured qubit-by-qubit in the Z or X basis has a
+# simple outcome distribution, so rounds can be drawn directly with NumPy, millions at a time,
+# without building, transpiling or simulating any circuit.
+#
+#   - If at least one node measures Z: every Z node sees the same random bit, and every X node
+#     sees an independent uniformly random bit.
+#   - If every node measures X: the outcomes are uniformly random with even parity.
+#
+# The optional eavesdropper matches the Aer path (eavesdropped_qubit_idx / eavesdropper_basis):
+#   - Z-basis: collapses the GHZ state to |cc...c>, so Z outcomes still agree but the
+#     all-X parity constraint is lost.
+#   - X-basis with outcome s: the other n-1 qubits hold a GHZ state with relative phase (-1)^s.
+#     As in the circuit (H then measure, no H back), the eavesdropped qubit is left in |s>.
+import numpy as np
+
+BASIS_Z = 0
+BASIS_X = 1
+
+def bases_to_strings(bases_row):
+    """[0, 1, 0] -> ['Z', 'X', 'Z'], the format QMPCNode.chosen_basis_for_check uses."""
+    return ['X' if basis == BASIS_X else 'Z' for basis in bases_row]
+
+def _force_even_parity(outcomes, rows, columns, target_parity):
+    """Flips the last listed column of each selected row so the parity over columns equals target_parity."""
+    if not rows.any() or len(columns) == 0:
+        return
+    current_parity = outcomes[np.ix_(rows, columns)].sum(axis=1) % 2
+    outcomes[rows, columns[-1]] ^= (current_parity != target_parity[rows]).astype(np.uint8)
+
+def sample_check_rounds(num_nodes, num_rounds, eavesdropped_qubit_idx=None, eavesdropper_basis='Z', rng=None, bases=None):
+    """
+    Draws num_rounds check rounds at once.
+    bases: optional (num_rounds, num_nodes) array of BASIS_Z/BASIS_X; drawn uniformly at random if None
+           (as QMPCNode.choose_random_basis does).
+    eavesdropped_qubit_idx: None for an ideal channel, otherwise the qubit the eavesdropper measures
+           in eavesdropper_basis before the nodes measure.
+    Returns (bases, outcomes), both uint8 arrays of shape (num_rounds, num_nodes).
+    """
+    rng = np.random.default_rng(rng)
+    if bases is None:
+        bases = rng.integers(0, 2, size=(num_rounds, num_nodes), dtype=np.uint8)
+    else:
+        bases = np.asarray(bases, dtype=np.uint8)
+    z_mask = bases == BASIS_Z
+
+    # Start from independent uniform bits; the constraints below overwrite what is correlated
+    outcomes = rng.integers(0, 2, size=(num_rounds, num_nodes), dtype=np.uint8)
+    shared_z_bit = rng.integers(0, 2, size=num_rounds, dtype=np.uint8)
+
+    if eavesdropped_qubit_idx is None:
+        outcomes = np.where(z_mask, shared_z_bit[:, None], outcomes).astype(np.uint8)
+        all_x_rows = ~z_mask.any(axis=1)
+        _force_even_parity(outcomes, all_x_rows, np.arange(num_nodes), np.zeros(num_rounds, dtype=np.uint8))
+    elif eavesdropper_basis == 'Z':
+        # State is now |cc...c>: Z outcomes agree, X outcomes are independent coin flips
+        outcomes = np.where(z_mask, shared_z_bit[:, None], outcomes).astype(np.uint8)
+    elif eavesdropper_basis == 'X':
+        eavesdropper_outcome = rng.integers(0, 2, size=num_rounds, dtype=np.uint8)
+        others = np.array([i for i in range(num_nodes) if i != eavesdropped_qubit_idx], dtype=int)
+        other_z_mask = z_mask.copy()
+        other_z_mask[:, eavesdropped_qubit_idx] = False
+        outcomes = np.where(other_z_mask, shared_z_bit[:, None], outcomes).astype(np.uint8)
+        # Remaining n-1 qubits: (|0..0> + (-1)^s |1..1>)/sqrt(2), X parity equals s when all of them pick X
+        others_all_x = ~other_z_mask.any(axis=1)
+        _force_even_parity(outcomes, others_all_x, others, eavesdropper_outcome)
+        # The eavesdropped qubit is left in |s>: deterministic in Z, a coin flip in X (already drawn)
+        eavesdropped_z = bases[:, eavesdropped_qubit_idx] == BASIS_Z
+        outcomes[eavesdropped_z, eavesdropped_qubit_idx] = eavesdropper_outcome[eavesdropped_z]
+    else:
+        raise ValueError(f"Unknown eavesdropper basis '{eavesdropper_basis}', expected 'Z' or 'X'")
+    return bases, outcomes
+
+def sample_sum_rounds(num_nodes, num_rounds, eavesdropped_qubit_idx=None, eavesdropper_basis='Z', rng=None):
+    """
+    Draws num_rounds sum rounds (all nodes measure Z). Returns a uint8 outcome array of shape (num_rounds, num_nodes).
+    The eavesdropper acts after the Z-measurements, as in SumOfColumnsSimulator._build_round_circuit:
+    a Z-basis eavesdropper changes nothing, an X-basis one overwrites its qubit's bit with a coin flip.
+    """
+    rng = np.random.default_rng(rng)
+    shared_bit = rng.integers(0, 2, size=num_rounds, dtype=np.uint8)
+    outcomes = np.repeat(shared_bit[:, None], num_nodes, axis=1)
+    if eavesdropped_qubit_idx is not None and eavesdropper_basis == 'X':
+        outcomes[:, eavesdropped_qubit_idx] = rng.integers(0, 2, size=num_rounds, dtype=np.uint8)
+    return outcomes
+
+def detect_tampering(bases, outcomes):
+    """
+    Vectorized version of the verification in SumOfColumnsSimulator._perform_check_round.
+    Flags a round when 2+ Z nodes disagree, or when 2+ nodes chose X and their outcomes have odd parity.
+    Returns a boolean array with one entry per round.
+    """
+    z_mask = bases == BASIS_Z
+    x_mask = ~z_mask
+    z_count = z_mask.sum(axis=1)
+    z_ones = (outcomes * z_mask).sum(axis=1)
+    z_inconsistent = (z_count > 1) & (z_ones > 0) & (z_ones < z_count)
+    x_count = x_mask.sum(axis=1)
+    x_parity_odd = (x_count >= 2) & ((outcomes * x_mask).sum(axis=1) % 2 == 1)
+    return z_inconsistent | x_parity_odd
+
+def validate_against_aer(num_nodes=4, num_rounds=4000, eavesdropped_qubit_idx=None, eavesdropper_basis='Z', seed=1234):
+    """
+    Statistical cross-check of sample_check_rounds against the Aer circuits of SumOfColumnsSimulator.
+    The same basis patterns are fed to both engines. Aer runs one multi-shot job per distinct pattern.
+    Returns the total-variation distance between the two (bases, outcomes) histograms, the two
+    detection rates, and the z-score of their difference.
+    """
+    from Prototype_Trial_2_Check_Rounds import SumOfColumnsSimulator # Qiskit is only needed here
+
+    rng = np.random.default_rng(seed)
+    bases, fast_outcomes = sample_check_rounds(num_nodes, num_rounds, eavesdropped_qubit_idx, eavesdropper_basis, rng=rng)
+
+    simulator = SumOfColumnsSimulator(num_nodes=num_nodes, num_ghz_states_for_sum=1)
+    eavesdrop = eavesdropped_qubit_idx is not None
+    aer_outcomes = np.empty_like(fast_outcomes)
+    patterns, pattern_index = np.unique(bases, axis=0, return_inverse=True)
+    pattern_index = pattern_index.reshape(-1)
+    for p, pattern in enumerate(patterns):
+        rows = np.flatnonzero(pattern_index == p)
+        _, compiled = simulator._get_round_circuit("check", bases_to_strings(pattern), eavesdrop,
+                                                   eavesdropped_qubit_idx or 0, eavesdropper_basis)
+        memory = simulator.q_simulator.run(compiled, shots=len(rows), memory=True,
+                                           seed_simulator=int(rng.integers(2**31))).result().get_memory()
+        aer_outcomes[rows] = np.array([[int(bit) for bit in shot[::-1]] for shot in memory], dtype=np.uint8)
+
+    def histogram(outcomes):
+        weights = 1 << np.arange(2 * num_nodes, dtype=np.int64)
+        keys = np.concatenate([bases, outcomes], axis=1).astype(np.int64) @ weights
+        return np.bincount(keys, minlength=1 << (2 * num_nodes)) / num_rounds
+
+    fast_detect = detect_tampering(bases, fast_outcomes).mean()
+    aer_detect = detect_tampering(bases, aer_outcomes).mean()
+    pooled = (fast_detect + aer_detect) / 2
+    std_err = np.sqrt(max(pooled * (1 - pooled), 1e-12) * 2 / num_rounds)
+    return {
+        "total_variation_distance": 0.5 * np.abs(histogram(fast_outcomes) - histogram(aer_outcomes)).sum(),
+        "closed_form_detection_rate": float(fast_detect),
+        "aer_detection_rate": float(aer_detect),
+        "detection_rate_z_score": float((fast_detect - aer_detect) / std_err),
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    N_NODES = 4
+    NUM_ROUNDS = 1_000_000
+
+    start = time.perf_counter()
+    bases, outcomes = sample_check_rounds(N_NODES, NUM_ROUNDS, rng=7)
+    elapsed = time.perf_counter() - start
+    print(f"Sampled {NUM_ROUNDS} ideal check rounds for {N_NODES} nodes in {elapsed:.3f} s")
+    print(f"First round: bases {bases_to_strings(bases[0])}, outcomes {outcomes[0].tolist()}")
+
+    for eavesdropped_qubit_idx, eavesdropper_basis in [(None, 'Z'), (0, 'Z'), (0, 'X')]:
+        bases, outcomes = sample_check_rounds(N_NODES, NUM_ROUNDS, eavesdropped_qubit_idx, eavesdropper_basis, rng=11)
+        label = "ideal" if eavesdropped_qubit_idx is None else f"eavesdropper {eavesdropper_basis} on Q{eavesdropped_qubit_idx}"
+        print(f"Detection rate per check round ({label}): {detect_tampering(bases, outcomes).mean():.4f}")
+
+    print("\nValidating against the Aer path:")
+    for eavesdropped_qubit_idx, eavesdropper_basis in [(None, 'Z'), (0, 'Z'), (1, 'X')]:
+        report = validate_against_aer(N_NODES, 4000, eavesdropped_qubit_idx, eavesdropper_basis)
+        print(f"  eavesdropper={eavesdropped_qubit_idx}/{eavesdropper_basis}: " + ", ".join(f"{k}={v:.4f}" for k, v in report.items()))
@@ -0,0 +1,106 @@
+# Noise for the GHZ rounds of Prototype_Trial_2_Check_Rounds.SumOfColumnsSimulator, and the choice of
+# Aer simulation method that fits it.
+#
+# ChannelNoise describes gate and readout noise: depolarizing after every 1- and 2-qubit gate,
+# amplitude damping (energy relaxation) after every gate, and symmetric readout bit flips.
+# choose_simulation_method picks the method from what the noise allows and what it costs:
+#   - stabilizer: Clifford circuits with Pauli-only noise (depolarizing, readout). Errors are sampled
+#     per shot on the O(n^2) tableau, so this is by far the cheapest when it applies.
+#   - density_matrix: exact mixed-state evolution, memory 16 * 4^n bytes, cost independent of shots.
+#     Worth it only for small n when measurements are terminal and shots > 2^n.
+#   - statevector / matrix_product_state trajectories: each shot samples one Kraus branch, cost
+#     shots * 2^n (statevector) or shots * n * bond^3 (MPS, for wide low-entanglement circuits).
+# The wrong choice costs 10-100x: e.g. a density matrix for 1-shot rounds, or trajectories for
+# 10^4 shots of a 4-qubit circuit.
+DENSITY_MATRIX_MAX_QUBITS = 14 # 4^14 complex doubles = 4 GiB
+STATEVECTOR_MAX_QUBITS = 28    # 2^28 complex doubles = 4 GiB
+
+class ChannelNoise:
+    def __init__(self, depolarizing_1q=0.0, depolarizing_2q=0.0, amplitude_damping=0.0, readout_error=0.0):
+        """
+        depolarizing_1q / depolarizing_2q: depolarizing probability after each 1-qubit / 2-qubit gate.
+        amplitude_damping: decay probability |1> -> |0> of each qubit a gate acts on.
+        readout_error: probability that a measured bit is flipped.
+        """
+        self.depolarizing_1q = depolarizing_1q
+        self.depolarizing_2q = depolarizing_2q
+        self.amplitude_damping = amplitude_damping
+        self.readout_error = readout_error
+
+    @property
+    def is_ideal(self):
+        return not (self.depolarizing_1q or self.depolarizing_2q or self.amplitude_damping or self.readout_error)
+
+    @property
+    def is_pauli(self):
+        """True if every channel is a Pauli channel (or a readout flip), i.e. stabilizer-simulable."""
+        return not self.amplitude_damping
+
+    def describe(self):
+        parts = [f"{name}={value}" for name, value in (("depolarizing_1q", self.depolarizing_1q), ("depolarizing_2q", self.depolarizing_2q),
+                                                        ("amplitude_damping", self.amplitude_damping), ("readout_error", self.readout_error)) if value]
+        return ", ".join(parts) or "ideal"
+
+    def to_noise_model(self, one_qubit_gates=("h", "x", "y", "z", "s", "sdg"), two_qubit_gates=("cx", "cz")):
+        """Aer NoiseModel attaching the channels to the given gates and to every measurement; None if ideal."""
+        if self.is_ideal:
+            return None
+        from qiskit_aer.noise import NoiseModel, ReadoutError, amplitude_damping_error, depolarizing_error
+
+        noise_model = NoiseModel()
+        error_1q = depolarizing_error(self.depolarizing_1q, 1) if self.depolarizing_1q else None
+        error_2q = depolarizing_error(self.depolarizing_2q, 2) if self.depolarizing_2q else None
+        if self.amplitude_damping:
+            damping = amplitude_damping_error(self.amplitude_damping)
+            error_1q = error_1q.compose(damping) if error_1q is not None else damping
+            damping_2q = damping.tensor(damping)
+            error_2q = error_2q.compose(damping_2q) if error_2q is not None else damping_2q
+        if error_1q is not None:
+            noise_model.add_all_qubit_quantum_error(error_1q, list(one_qubit_gates))
+        if error_2q is not None:
+            noise_model.add_all_qubit_quantum_error(error_2q, list(two_qubit_gates))
+        if self.readout_error:
+            p = self.readout_error
+            noise_model.add_all_qubit_readout_error(ReadoutError([[1 - p, p], [p, 1 - p]]))
+        return noise_model
+
+def has_mid_circuit_measurement(qc):
+    """True if any qubit is acted on again after being measured (the eavesdropper's re-measurement, resets)."""
+    measured = set()
+    for instruction in qc.data:
+        name = instruction.operation.name
+        if name == "barrier":
+            continue
+        qubits = {qc.find_bit(q).index for q in instruction.qubits}
+        if name != "measure" and measured & qubits:
+            return True
+        if name == "measure":
+            if measured & qubits:
+                return True
+            measured |= qubits
+    return False
+
+def choose_simulation_method(num_qubits, clifford, noise=None, shots=1, mid_circuit_measurement=False):
+    """Returns (method, reason) for an AerSimulator run of a circuit with these properties."""
+    noisy = noise is not None and not noise.is_ideal
+    if clifford and (not noisy or noise.is_pauli):
+        kind = "Pauli noise sampled per shot" if noisy else "no noise"
+        return "stabilizer", f"Clifford circuit, {kind}; tableau memory is O(n^2) for n={num_qubits} qubits"
+    if not noisy:
+        if num_qubits <= STATEVECTOR_MAX_QUBITS:
+            return "statevector", "non-Clifford gates, no noise"
+        return "matrix_product_state", f"non-Clifford gates on n={num_qubits} > {STATEVECTOR_MAX_QUBITS} qubits"
+
+    # Non-Pauli noise (or non-Clifford gates with noise): exact density matrix or sampled trajectories
+    if num_qubits > DENSITY_MATRIX_MAX_QUBITS:
+        dm_verdict = f"a density matrix of n={num_qubits} > {DENSITY_MATRIX_MAX_QUBITS} qubits does not fit in memory"
+    elif mid_circuit_measurement:
+        dm_verdict = "mid-circuit measurements force a density-matrix run per shot"
+    elif shots <= 2 ** num_qubits:
+        dm_verdict = f"{shots} shot(s) * 2^{num_qubits} (trajectories) <= 4^{num_qubits} (density matrix)"
+    else:
+        return "density_matrix", (f"non-Pauli noise; one 4^{num_qubits} density-matrix run beats "
+                                  f"{shots} trajectories of 2^{num_qubits}")
+    if num_qubits <= STATEVECTOR_MAX_QUBITS:
+        return "statevector", f"non-Pauli noise, statevector trajectories: {dm_verdict}"
+    return "matrix_product_state", f"non-Pauli noise, MPS trajectories for n={num_qubits} qubits: {dm_verdict}"
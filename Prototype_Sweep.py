@@ -0,0 +1,148 @@
+# Monte Carlo sweep of SumOfColumnsSimulator.generate_shared_sum over a grid of protocol settings.
+# Independent trials are spread over a process pool (one worker per core by default); each grid point
+# is split into chunks so every worker stays busy until the end of the sweep. Per grid point the sweep
+# reports the detection probability, sum bits collected and abort round, with 95% confidence intervals.
+import csv
+import itertools
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+Z_95 = 1.959963984540054
+
+def wilson_interval(successes, trials, z=Z_95):
+    """Wilson score interval for a binomial proportion; well behaved at 0 and 1, unlike the normal approximation."""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z**2 / trials
+    centre = (p + z**2 / (2 * trials)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / trials + z**2 / (4 * trials**2)) / denominator
+    return max(0.0, centre - half_width), min(1.0, centre + half_width)
+
+def mean_interval(values, z=Z_95):
+    """Returns (mean, ci_low, ci_high) using the normal approximation; (None, None, None) for no values."""
+    if not values:
+        return None, None, None
+    mean = sum(values) / len(values)
+    if len(values) < 2:
+        return mean, mean, mean
+    variance = sum((v - mean) ** 2 for v in values) / (len(values) - 1)
+    half_width = z * math.sqrt(variance / len(values))
+    return mean, mean - half_width, mean + half_width
+
+def build_grid(num_nodes_values, check_round_frequencies, eavesdropper_bases, target_qubits):
+    """
+    Cartesian product of the settings, as a list of dicts. An eavesdropper basis of None means no
+    eavesdropper (target qubit is then irrelevant and only listed once). Targets outside the network are skipped.
+    """
+    grid = []
+    for num_nodes, frequency, basis in itertools.product(num_nodes_values, check_round_frequencies, eavesdropper_bases):
+        targets = [None] if basis is None else [q for q in target_qubits if q < num_nodes]
+        for target in targets:
+            grid.append({"num_nodes": num_nodes, "check_round_frequency": frequency,
+                         "eavesdropper_basis": basis, "eavesdropped_qubit_idx": target})
+    return grid
+
+def _run_trial_chunk(point, num_trials, target_sum_bits, total_rounds, seed):
+    """
+    Worker: runs num_trials protocol runs for one grid point. Returns (outcomes, seconds): one
+    (detected, bits, abort_round) per trial, and the time this worker spent on them (not queueing).
+    """
+    from Prototype_Event_Log import quiet_log
+    from Prototype_Trial_2_Check_Rounds import SumOfColumnsSimulator
+
+    start = time.perf_counter()
+    random.seed(seed) # Node basis choices use the random module
+    # seed= gives every Aer run its own seed_simulator: rounds and trials stay independent yet reproducible
+    simulator = SumOfColumnsSimulator(num_nodes=point["num_nodes"], num_ghz_states_for_sum=target_sum_bits,
+                                      check_round_frequency=point["check_round_frequency"], event_log=quiet_log(), seed=seed)
+    # One Aer thread per process; the pool already provides the parallelism
+    simulator.q_simulator.set_options(max_parallel_threads=1)
+    eavesdrop = point["eavesdropper_basis"] is not None
+
+    outcomes = []
+    for _ in range(num_trials):
+        simulator.generate_shared_sum(total_rounds=total_rounds,
+                                      enable_eavesdropping_overall=eavesdrop,
+                                      eavesdropper_basis=point["eavesdropper_basis"] or 'Z',
+                                      eavesdropped_qubit_idx=point["eavesdropped_qubit_idx"] or 0)
+        outcomes.append((simulator.eavesdropper_detected_by_check, simulator.actual_sum_bits_collected, simulator.abort_round))
+    return outcomes, time.perf_counter() - start
+
+def _summarise(point, trials, elapsed_s):
+    detections = sum(1 for detected, _, _ in trials if detected)
+    detection_low, detection_high = wilson_interval(detections, len(trials))
+    bits_mean, bits_low, bits_high = mean_interval([bits for _, bits, _ in trials])
+    abort_mean, abort_low, abort_high = mean_interval([abort for _, _, abort in trials if abort is not None])
+    row = dict(point)
+    row.update({
+        "trials": len(trials),
+        "detection_probability": detections / len(trials) if trials else 0.0,
+        "detection_ci_low": detection_low,
+        "detection_ci_high": detection_high,
+        "bits_collected_mean": bits_mean,
+        "bits_collected_ci_low": bits_low,
+        "bits_collected_ci_high": bits_high,
+        "abort_round_mean": abort_mean,
+        "abort_round_ci_low": abort_low,
+        "abort_round_ci_high": abort_high,
+        "worker_seconds": elapsed_s,
+    })
+    return row
+
+def run_detection_sweep(grid, trials_per_point=200, target_sum_bits=4, total_rounds=None,
+                        max_workers=None, chunk_size=25, seed=2024):
+    """
+    Runs trials_per_point protocol runs for every grid point (see build_grid) across a process pool.
+    total_rounds defaults to the formula used by the scenarios in Prototype_Trial_2_Check_Rounds.
+    Returns one result row (dict) per grid point, in grid order.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    seeds = random.Random(seed)
+    trials = {i: [] for i in range(len(grid))}
+    elapsed = {i: 0.0 for i in range(len(grid))}
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {}
+        for i, point in enumerate(grid):
+            rounds = total_rounds or target_sum_bits + target_sum_bits // point["check_round_frequency"]
+            for start in range(0, trials_per_point, chunk_size):
+                n = min(chunk_size, trials_per_point - start)
+                futures[pool.submit(_run_trial_chunk, point, n, target_sum_bits, rounds, seeds.getrandbits(31))] = i
+        for future in as_completed(futures):
+            i = futures[future]
+            outcomes, seconds = future.result()
+            trials[i].extend(outcomes)
+            elapsed[i] += seconds
+    return [_summarise(point, trials[i], elapsed[i]) for i, point in enumerate(grid)]
+
+def print_results_table(rows):
+    header = f"{'nodes':>5} {'freq':>4} {'E-basis':>7} {'E-qubit':>7} {'trials':>6} {'P(detect) [95% CI]':>24} {'bits':>6} {'abort round':>11}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        detection = f"{row['detection_probability']:.3f} [{row['detection_ci_low']:.3f}, {row['detection_ci_high']:.3f}]"
+        abort = f"{row['abort_round_mean']:.2f}" if row["abort_round_mean"] is not None else "-"
+        qubit = row["eavesdropped_qubit_idx"] if row["eavesdropped_qubit_idx"] is not None else "-"
+        print(f"{row['num_nodes']:>5} {row['check_round_frequency']:>4} {str(row['eavesdropper_basis'] or '-'):>7} {qubit:>7} "
+              f"{row['trials']:>6} {detection:>24} {row['bits_collected_mean']:>6.2f} {abort:>11}")
+
+def write_results_csv(rows, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    grid = build_grid(num_nodes_values=[3, 4], check_round_frequencies=[1, 2],
+                      eavesdropper_bases=[None, 'Z', 'X'], target_qubits=[0])
+    start = time.perf_counter()
+    results = run_detection_sweep(grid, trials_per_point=100)
+    print(f"Sweep of {len(grid)} grid points finished in {time.perf_counter() - start:.1f} s on {os.cpu_count()} cores\n")
+    print_results_table(results)
+    write_results_csv(results, "detection_sweep.csv")
+    print("\nResults written to detection_sweep.csv")
@@ -1,62 +1,86 @@
+import time
+from collections import defaultdict
 from qiskit import QuantumCircuit, transpile
 from qiskit_aer import AerSimulator # Using AerSimulator
 
-# --- Parameters ---
-N_NODES = 4
-M_GHZ_STATES = 4 # e.g., for a 3-bit sum
-
-# --- Qiskit Backend ---
-simulator = AerSimulator()
-
-# --- Storing outcomes ---
-# Each node will conceptually get these bits.
-# In a real system, they'd measure their own qubit from each GHZ
-# and find it's the same as others.
-# Here, we simulate generating that common bit for each round.
-list_of_shared_bits = []
-
-print(f"Simulating QMPC Sum Generation for {N_NODES} nodes, using {M_GHZ_STATES} GHZ states for the sum.")
-
-# --- Main Loop for Sum Bit Generation ---
-for m_round in range(M_GHZ_STATES):
-    qc = QuantumCircuit(N_NODES, N_NODES)
-
-    # Prepare GHZ state
-    qc.h(0)
-    for i in range(N_NODES - 1):
-        qc.cx(i, i + 1)
-    qc.barrier()
-
-    # All nodes measure their qubit
-    qc.measure(range(N_NODES), range(N_NODES))
-
-    # Transpile and run
-    compiled_circuit = transpile(qc, simulator)
-    job = simulator.run(compiled_circuit, shots=1)
-    result = job.result()
-    counts = result.get_counts(qc)
-    
-    # Outcome is a string like '0000' or '1111'
-    outcome_str = list(counts.keys())[0] 
-    
-    # All nodes would observe the same outcome for their respective bit.
-    # We take the outcome of the first qubit as the shared bit for this round.
-    shared_bit_for_this_round = outcome_str[0] 
-    list_of_shared_bits.append(shared_bit_for_this_round)
-    
-    print(f"GHZ Round {m_round+1}: Circuit:\n{qc.draw(output='text')}")
-    print(f"GHZ Round {m_round+1}: All nodes measured (e.g., Node 1 got '{outcome_str[0]}', Node 2 got '{outcome_str[1]}', ...). Shared bit: {shared_bit_for_this_round}")
-    print("-" * 30)
-
-# --- Calculate "Sum" (assuming concatenation and conversion to int) ---
-# All nodes would perform this calculation independently using the shared bits.
-binary_sum_string = "".join(list_of_shared_bits)
-final_sum_value = int(binary_sum_string, 2)
-
-print(f"\nShared bits for sum: {list_of_shared_bits}")
-print(f"Binary string for sum: {binary_sum_string}")
-print(f"Final 'Sum' (identical for all nodes): {final_sum_value}")
-
-# --- Leader Election Example ---
-leader_node_index = final_sum_value % N_NODES # 0-indexed
-print(f"Leader selected (0-indexed): Node {leader_node_index}")
\ No newline at end of file
+def generate_shared_sum(num_nodes, num_ghz_states, simulator=None, verbose=True, phase_times=None):
+    """
+    Simulates QMPC sum generation: one single-shot GHZ circuit per sum bit.
+    phase_times: optional dict; seconds per phase (build, transpile, run, parse) are added to it.
+    Returns (final_sum_value, leader_node_index).
+    """
+    # --- Qiskit Backend ---
+    simulator = simulator or AerSimulator()
+    phase_times = phase_times if phase_times is not None else defaultdict(float)
+
+    # --- Storing outcomes ---
+    # Each node will conceptually get these bits.
+    # In a real system, they'd measure their own qubit from each GHZ
+    # and find it's the same as others.
+    # Here, we simulate generating that common bit for each round.
+    list_of_shared_bits = []
+
+    if verbose:
+        print(f"Simulating QMPC Sum Generation for {num_nodes} nodes, using {num_ghz_states} GHZ states for the sum.")
+
+    # --- Main Loop for Sum Bit Generation ---
+    for m_round in range(num_ghz_states):
+        t0 = time.perf_counter()
+        qc = QuantumCircuit(num_nodes, num_nodes)
+
+        # Prepare GHZ state
+        qc.h(0)
+        for i in range(num_nodes - 1):
+            qc.cx(i, i + 1)
+        qc.barrier()
+
+        # All nodes measure their qubit
+        qc.measure(range(num_nodes), range(num_nodes))
+        t1 = time.perf_counter()
+
+        # Transpile and run
+        compiled_circuit = transpile(qc, simulator)
+        t2 = time.perf_counter()
+        job = simulator.run(compiled_circuit, shots=1)
+        result = job.result()
+        t3 = time.perf_counter()
+        counts = result.get_counts(qc)
+
+        # Outcome is a string like '0000' or '1111'
+        outcome_str = list(counts.keys())[0]
+
+        # All nodes would observe the same outcome for their respective bit.
+        # We take the outcome of the first qubit as the shared bit for this round.
+        shared_bit_for_this_round = outcome_str[0]
+        list_of_shared_bits.append(shared_bit_for_this_round)
+        phase_times["build"] += t1 - t0
+        phase_times["transpile"] += t2 - t1
+        phase_times["run"] += t3 - t2
+        phase_times["parse"] += time.perf_counter() - t3
+
+        if verbose:
+            print(f"GHZ Round {m_round+1}: Circuit:\n{qc.draw(output='text')}")
+            print(f"GHZ Round {m_round+1}: All nodes measured (e.g., Node 1 got '{outcome_str[0]}', Node 2 got '{outcome_str[1]}', ...). Shared bit: {shared_bit_for_this_round}")
+            print("-" * 30)
+
+    # --- Calculate "Sum" (assuming concatenation and conversion to int) ---
+    # All nodes would perform this calculation independently using the shared bits.
+    binary_sum_string = "".join(list_of_shared_bits)
+    final_sum_value = int(binary_sum_string, 2)
+
+    # --- Leader Election Example ---
+    leader_node_index = final_sum_value % num_nodes # 0-indexed
+    if verbose:
+        print(f"\nShared bits for sum: {list_of_shared_bits}")
+        print(f"Binary string for sum: {binary_sum_string}")
+        print(f"Final 'Sum' (identical for all nodes): {final_sum_value}")
+        print(f"Leader selected (0-indexed): Node {leader_node_index}")
+    return final_sum_value, leader_node_index
+
+
+if __name__ == "__main__":
+    # --- Parameters ---
+    N_NODES = 4
+    M_GHZ_STATES = 4 # e.g., for a 3-bit sum
+
+    generate_shared_sum(N_NODES, M_GHZ_STATES)
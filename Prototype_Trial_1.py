@@ -1,3 +1,5 @@
+import time
+from collections import defaultdict
 from qiskit import QuantumCircuit, transpile
 from qiskit_aer import AerSimulator
 
@@ -25,14 +27,17 @@ class SumOfColumnsSimulator:
         self.nodes = [QMPCNode(node_id=i) for i in range(num_nodes)]
         self.q_simulator = AerSimulator()
         self.last_circuit_diagram = None # For inspection
+        self.phase_times = defaultdict(float) # Cumulative seconds per phase: build, draw, transpile, run, parse
 
     def _prepare_ghz_circuit_for_one_round(self):
+        start = time.perf_counter()
         # N qubits for N nodes, N classical bits for their measurements
         qc = QuantumCircuit(self.num_nodes, self.num_nodes, name=f"GHZ_Round")
         qc.h(0)
         for i in range(self.num_nodes - 1):
             qc.cx(i, i + 1)
         qc.barrier(label="GHZ_Prepared")
+        self.phase_times["build"] += time.perf_counter() - start
         return qc
 
     def _run_simulation_round(self, qc, eavesdrop_qubit_index=None):
@@ -53,11 +58,15 @@ class SumOfColumnsSimulator:
 
         # All legitimate nodes measure their respective qubits
         qc.measure(range(self.num_nodes), range(self.num_nodes))
+        t0 = time.perf_counter()
         self.last_circuit_diagram = qc.draw(output='text') # Save for printing
+        t1 = time.perf_counter()
 
         compiled_circuit = transpile(qc, self.q_simulator)
+        t2 = time.perf_counter()
         job = self.q_simulator.run(compiled_circuit, shots=1)
         result = job.result()
+        t3 = time.perf_counter()
         counts = result.get_counts(qc)
         
         # Outcome is a string like '0000' or '1111' (if no tampering and ideal GHZ)
@@ -66,13 +75,42 @@ class SumOfColumnsSimulator:
         outcome_str_qiskit_ordered = list(counts.keys())[0]
         # Let's reverse it to match qubit index order (qubit 0 = node 0)
         outcome_str = outcome_str_qiskit_ordered[::-1]
+        self._add_phase_times(t0, t1, t2, t3)
 
         return outcome_str
 
-    def generate_shared_sum(self, enable_eavesdropping_on_round=None, eavesdropped_qubit=0):
+    def _run_simulation_rounds_batched(self, num_rounds):
+        """
+        Runs num_rounds untampered GHZ rounds as the shots of one job (memory=True keeps every shot).
+        Returns one outcome string per round, ordered Node0, Node1, ...
+        """
+        qc = self._prepare_ghz_circuit_for_one_round()
+        qc.measure(range(self.num_nodes), range(self.num_nodes))
+        t0 = time.perf_counter()
+        self.last_circuit_diagram = qc.draw(output='text')
+        t1 = time.perf_counter()
+
+        compiled_circuit = transpile(qc, self.q_simulator)
+        t2 = time.perf_counter()
+        job = self.q_simulator.run(compiled_circuit, shots=num_rounds, memory=True)
+        result = job.result()
+        t3 = time.perf_counter()
+        outcomes = [shot_str[::-1] for shot_str in result.get_memory(qc)]
+        self._add_phase_times(t0, t1, t2, t3)
+        return outcomes
+
+    def _add_phase_times(self, draw_start, transpile_start, run_start, parse_start):
+        self.phase_times["draw"] += transpile_start - draw_start
+        self.phase_times["transpile"] += run_start - transpile_start
+        self.phase_times["run"] += parse_start - run_start
+        self.phase_times["parse"] += time.perf_counter() - parse_start
+
+    def generate_shared_sum(self, enable_eavesdropping_on_round=None, eavesdropped_qubit=0, batched=False):
         """
         enable_eavesdropping_on_round: 0-indexed round number for tampering.
         eavesdropped_qubit: The qubit index the eavesdropper targets.
+        batched: simulate all untampered rounds in a single multi-shot job; only the
+                 eavesdropped round (if any) still gets its own circuit.
         """
         print(f"\n--- Starting Sum Generation ({self.num_ghz_states_for_sum} rounds) ---")
         if enable_eavesdropping_on_round is not None:
@@ -85,17 +123,30 @@ class SumOfColumnsSimulator:
         all_nodes_agree_on_all_bits = True
         generated_shared_bits = [] # For conceptual global view of what the bits *should* be
 
+        batched_outcomes = None
+        if batched:
+            # The eavesdropped round runs its own circuit, so the batch needs one shot fewer
+            eavesdropped_rounds = 1 if enable_eavesdropping_on_round in range(self.num_ghz_states_for_sum) else 0
+            num_batched_rounds = self.num_ghz_states_for_sum - eavesdropped_rounds
+            batched_outcomes = iter(self._run_simulation_rounds_batched(num_batched_rounds) if num_batched_rounds else ())
+            # Kept apart from last_circuit_diagram, which the eavesdropped round's own circuit overwrites
+            batched_circuit_diagram = self.last_circuit_diagram
+
         for m_round in range(self.num_ghz_states_for_sum):
             print(f"\nRound {m_round + 1}/{self.num_ghz_states_for_sum}:")
-            qc = self._prepare_ghz_circuit_for_one_round()
-            
             eavesdrop_this_round = True if m_round == enable_eavesdropping_on_round else False
-            
-            measurement_outcomes_str = self._run_simulation_round(
-                qc, 
-                eavesdrop_qubit_index=eavesdropped_qubit if eavesdrop_this_round else None
-            )
-            print(f"Circuit for Round {m_round+1}:\n{self.last_circuit_diagram}")
+
+            if batched_outcomes is not None and not eavesdrop_this_round:
+                measurement_outcomes_str = next(batched_outcomes)
+                round_circuit_diagram = batched_circuit_diagram
+            else:
+                qc = self._prepare_ghz_circuit_for_one_round()
+                measurement_outcomes_str = self._run_simulation_round(
+                    qc,
+                    eavesdrop_qubit_index=eavesdropped_qubit if eavesdrop_this_round else None
+                )
+                round_circuit_diagram = self.last_circuit_diagram
+            print(f"Circuit for Round {m_round+1}:\n{round_circuit_diagram}")
             print(f"Raw measurement outcome string (Node0,Node1,...): '{measurement_outcomes_str}'")
 
             # In an ideal untampered GHZ state, all bits in measurement_outcomes_str are the same.
@@ -145,21 +196,22 @@ class SumOfColumnsSimulator:
             print("This indicates that the entanglement was likely disturbed or an error occurred.")
             return None, None
 
-# --- Simulation Parameters ---
-N_NODES = 4
-M_GHZ_STATES = 4 # 4 bits for the sum
-
-# --- Run Ideal Scenario ---
-print("*************************")
-print("* IDEAL SCENARIO      *")
-print("*************************")
-simulator_ideal = SumOfColumnsSimulator(num_nodes=N_NODES, num_ghz_states_for_sum=M_GHZ_STATES)
-ideal_sum, ideal_leader = simulator_ideal.generate_shared_sum()
-
-# --- Run Tampering Scenario ---
-print("\n\n*************************")
-print("* TAMPERING SCENARIO   *")
-print("*************************")
-simulator_tampered = SumOfColumnsSimulator(num_nodes=N_NODES, num_ghz_states_for_sum=M_GHZ_STATES)
-# Eavesdrop on the 2nd round (index 1), targeting the first node's qubit (index 0)
-tampered_sum, tampered_leader = simulator_tampered.generate_shared_sum(enable_eavesdropping_on_round=1, eavesdropped_qubit=2)
\ No newline at end of file
+if __name__ == "__main__":
+    # --- Simulation Parameters ---
+    N_NODES = 4
+    M_GHZ_STATES = 4 # 4 bits for the sum
+
+    # --- Run Ideal Scenario ---
+    print("*************************")
+    print("* IDEAL SCENARIO      *")
+    print("*************************")
+    simulator_ideal = SumOfColumnsSimulator(num_nodes=N_NODES, num_ghz_states_for_sum=M_GHZ_STATES)
+    ideal_sum, ideal_leader = simulator_ideal.generate_shared_sum()
+
+    # --- Run Tampering Scenario ---
+    print("\n\n*************************")
+    print("* TAMPERING SCENARIO   *")
+    print("*************************")
+    simulator_tampered = SumOfColumnsSimulator(num_nodes=N_NODES, num_ghz_states_for_sum=M_GHZ_STATES)
+    # Eavesdrop on the 2nd round (index 1), targeting the first node's qubit (index 0)
+    tampered_sum, tampered_leader = simulator_tampered.generate_shared_sum(enable_eavesdropping_on_round=1, eavesdropped_qubit=2)
\ No newline at end of file
@@ -1,194 +1,859 @@
+import math
 import random
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+import numpy as np
 from collections import Counter
+from Prototype_Event_Log import ProtocolEventLog, DEBUG, INFO, WARNING, ERROR, verbose_log
+from Prototype_GHZ_Sampler import BASIS_X, detect_tampering
+from QisGem_Result_Cache import array_to_memory, circuit_digest, memory_to_array
+from Prototype_Noise import choose_simulation_method, has_mid_circuit_measurement
+from QisGem_MPS_Runner import bond_dimensions
+# qiskit and qiskit_aer are imported where circuits are built or run, so QMPCNode and
+# RoundOutcomeStore can be used (e.g. by the closed-form engines) without paying their import time.
+
+# Gates a stabilizer (tableau) simulator can run; every round circuit built below only uses these
+CLIFFORD_OPERATIONS = {"h", "x", "y", "z", "s", "sdg", "cx", "cy", "cz", "swap", "id", "measure", "barrier", "reset"}
+# Text diagrams of very wide circuits are unreadable and slow to render
+MAX_DIAGRAM_NODES = 16
+# Label of the MPS saved right after GHZ preparation in matrix_product_state runs
+GHZ_MPS_LABEL = "ghz_mps"
+# Widest circuit (in qubits) that packed mode fills with side-by-side rounds, per simulation method.
+# Measured on Aer with 4-node rounds: stabilizer throughput peaks around 128 qubits (tableau updates
+# are O(width)), MPS flattens out beyond ~64 (blocks stay unentangled, bond dimension 1 between them),
+# while statevector (2^n) and density matrix (4^n) only gain while the state is tiny.
+PACKING_QUBIT_BUDGET = {"stabilizer": 128, "matrix_product_state": 256, "statevector": 12, "density_matrix": 6}
+# Multi-round circuits measure check rounds through ry(angle) with the angle bound at run time, so one
+# compiled circuit serves every draw of the bases: ry(-pi/2) maps |+>/|-> to |0>/|1> like H does.
+BASIS_ANGLES = {'Z': 0.0, 'X': -np.pi / 2}
+BASIS_PARAMETER_PREFIX = "basis"
+
+def _is_basis_rotation(operation):
+    """ry(basis parameter): only ever bound to a BASIS_ANGLES value, so Clifford."""
+    return (operation.name == "ry" and len(operation.params) == 1
+            and getattr(operation.params[0], "name", "").startswith(BASIS_PARAMETER_PREFIX))
+
+def _basis_parameter(round_index, node):
+    """
+    Parameter for node's basis in the round_index-th round of a multi-round circuit. Its uuid is derived
+    from the name, so the same circuit built twice (or in another process) has the same QPY digest.
+    """
+    from qiskit.circuit import Parameter
+    name = f"{BASIS_PARAMETER_PREFIX}{round_index}_{node}"
+    return Parameter(name, uuid=uuid.uuid5(uuid.NAMESPACE_OID, name))
+
+def is_clifford_circuit(qc):
+    return all(instruction.operation.name in CLIFFORD_OPERATIONS or _is_basis_rotation(instruction.operation) for instruction in qc.data)
+
+class PackedBitAccumulator:
+    """
+    Stores a growing bit string 8 bits per byte and keeps (value % modulus) up to date as bits arrive.
+    Appending is O(1) (no big-int shifts), so sums of millions of bits stay cheap; the full integer and
+    the bit history are only materialised on request.
+    """
+    def __init__(self, modulus=None, keep_bits=True):
+        """keep_bits=False only counts bits and tracks value_mod, for when the bits are stored elsewhere."""
+        self.modulus = modulus
+        self.keep_bits = keep_bits
+        self.reset()
+
+    def append(self, bit):
+        bit = int(bit) # Accepts 0/1 as well as the '0'/'1' characters of outcome strings
+        self.num_bits += 1
+        if self.modulus:
+            self.value_mod = (2 * self.value_mod + bit) % self.modulus
+        if not self.keep_bits:
+            return
+        self._pending = (self._pending << 1) | bit
+        if self.num_bits % 8 == 0:
+            self._packed.append(self._pending)
+            self._pending = 0
+
+    def value(self):
+        """The accumulated bits read as a binary number, most significant (first) bit first."""
+        pending_bits = self.num_bits % 8
+        return (int.from_bytes(self._packed, "big") << pending_bits) | self._pending
+
+    def bits(self):
+        """Bit history as a list of ints, oldest first."""
+        pending_bits = self.num_bits % 8
+        history = [(byte >> shift) & 1 for byte in self._packed for shift in range(7, -1, -1)]
+        history.extend((self._pending >> shift) & 1 for shift in range(pending_bits - 1, -1, -1))
+        return history
+
+    def nbytes(self):
+        return len(self._packed) + 1
+
+    def reset(self):
+        self._packed = bytearray()
+        self._pending = 0 # Bits not yet filling a whole byte
+        self.num_bits = 0
+        self.value_mod = 0
+
+def _outcome_row(outcome_str):
+    """'0110' -> array([0, 1, 1, 0], dtype=uint8) without a Python-level loop."""
+    return np.frombuffer(outcome_str.encode("ascii"), dtype=np.uint8) - ord("0")
+
+class RoundOutcomeStore:
+    """
+    One shared, growable record of every round's raw outcomes, owned by the simulator.
+    Sum rounds: sum_outcomes (rounds x nodes, uint8) plus whether the round's bit was agreed.
+    Check rounds: check_bases (0 = Z, 1 = X) and check_outcomes (rounds x nodes, uint8).
+    Agreed sum bits: the bit of every accepted sum round, once (all nodes measured the same bit).
+    Nodes read their column through zero-copy views instead of each keeping its own copy.
+    Views are only valid until the next round is added (the arrays may be reallocated to grow).
+    """
+    def __init__(self, num_nodes, initial_capacity=64):
+        self.num_nodes = num_nodes
+        self._sum_outcomes = np.zeros((initial_capacity, num_nodes), dtype=np.uint8)
+        self._sum_accepted = np.zeros(initial_capacity, dtype=bool)
+        self._check_bases = np.zeros((initial_capacity, num_nodes), dtype=np.uint8)
+        self._check_outcomes = np.zeros((initial_capacity, num_nodes), dtype=np.uint8)
+        self._agreed_bits = np.zeros(initial_capacity, dtype=np.uint8)
+        self.num_sum_rounds = 0
+        self.num_check_rounds = 0
+        self.num_agreed_bits = 0
+        self._agreed_sum = (0, 0) # (num_agreed_bits, value) of the last agreed_sum() call
+
+    @staticmethod
+    def _grown(array, needed_rows):
+        if needed_rows <= len(array):
+            return array
+        grown = np.zeros((max(needed_rows, 2 * len(array)),) + array.shape[1:], dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+    def add_sum_round(self, outcome_str, accepted):
+        row = self.num_sum_rounds
+        self._sum_outcomes = self._grown(self._sum_outcomes, row + 1)
+        self._sum_accepted = self._grown(self._sum_accepted, row + 1)
+        self._sum_outcomes[row] = _outcome_row(outcome_str)
+        self._sum_accepted[row] = accepted
+        self.num_sum_rounds += 1
+        if accepted:
+            self._agreed_bits = self._grown(self._agreed_bits, self.num_agreed_bits + 1)
+            self._agreed_bits[self.num_agreed_bits] = self._sum_outcomes[row, 0]
+            self.num_agreed_bits += 1
+
+    def add_check_round(self, node_bases_choices, outcome_str):
+        row = self.num_check_rounds
+        self._check_bases = self._grown(self._check_bases, row + 1)
+        self._check_outcomes = self._grown(self._check_outcomes, row + 1)
+        self._check_bases[row] = [BASIS_X if basis == 'X' else 0 for basis in node_bases_choices]
+        self._check_outcomes[row] = _outcome_row(outcome_str)
+        self.num_check_rounds += 1
+
+    # Zero-copy views over the rounds recorded so far
+    def sum_outcomes(self):
+        return self._sum_outcomes[:self.num_sum_rounds]
+
+    def sum_accepted(self):
+        return self._sum_accepted[:self.num_sum_rounds]
+
+    def check_bases(self):
+        return self._check_bases[:self.num_check_rounds]
+
+    def check_outcomes(self):
+        return self._check_outcomes[:self.num_check_rounds]
+
+    def agreed_sum_bits(self, node_id=0):
+        """A node's bits from the accepted sum rounds, oldest first. The same for every node, so node_id is not needed."""
+        return self._agreed_bits[:self.num_agreed_bits]
+
+    def agreed_sum(self):
+        """The agreed sum bits read as a binary number, first bit most significant; packed once per new bit, shared by all nodes."""
+        num_bits, value = self._agreed_sum
+        if num_bits != self.num_agreed_bits:
+            padding = (-self.num_agreed_bits) % 8 # packbits pads the last byte with zeros on the right
+            value = int.from_bytes(np.packbits(self.agreed_sum_bits()).tobytes(), "big") >> padding
+            self._agreed_sum = (self.num_agreed_bits, value)
+        return value
+
+    def check_rounds_flagged(self):
+        """Vectorized re-verification of every recorded check round (same rules as _perform_check_round)."""
+        return detect_tampering(self.check_bases(), self.check_outcomes())
+
+    def nbytes(self):
+        return sum(a.nbytes for a in (self._sum_outcomes, self._sum_accepted, self._check_bases, self._check_outcomes, self._agreed_bits))
+
+    def clear(self):
+        self.num_sum_rounds = 0
+        self.num_check_rounds = 0
+        self.num_agreed_bits = 0
+        self._agreed_sum = (0, 0)
 
 class QMPCNode:
-    def __init__(self, node_id):
+    def __init__(self, node_id, num_nodes=None, outcome_store=None, sum_modulus=None):
+        """
+        num_nodes: if given, the node tracks its running sum % num_nodes (the leader index) as bits arrive.
+        outcome_store: shared RoundOutcomeStore; the node then reads its bits from its column there
+            instead of keeping its own copy.
+        sum_modulus: keep the sum only modulo this (e.g. 2**256) instead of every bit, in constant memory.
+            calculate_sum then returns sum % sum_modulus and the bit history is not available; the leader
+            index is still that of the full sum. Not combined with outcome_store, which keeps every round.
+        """
+        if sum_modulus is not None and outcome_store is not None:
+            raise ValueError("sum_modulus keeps constant memory; it cannot be combined with an outcome_store")
         self.node_id = node_id
-        self.measured_bits_for_sum = []
+        self.num_nodes = num_nodes
+        self.outcome_store = outcome_store
+        self.sum_modulus = sum_modulus
+        # One running value modulo lcm(num_nodes, sum_modulus) gives both sum % sum_modulus and the leader index
+        modulus = num_nodes if sum_modulus is None else math.lcm(num_nodes or 1, sum_modulus)
+        self.sum_bits = PackedBitAccumulator(modulus=modulus, keep_bits=outcome_store is None and sum_modulus is None)
         self.chosen_basis_for_check = None # 'Z' or 'X'
         self.outcome_for_check = None    # 0 or 1
 
+    # Zero-copy views of this node's column in the shared store
+    @property
+    def sum_outcome_view(self):
+        return self.outcome_store.sum_outcomes()[:, self.node_id]
+
+    @property
+    def check_basis_view(self):
+        return self.outcome_store.check_bases()[:, self.node_id]
+
+    @property
+    def check_outcome_view(self):
+        return self.outcome_store.check_outcomes()[:, self.node_id]
+
+    def _sum_bit_history(self):
+        if self.sum_modulus is not None:
+            raise ValueError(f"Node {self.node_id} keeps its sum modulo {self.sum_modulus} only, not the bits")
+        if self.outcome_store is not None:
+            return self.outcome_store.agreed_sum_bits(self.node_id).tolist()
+        return self.sum_bits.bits()
+
+    @property
+    def measured_bits_for_sum(self):
+        """Bit history as '0'/'1' strings, exported on demand."""
+        return [str(bit) for bit in self._sum_bit_history()]
+
+    @property
+    def sum_mod_nodes(self):
+        return self.sum_bits.value_mod % self.num_nodes if self.num_nodes else self.sum_bits.value_mod
+
     def record_sum_bit(self, bit):
-        self.measured_bits_for_sum.append(str(bit)) # Ensure bits are stored as strings
+        self.sum_bits.append(bit)
 
     def choose_random_basis(self):
         self.chosen_basis_for_check = random.choice(['Z', 'X'])
         return self.chosen_basis_for_check
 
     def calculate_sum(self):
-        if not self.measured_bits_for_sum:
-            return 0
-        binary_sum_string = "".join(self.measured_bits_for_sum)
-        if not binary_sum_string: # Handle case where no bits were recorded
+        if self.sum_bits.num_bits == 0: # Handle case where no bits were recorded
             return 0
-        return int(binary_sum_string, 2)
+        if self.outcome_store is not None:
+            return self.outcome_store.agreed_sum()
+        if self.sum_modulus is not None:
+            return self.sum_bits.value_mod % self.sum_modulus
+        return self.sum_bits.value()
 
     def reset(self):
-        self.measured_bits_for_sum = []
+        self.sum_bits.reset()
         self.chosen_basis_for_check = None
         self.outcome_for_check = None
 
+class CompiledCircuitCache:
+    """
+    LRU cache of transpiled round circuits.
+    A round's circuit only depends on its shape (round type, number of nodes, basis choices,
+    eavesdropper config, backend), so each distinct shape is built and transpiled once.
+    """
+    def __init__(self, max_size=128):
+        self.max_size = max_size
+        self._entries = OrderedDict() # key -> (logical circuit, compiled circuit)
+        self._lock = threading.Lock() # Simulators in different threads (pipelined or concurrent runs) may share the cache
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, build_circuit, backend, phase_times=None):
+        """
+        Returns (qc, compiled_qc) for key, calling build_circuit() and transpiling only on a miss.
+        phase_times: optional dict; seconds spent building and transpiling are added under 'build' / 'transpile'.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        from qiskit import transpile
+        # Built outside the lock: two threads missing the same key at once both build it, harmlessly
+        start = time.perf_counter()
+        qc = build_circuit()
+        built = time.perf_counter()
+        # Aer has no coupling map, so unrolling to its basis gates is all transpile needs to do.
+        # Passing the backend itself rebuilds its Target on every call, which is slow for the
+        # stabilizer method's 10,000-qubit target.
+        entry = (qc, transpile(qc, basis_gates=backend.configuration().basis_gates))
+        if phase_times is not None:
+            phase_times["build"] += built - start
+            phase_times["transpile"] += time.perf_counter() - built
+        with self._lock:
+            self._entries[key] = entry
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False) # Evict least recently used shape
+        return entry
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+# One completed protocol round, as yielded by SumOfColumnsSimulator.iter_rounds.
+#   round: 1-indexed round number; kind: 'sum' or 'check'; bases: one 'Z'/'X' per node ('Z' * n for sum rounds);
+#   outcomes: measured bits (N0,N1,...); consistent: sum round whose nodes agree / check round that passed;
+#   detected: tampering was concluded at this check round (the protocol stops after it); bit: the agreed sum bit, else None.
+#   Without a check scheduler every failed check concludes tampering; with one, only its sequential test does.
+RoundRecord = namedtuple("RoundRecord", "round kind bases outcomes consistent detected bit")
+
+# A job that has been started for one round (or, for multi-round circuits, several): everything needed to finish it
+_RoundHandle = namedtuple("_RoundHandle", "rounds circuit_key qc compiled_circuit shots method reason cache_key cached job submit_seconds")
+
 class SumOfColumnsSimulator:
-    def __init__(self, num_nodes, num_ghz_states_for_sum, check_round_frequency=3):
+    def __init__(self, num_nodes, num_ghz_states_for_sum, check_round_frequency=3, circuit_cache=None, simulation_method="automatic", event_log=None,
+                 keep_round_history=False, result_cache=None, noise=None, ghz_extension=None, backend=None, check_scheduler=None, seed=None,
+                 sum_modulus_bits=None):
+        """
+        keep_round_history: record every round's raw outcomes in one shared RoundOutcomeStore (self.round_outcomes)
+            that the nodes view into, e.g. to re-verify the check rounds afterwards. It grows by a byte per node
+            per round, so it is off by default: nodes then only keep their packed agreed sum bits.
+        sum_modulus_bits: k > 0 keeps each node's sum only modulo 2**k, so a long run holds constant memory
+            (needs keep_round_history=False). The result's sum is then sum % 2**k; the leader index is still
+            that of the full sum, tracked bit by bit.
+        event_log: ProtocolEventLog receiving the protocol's events. The default prints per-run summaries
+            only; use Prototype_Event_Log.verbose_log() for the per-round narration with circuit diagrams.
+        simulation_method: 'automatic', 'stabilizer' or any other AerSimulator method (e.g. 'statevector').
+            'automatic' picks the stabilizer method, because every round circuit (H, CX chain, optional H,
+            measure) is Clifford; memory then grows polynomially with num_nodes instead of as 2^num_nodes.
+            With non-Pauli noise it chooses per run between density matrix and trajectories, from the
+            circuit width, the shot count and mid-circuit measurements (see Prototype_Noise).
+        noise: Prototype_Noise.ChannelNoise applied to every round (gate depolarizing, amplitude damping,
+            readout flips); None for an ideal channel.
+        ghz_extension: optional callable(qc) appending gates after the GHZ preparation of every round,
+            e.g. cry rotations between neighbours. Non-Clifford extensions rule out the stabilizer method;
+            beyond statevector sizes 'automatic' then picks matrix_product_state, whose runs record the
+            bond dimension of the prepared state in self.max_bond_dimension.
+        backend: an AerSimulator shared with other simulators, so their jobs queue on one backend (see
+            generate_shared_sums). This simulator's method and noise model are then passed with each run.
+        check_scheduler: decides when check rounds run and when their evidence amounts to tampering, instead
+            of a check every check_round_frequency sum rounds and an abort on the first failed check
+            (e.g. Prototype_Adaptive_Checks.SPRTCheckScheduler). Needs is_check_round(sum_rounds_since_check),
+            record_check(flagged) -> 'continue' / 'clean' / 'tampering', reset() and describe().
+        seed: makes runs reproducible. Every Aer run gets its own seed_simulator, drawn from a generator
+            seeded once here, so a new simulator with the same seed replays the same rounds while rounds
+            stay independent. (Do not pin seed_simulator on the backend instead: every 1-shot run would then
+            replay the same random stream, and all sum rounds would return the same bit.)
+        result_cache: QisGem_Result_Cache.ResultCache for job results. Only used with a seed, since only then
+            is a run's outcome fixed by its circuit, shots and per-run seed; that seed is part of the key, so a
+            hit replays the same run of a repeated seeded protocol run, never a different round of the same shape.
+            Only jobs covering several rounds are stored (batched sum rounds, multi-round circuits): a single
+            1-shot round simulates faster than its cache entry is written and read back.
+        """
         self.num_nodes = num_nodes
         self.num_total_rounds = num_ghz_states_for_sum # This will now be total rounds, some are checks
         self.check_round_frequency = check_round_frequency # Run a check round every K rounds
         self.actual_sum_bits_collected = 0
+        self.discarded_sum_rounds = 0 # Sum rounds of the last run whose Z outcomes disagreed
 
-        self.nodes = [QMPCNode(node_id=i) for i in range(num_nodes)]
-        self.q_simulator = AerSimulator()
-        self.last_circuit_diagram = None
+        if sum_modulus_bits is not None and keep_round_history:
+            raise ValueError("sum_modulus_bits keeps constant memory; it needs keep_round_history=False")
+        self.sum_modulus_bits = sum_modulus_bits
+        self.round_outcomes = RoundOutcomeStore(num_nodes) if keep_round_history else None
+        sum_modulus = 2**sum_modulus_bits if sum_modulus_bits is not None else None
+        self.nodes = [QMPCNode(node_id=i, num_nodes=num_nodes, outcome_store=self.round_outcomes, sum_modulus=sum_modulus)
+                      for i in range(num_nodes)]
+        self.noise = noise
+        self.ghz_extension = ghz_extension
+        self._save_mps = False # The probe circuit in _select_simulation_method must not contain Aer save instructions
+        self.simulation_method, self.simulation_method_reason = self._select_simulation_method(simulation_method)
+        self._save_mps = self.simulation_method == "matrix_product_state"
+        self.max_bond_dimension = None # Largest bond dimension of a prepared round state (MPS runs only)
+        # Only non-Pauli noise makes the best method depend on the run (shots, mid-circuit measurements)
+        self._choose_method_per_run = simulation_method == "automatic" and noise is not None and not noise.is_pauli
+        noise_model = noise.to_noise_model() if noise else None
+        if backend is None:
+            from qiskit_aer import AerSimulator
+            backend = AerSimulator(method=self.simulation_method, noise_model=noise_model)
+            self._noise_run_options = {}
+        else:
+            self._noise_run_options = {"noise_model": noise_model} if noise_model is not None else {}
+        self.q_simulator = backend
+        # Can be shared between simulators; keys include num_nodes and the backend
+        self.circuit_cache = circuit_cache if circuit_cache is not None else CompiledCircuitCache()
+        self.log = event_log if event_log is not None else ProtocolEventLog()
+        self.result_cache = result_cache
+        self._run_seeds = np.random.default_rng(seed) if seed is not None else None # Per-run seed_simulator values
+        # Basis rotations bound at run time are ry gates, which the noise model leaves out (it attaches 1-qubit
+        # errors to h); with 1-qubit gate noise, multi-round circuits keep the H gates and fixed bases instead.
+        self._bases_bound_at_run_time = noise is None or not (noise.depolarizing_1q or noise.amplitude_damping)
+        self._circuit_digests = {} # Round-circuit cache key -> QPY digest of the logical circuit
+        self.last_circuit = None
         self.eavesdropper_detected_by_check = False
+        self.phase_times = defaultdict(float) # Cumulative seconds per phase: build, transpile, run, parse
+        self.method_runs = Counter() # Simulation method -> number of runs that used it
+        self.last_run_method = None
+        self.last_run_method_reason = None
+        self.rounds_run = 0 # Rounds executed by the last generate_shared_sum call
+        self.abort_round = None # 1-indexed round whose check detected tampering, if any
+        self.check_scheduler = check_scheduler
+
 
+    @property
+    def last_circuit_diagram(self):
+        """Text diagram of the last round's circuit, rendered on request only."""
+        if self.last_circuit is None:
+            return None
+        if self.num_nodes > MAX_DIAGRAM_NODES:
+            return f"<{self.num_nodes}-qubit circuit, diagram omitted>"
+        return self.last_circuit.draw(output='text')
+
+    def _select_simulation_method(self, requested_method):
+        """Returns (method, reason) for the AerSimulator backend."""
+        if requested_method != "automatic":
+            if requested_method == "stabilizer" and self.noise is not None and not self.noise.is_pauli:
+                raise ValueError(f"The stabilizer method only supports Pauli noise, got {self.noise.describe()}")
+            return requested_method, "requested explicitly"
+        # Probe the widest circuit this simulator builds: a check round with eavesdropper and X-basis measurements
+        probe = self._build_round_circuit("check", ['X'] * self.num_nodes, True, 0, 'X')
+        # Rounds run one shot at a time unless batched; _run_quantum_part revisits this per run if needed
+        return choose_simulation_method(self.num_nodes, is_clifford_circuit(probe), self.noise, shots=1)
 
     def _prepare_ghz_circuit_for_one_round(self, round_name="GHZ_Round"):
+        from qiskit import QuantumCircuit
         qc = QuantumCircuit(self.num_nodes, self.num_nodes, name=round_name)
         qc.h(0)
         for i in range(self.num_nodes - 1):
             qc.cx(i, i + 1)
+        if self.ghz_extension is not None:
+            self.ghz_extension(qc)
         qc.barrier(label="GHZ_Prepared")
+        if self._save_mps:
+            qc.save_matrix_product_state(label=GHZ_MPS_LABEL)
         return qc
 
     def _apply_measurement_gates(self, qc, node_bases_choices):
-        """Applies measurement gates based on nodes' chosen bases."""
+        """Applies measurement gates based on nodes' chosen bases ('Z', 'X', or a basis Parameter bound at run time)."""
         for i in range(self.num_nodes):
             if node_bases_choices[i] == 'X':
                 qc.h(i) # Apply Hadamard for X-basis measurement
+            elif node_bases_choices[i] != 'Z':
+                qc.ry(node_bases_choices[i], i) # BASIS_ANGLES value bound when the circuit runs
             qc.measure(i, i) # Measure qubit i into classical bit i
 
-    def _run_quantum_part(self, qc, eavesdrop_this_round=False, eavesdropped_qubit=0, eavesdropper_basis='Z'):
-        """Handles eavesdropping and runs the quantum circuit."""
+    def _apply_eavesdropper(self, qc, eavesdropped_qubit, eavesdropper_basis, classical_bit):
+        if eavesdropper_basis == 'X':
+            qc.h(eavesdropped_qubit)
+        # The outcome lands in a node's classical bit and is overwritten by that node's own measurement;
+        # only the disturbance of the state matters here.
+        qc.measure(eavesdropped_qubit, classical_bit)
+        qc.barrier(label=f"Eavesdrop_Q{eavesdropped_qubit}")
+
+    def _build_round_circuit(self, round_kind, node_bases_choices, eavesdrop_this_round, eavesdropped_qubit, eavesdropper_basis):
+        """
+        Builds the full circuit of one round.
+        Sum rounds: GHZ, Z-measurements, then the eavesdropper's measurement.
+        Check rounds: GHZ, the eavesdropper's measurement, then each node's basis change and measurement.
+        """
+        if round_kind == "sum":
+            qc = self._prepare_ghz_circuit_for_one_round(round_name="SumRound")
+            self._apply_measurement_gates(qc, node_bases_choices)
+            if eavesdrop_this_round:
+                self._apply_eavesdropper(qc, eavesdropped_qubit, eavesdropper_basis, eavesdropped_qubit)
+        else:
+            qc = self._prepare_ghz_circuit_for_one_round(round_name="CheckRound")
+            if eavesdrop_this_round:
+                self._apply_eavesdropper(qc, eavesdropped_qubit, eavesdropper_basis, 0)
+            self._apply_measurement_gates(qc, node_bases_choices)
+        return qc
+
+    def _get_round_circuit(self, round_kind, node_bases_choices, eavesdrop_this_round=False, eavesdropped_qubit=0, eavesdropper_basis='Z',
+                           phase_times=None):
+        """
+        Returns (qc, compiled_qc) for a round, from the compiled-circuit cache when this shape was seen before.
+        phase_times: where build/transpile seconds go; defaults to self.phase_times.
+        """
+        key = self._round_circuit_key(round_kind, node_bases_choices, eavesdrop_this_round, eavesdropped_qubit, eavesdropper_basis)
+        return self.circuit_cache.get(key, lambda: self._build_checked_round_circuit(
+            round_kind, node_bases_choices, eavesdrop_this_round, eavesdropped_qubit, eavesdropper_basis), self.q_simulator,
+            phase_times if phase_times is not None else self.phase_times)
+
+    def _round_circuit_key(self, round_kind, node_bases_choices, eavesdrop_this_round, eavesdropped_qubit, eavesdropper_basis):
+        eavesdrop_config = (eavesdropped_qubit, eavesdropper_basis) if eavesdrop_this_round else None
+        bases = tuple(node_bases_choices) if node_bases_choices is not None else None # None: bound at run time
+        return (round_kind, self.num_nodes, bases, eavesdrop_config,
+                self.q_simulator.name, self.simulation_method, self.ghz_extension)
+
+    def _get_multi_round_circuit(self, rounds, blocks):
+        """(qc, compiled_qc) running several rounds in one circuit (see _build_multi_round_circuit), via the cache."""
+        rounds = self._multi_round_template(rounds)
+        return self.circuit_cache.get(self._multi_round_circuit_key(rounds, blocks), lambda: self._build_multi_round_circuit(rounds, blocks),
+                                      self.q_simulator, self.phase_times)
+
+    def _multi_round_template(self, rounds):
+        """
+        rounds with the check-round bases left open (None) when they are bound at run time, so the circuit
+        only depends on the pattern of round kinds and repeats from chunk to chunk.
+        """
+        if not self._bases_bound_at_run_time:
+            return rounds
+        return tuple((round_kind, None if round_kind == "check" else bases, *rest) for round_kind, bases, *rest in rounds)
+
+    def _multi_round_circuit_key(self, rounds, blocks):
+        return ("multi", blocks) + tuple(self._round_circuit_key(*round_args) for round_args in self._multi_round_template(rounds))
+
+    def _basis_parameter_binds(self, rounds):
+        """Aer parameter_binds giving each open check-round basis of a multi-round circuit its BASIS_ANGLES value."""
+        return {f"{BASIS_PARAMETER_PREFIX}{k}_{i}": BASIS_ANGLES[basis] for k, (round_kind, bases, *_) in enumerate(rounds)
+                if round_kind == "check" for i, basis in enumerate(bases)}
+
+    def _build_multi_round_circuit(self, rounds, blocks):
+        """
+        One circuit for several rounds, each measured into its own register round<k>.
+        Rounds are packed `blocks` at a time side by side on disjoint groups of num_nodes qubits (a layer);
+        every qubit is reset before the next layer prepares its GHZ states. Rounds in one layer share no
+        gates, so their outcomes are as independent as those of separate jobs.
+        Check rounds whose bases are None (see _multi_round_template) measure through ry(basis<k>_<i>)
+        parameters bound per run; otherwise their bases are fixed in the circuit.
+        """
+        from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+        n = self.num_nodes
+        rounds = [(round_kind, [_basis_parameter(k, i) for i in range(n)] if bases is None else bases, *rest)
+                  for k, (round_kind, bases, *rest) in enumerate(rounds)]
+        registers = [ClassicalRegister(n, f"round{k}") for k in range(len(rounds))]
+        width = n * min(blocks, len(rounds))
+        qc = QuantumCircuit(QuantumRegister(width, "q"), *registers, name=f"MultiRound{len(rounds)}x{min(blocks, len(rounds))}")
+
+        def append(k, block, instructions, round_qc):
+            for instruction in instructions:
+                qc.append(instruction.operation, [block * n + round_qc.find_bit(q).index for q in instruction.qubits],
+                          [registers[k][round_qc.find_bit(c).index] for c in instruction.clbits])
+
+        for layer_start in range(0, len(rounds), blocks):
+            if layer_start > 0:
+                qc.reset(range(width))
+            layer = [(k, self._build_checked_round_circuit(*rounds[k])) for k in range(layer_start, min(layer_start + blocks, len(rounds)))]
+            # Aer only saves the MPS of all qubits, and save labels must be unique: prepare every block of
+            # the first layer, save their joint (product) state once, then measure. Later layers prepare
+            # the same states, so their saves are dropped.
+            split = [self._split_at_mps_save(round_qc) for _, round_qc in layer]
+            for block, ((k, round_qc), (prepare, _)) in enumerate(zip(layer, split)):
+                append(k, block, prepare, round_qc)
+            if self._save_mps and layer_start == 0:
+                qc.save_matrix_product_state(label=GHZ_MPS_LABEL)
+            for block, ((k, round_qc), (_, finish)) in enumerate(zip(layer, split)):
+                append(k, block, finish, round_qc)
+        return qc
+
+    @staticmethod
+    def _split_at_mps_save(round_qc):
+        """(instructions before the MPS save, instructions after it); everything is 'before' if there is no save."""
+        for index, instruction in enumerate(round_qc.data):
+            if instruction.operation.name == "save_matrix_product_state":
+                return round_qc.data[:index], round_qc.data[index + 1:]
+        return round_qc.data, []
+
+    def _packing_blocks(self):
+        """How many rounds fit side by side in one circuit within PACKING_QUBIT_BUDGET (at least 1)."""
+        return max(1, PACKING_QUBIT_BUDGET.get(self.simulation_method, self.num_nodes) // self.num_nodes)
+
+    def _result_cache_key(self, qc, circuit_key, num_rounds, shots, run_options):
+        """
+        ResultCache key for a job with its own seed_simulator (see seed), or None when its result is not
+        cacheable or, covering a single round, not worth caching.
+        """
+        seed = run_options.get("seed_simulator")
+        if self.result_cache is None or seed is None or num_rounds * shots == 1:
+            return None
+        digest = self._circuit_digests.get(circuit_key)
+        if digest is None:
+            # The logical circuit: transpiling it for this backend and library versions (both in the key) is
+            # deterministic, while the compiled one re-wraps basis parameters in fresh expressions every time
+            digest = self._circuit_digests[circuit_key] = circuit_digest(qc)
+        return self.result_cache.key(backend=self.q_simulator, shots=shots, seed=seed, circuits_digest=digest, memory=True, **run_options)
+
+    def _build_checked_round_circuit(self, *round_args):
+        qc = self._build_round_circuit(*round_args)
+        if self.simulation_method == "stabilizer" and not is_clifford_circuit(qc):
+            raise ValueError(f"Circuit '{qc.name}' is not Clifford and cannot run with the stabilizer method")
+        return qc
+
+    def _run_quantum_part(self, round_kind, node_bases_choices, eavesdrop_this_round=False, eavesdropped_qubit=0, eavesdropper_basis='Z', shots=1):
+        """Runs the (cached) round circuit and returns one outcome string (N0,N1,...) per shot."""
+        round_args = (round_kind, node_bases_choices, eavesdrop_this_round, eavesdropped_qubit, eavesdropper_basis)
+        return self._collect_round(self._submit_round(round_args, shots))
+
+    def _submit_round(self, round_args, shots, phase_times=None):
+        """
+        Builds and transpiles the round circuit (via the cache) and starts its job, without waiting for it.
+        Aer jobs run asynchronously, so the caller can prepare further rounds meanwhile.
+        Safe to call from a pipeline thread: nothing here logs or touches the protocol state, as long as the
+        thread passes its own phase_times (self.phase_times belongs to the calling thread).
+        """
+        return self._submit_circuit((round_args,), self._round_circuit_key(*round_args),
+                                    self._get_round_circuit(*round_args, phase_times=phase_times), shots)
+
+    def _submit_multi_round(self, rounds, blocks):
+        """Like _submit_round, for one single-shot circuit running all of `rounds` (tuples of round args), `blocks` side by side."""
+        return self._submit_circuit(rounds, self._multi_round_circuit_key(rounds, blocks), self._get_multi_round_circuit(rounds, blocks), 1)
+
+    def _submit_circuit(self, rounds, circuit_key, circuits, shots):
+        qc, compiled_circuit = circuits
+        method, reason = self._choose_run_method(qc, shots)
+        run_options = dict(self._noise_run_options)
+        if method != self.q_simulator.options.method:
+            run_options["method"] = method
+        if self._run_seeds is not None:
+            run_options["seed_simulator"] = int(self._run_seeds.integers(2**31))
+        angles = self._basis_parameter_binds(rounds) if compiled_circuit.parameters else {}
+        # The bound angles are part of what was run: key them as plain text, the Parameters themselves are not JSON keys
+        cache_key = self._result_cache_key(qc, circuit_key, len(rounds), shots,
+                                           dict(run_options, basis_angles=sorted(angles.items())) if angles else run_options)
+        cached = self.result_cache.get(cache_key) if cache_key is not None else None
+        job = None
+        start = time.perf_counter()
+        if cached is None:
+            if angles:
+                run_options["parameter_binds"] = [{parameter: [angles[parameter.name]] for parameter in compiled_circuit.parameters}]
+            job = self.q_simulator.run(compiled_circuit, shots=shots, memory=True, **run_options)
+        return _RoundHandle(rounds, circuit_key, qc, compiled_circuit, shots, method, reason, cache_key, cached, job,
+                            time.perf_counter() - start)
+
+    def _collect_round(self, handle):
+        """Waits for a round started by _submit_round and returns one outcome string (N0,N1,...) per shot."""
+        self._log_eavesdropper(*handle.rounds[0])
+        # Standardize each outcome string to match node order (Node0, Node1, ...)
+        return self._await_outcomes(handle, lambda memory: [shot_str[::-1] for shot_str in memory])
+
+    def _collect_multi_round(self, handle):
+        """Waits for a circuit started by _submit_multi_round and returns one outcome string per round."""
+        # Aer writes the registers highest first, separated by spaces: 'round2 round1 round0'
+        return self._await_outcomes(handle, lambda memory: [register[::-1] for register in reversed(memory[0].split(" "))])
+
+    def _log_eavesdropper(self, round_kind, node_bases_choices, eavesdrop_this_round, eavesdropped_qubit, eavesdropper_basis):
         if eavesdrop_this_round:
-            print(f"    EAVESDROPPER: Measuring qubit {eavesdropped_qubit} in {eavesdropper_basis}-basis before legitimate nodes.")
-            if eavesdropper_basis == 'X':
-                qc.h(eavesdropped_qubit)
-            qc.measure(eavesdropped_qubit, eavesdropped_qubit) # Eavesdropper's measurement
-            # Note: This measurement outcome isn't explicitly used by eavesdropper in this simple sim,
-            # but the act of measuring disturbs the state.
-            qc.barrier(label=f"Eavesdrop_Q{eavesdropped_qubit}")
-        
-        self.last_circuit_diagram = qc.draw(output='text')
-        compiled_circuit = transpile(qc, self.q_simulator)
-        job = self.q_simulator.run(compiled_circuit, shots=1)
-        result = job.result()
-        counts = result.get_counts(qc)
-        outcome_str_qiskit_ordered = list(counts.keys())[0]
-        # Standardize outcome string to match node order (Node0, Node1, ...)
-        return outcome_str_qiskit_ordered[::-1]
-
-
-    def _perform_sum_round(self, eavesdrop_this_round=False, eavesdropped_qubit=0, eavesdropper_basis='Z'):
-        print("  Type: Sum Bit Generation Round")
-        qc = self._prepare_ghz_circuit_for_one_round(round_name="SumRound")
-        
-        # For sum rounds, all nodes measure in Z basis implicitly by standard measurement
-        node_bases_choices = ['Z'] * self.num_nodes 
-        # Apply Z-measurements (standard measure operation)
-        for i in range(self.num_nodes):
-            qc.measure(i,i) # Standard measurement is Z-basis
+            self.log.emit(DEBUG, "eavesdropper_measurement", f"    EAVESDROPPER: Measuring qubit {eavesdropped_qubit} in {eavesdropper_basis}-basis.",
+                          qubit=eavesdropped_qubit, basis=eavesdropper_basis)
+
+    def _await_outcomes(self, handle, decode):
+        """Waits for the job (or takes the cached memory) and returns decode(memory); records method, bonds and timings."""
+        self.last_circuit = handle.qc
+        self._record_run_method(handle.method, handle.reason, handle.shots)
+        start = time.perf_counter()
+        if handle.cached is not None:
+            memory = array_to_memory(handle.cached["memory"])
+        else:
+            result = handle.job.result()
+            # get_memory keeps one bitstring per shot (counts would merge identical rounds).
+            memory = result.get_memory(handle.compiled_circuit)
+            if self._save_mps:
+                self._record_bond_dimension(result.data(handle.compiled_circuit)[GHZ_MPS_LABEL])
+            if handle.cache_key is not None:
+                self.result_cache.put(handle.cache_key, memory=memory_to_array(memory))
+        ran = time.perf_counter()
+        outcomes = decode(memory)
+        if handle.cached is not None:
+            self.phase_times["cache"] += ran - start
+        else: # Submitting plus waiting; in pipelined runs most of the simulation overlaps other work
+            self.phase_times["run"] += handle.submit_seconds + ran - start
+        self.phase_times["parse"] += time.perf_counter() - ran
+        return outcomes
+
+    def _record_bond_dimension(self, saved_mps):
+        max_bond = max(bond_dimensions(saved_mps), default=1)
+        if self.max_bond_dimension is None or max_bond > self.max_bond_dimension:
+            self.max_bond_dimension = max_bond
+            self.log.emit(DEBUG, "mps_bond_dimension", f"    MPS bond dimension of the prepared state: {max_bond}",
+                          max_bond_dimension=max_bond)
 
-        measurement_outcomes_str = self._run_quantum_part(qc, eavesdrop_this_round, eavesdropped_qubit, eavesdropper_basis)
-        print(f"    Circuit:\n{self.last_circuit_diagram}")
-        print(f"    Raw Z-measurement outcomes (N0,N1,...): '{measurement_outcomes_str}'")
+    def _choose_run_method(self, qc, shots):
+        """(method, reason) for this run; only differs from the simulator's method when it depends on the run."""
+        if not self._choose_method_per_run:
+            return self.simulation_method, self.simulation_method_reason
+        return choose_simulation_method(qc.num_qubits, is_clifford_circuit(qc), self.noise,
+                                        shots=shots, mid_circuit_measurement=has_mid_circuit_measurement(qc))
+
+    def _record_run_method(self, method, reason, shots):
+        if self._choose_method_per_run and method != self.last_run_method:
+            self.log.emit(DEBUG, "simulation_method", f"    Simulation method for this run: {method} ({reason})",
+                          method=method, reason=reason, shots=shots)
+        self.last_run_method, self.last_run_method_reason = method, reason
+        self.method_runs[method] += 1
+
+    def _run_sum_rounds_batched(self, num_rounds, eavesdrop_this_round=False, eavesdropped_qubit=0, eavesdropper_basis='Z'):
+        """
+        Runs num_rounds sum rounds as the shots of a single job.
+        Every sum round uses the same circuit, so one transpile and one run(shots=num_rounds, memory=True)
+        replace num_rounds separate jobs. Returns one outcome string (N0,N1,...) per round, in shot order.
+        """
+        return self._run_quantum_part("sum", ['Z'] * self.num_nodes, eavesdrop_this_round, eavesdropped_qubit, eavesdropper_basis, shots=num_rounds)
+
+    def _round_schedule(self, total_rounds):
+        """Kinds of the rounds generate_shared_sum runs, in order, as long as no check round fails."""
+        sum_round_counter = 0
+        for _ in range(total_rounds + 1):
+            if sum_round_counter > 0 and sum_round_counter % self.check_round_frequency == 0:
+                yield "check"
+                sum_round_counter = 0
+            else:
+                yield "sum"
+                sum_round_counter += 1
+
+    def _pipelined_rounds(self, total_rounds, eavesdrop_this_round, eavesdropped_qubit, eavesdropper_basis, skip_sum_rounds, depth):
+        """
+        Yields (round_kind, node_bases_choices, outcome_str) in schedule order while up to `depth` later
+        rounds are being built, transpiled and simulated: a worker thread prepares round k+1.. and starts
+        their (asynchronous) Aer jobs while the caller processes round k.
+        Check-round bases are drawn here, in schedule order, so the random stream matches a sequential run.
+        skip_sum_rounds: sum-round outcomes come from elsewhere (batched mode); yields None outcomes for them.
+        The worker's build/transpile seconds go to its own accumulator, merged into phase_times once it has stopped.
+        """
+        schedule = self._round_schedule(total_rounds)
+        worker_phase_times = defaultdict(float)
+
+        try:
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="round-pipeline") as pool:
+                def start(round_kind):
+                    if round_kind == "sum":
+                        if skip_sum_rounds:
+                            return round_kind, None, None
+                        node_bases_choices = ['Z'] * self.num_nodes
+                    else:
+                        node_bases_choices = [node.choose_random_basis() for node in self.nodes]
+                    round_args = (round_kind, node_bases_choices, eavesdrop_this_round, eavesdropped_qubit, eavesdropper_basis)
+                    return round_kind, node_bases_choices, pool.submit(self._submit_round, round_args, 1, worker_phase_times)
+
+                in_flight = deque(start(round_kind) for round_kind in islice(schedule, depth))
+                try:
+                    while in_flight:
+                        round_kind, node_bases_choices, submitted = in_flight.popleft()
+                        next_kind = next(schedule, None)
+                        if next_kind is not None:
+                            in_flight.append(start(next_kind))
+                        outcome = self._collect_round(submitted.result())[0] if submitted is not None else None
+                        yield round_kind, node_bases_choices, outcome
+                finally:
+                    # Stopped early (abort, target reached): drop rounds not yet prepared. Jobs already
+                    # started finish in the background and are discarded.
+                    for _, _, submitted in in_flight:
+                        if submitted is not None:
+                            submitted.cancel()
+        finally:
+            # Leaving the with block waited for the worker, so nothing writes worker_phase_times any more
+            for phase, seconds in worker_phase_times.items():
+                self.phase_times[phase] += seconds
+
+    def _multi_rounds(self, total_rounds, eavesdrop_this_round, eavesdropped_qubit, eavesdropper_basis, skip_sum_rounds, rounds_per_circuit, blocks):
+        """
+        Yields (round_kind, node_bases_choices, outcome_str) in schedule order, like _pipelined_rounds, but
+        simulates the next blocks * rounds_per_circuit rounds as one circuit (see _build_multi_round_circuit):
+        one transpile (cached per pattern of round kinds; check bases are bound per run, see
+        _multi_round_template) and one job for all of them instead of one per round.
+        Check-round bases for a whole circuit are drawn before it runs, in schedule order.
+        skip_sum_rounds: sum-round outcomes come from elsewhere (batched mode); yields None outcomes for them.
+        """
+        schedule = self._round_schedule(total_rounds)
+        while True:
+            chunk = []
+            for round_kind in islice(schedule, rounds_per_circuit * blocks):
+                if round_kind == "sum":
+                    node_bases_choices = None if skip_sum_rounds else ['Z'] * self.num_nodes
+                else:
+                    node_bases_choices = [node.choose_random_basis() for node in self.nodes]
+                chunk.append((round_kind, node_bases_choices))
+            if not chunk:
+                return
+            rounds = tuple((round_kind, node_bases_choices, eavesdrop_this_round, eavesdropped_qubit, eavesdropper_basis)
+                           for round_kind, node_bases_choices in chunk if node_bases_choices is not None)
+            outcomes = iter(self._collect_multi_round(self._submit_multi_round(rounds, blocks)) if rounds else ())
+            for round_kind, node_bases_choices in chunk:
+                if node_bases_choices is None:
+                    yield round_kind, None, None
+                    continue
+                self._log_eavesdropper(round_kind, node_bases_choices, eavesdrop_this_round, eavesdropped_qubit, eavesdropper_basis)
+                yield round_kind, node_bases_choices, next(outcomes)
+
+
+    def _perform_sum_round(self, eavesdrop_this_round=False, eavesdropped_qubit=0, eavesdropper_basis='Z', measurement_outcomes_str=None):
+        """
+        measurement_outcomes_str: outcome (N0,N1,...) already simulated in batched mode; None runs the round now.
+        Returns (measurement_outcomes_str, bits_consistent_for_sum).
+        """
+        if measurement_outcomes_str is None:
+            # For sum rounds, all nodes measure in Z basis implicitly by standard measurement
+            node_bases_choices = ['Z'] * self.num_nodes
+            measurement_outcomes_str = self._run_quantum_part("sum", node_bases_choices, eavesdrop_this_round, eavesdropped_qubit, eavesdropper_basis)[0]
+        if self.log.enabled(DEBUG):
+            self.log.emit(DEBUG, "sum_round", f"  Type: Sum Bit Generation Round\n    Raw Z-measurement outcomes (N0,N1,...): '{measurement_outcomes_str}'",
+                          diagram=lambda: self.last_circuit_diagram, outcomes=measurement_outcomes_str)
 
         # Check for consistency among legitimate nodes for this sum bit
         shared_bit_candidate = measurement_outcomes_str[0]
         bits_consistent_for_sum = all(bit == shared_bit_candidate for bit in measurement_outcomes_str)
 
+        if self.round_outcomes is not None:
+            self.round_outcomes.add_sum_round(measurement_outcomes_str, bits_consistent_for_sum)
         if bits_consistent_for_sum:
-            print(f"    Z-Outcomes consistent. Shared bit candidate for sum: '{shared_bit_candidate}'")
+            self.log.emit(DEBUG, "sum_bit_agreed", f"    Z-Outcomes consistent. Shared bit candidate for sum: '{shared_bit_candidate}'",
+                          bit=int(shared_bit_candidate))
             for node in self.nodes:
                 node.record_sum_bit(shared_bit_candidate) # All get the same agreed bit
             self.actual_sum_bits_collected += 1
         else:
-            # This implies a very noisy channel or an attack that broke Z-basis correlation badly
-            print(f"    ERROR/SEVERE TAMPERING: Z-Outcomes inconsistent for sum bit round: {measurement_outcomes_str}. Sum bit discarded.")
+            # This implies a very noisy channel or an attack that broke Z-basis correlation badly.
+            # Per round only at DEBUG; the run's total is reported with protocol_result
+            self.discarded_sum_rounds += 1
+            if self.log.enabled(DEBUG):
+                self.log.emit(DEBUG, "sum_bit_discarded", f"    ERROR/SEVERE TAMPERING: Z-Outcomes inconsistent for sum bit round: {measurement_outcomes_str}. Sum bit discarded.",
+                              outcomes=measurement_outcomes_str)
             # No bit is added to the sum if they can't agree on the Z-measurement.
             # This is a basic form of detection even in sum rounds.
-        print("-" * 40)
+        return measurement_outcomes_str, bits_consistent_for_sum
 
 
-    def _perform_check_round(self, eavesdrop_this_round=False, eavesdropped_qubit=0, eavesdropper_basis='Z'):
-        print("  Type: Quantum Disturbance Check Round")
+    def _perform_check_round(self, eavesdrop_this_round=False, eavesdropped_qubit=0, eavesdropper_basis='Z',
+                             node_bases_choices=None, measurement_outcomes_str=None):
+        """
+        node_bases_choices, measurement_outcomes_str: a check round already run by the pipeline; None runs it now.
+        Returns (node_bases_choices, measurement_outcomes_str, passed).
+        """
         self.eavesdropper_detected_by_check = False # Reset for this round's check
 
-        qc = self._prepare_ghz_circuit_for_one_round(round_name="CheckRound")
-        
-        node_bases_choices = [node.choose_random_basis() for node in self.nodes]
-        print(f"    Nodes' chosen bases: {[(f'N{i}', basis) for i, basis in enumerate(node_bases_choices)]}")
+        if measurement_outcomes_str is None:
+            node_bases_choices = [node.choose_random_basis() for node in self.nodes]
+            # Eavesdropper acts *before* legitimate nodes apply their basis choices and measure,
+            # so the nodes measure a (potentially) disturbed GHZ state. See _build_round_circuit.
+            measurement_outcomes_str = self._run_quantum_part("check", node_bases_choices, eavesdrop_this_round, eavesdropped_qubit, eavesdropper_basis)[0]
 
-        # Eavesdropper acts *before* legitimate nodes apply their basis choices and measure.
-        # The quantum state passed to _apply_measurement_gates will already be (potentially) disturbed.
-        # First, simulate eavesdropper if active
-        if eavesdrop_this_round:
-            print(f"    EAVESDROPPER: Measuring qubit {eavesdropped_qubit} in {eavesdropper_basis}-basis.")
-            temp_qc_for_eavesdrop = qc.copy(name="eavesdrop_temp") # Eavesdropper acts on the GHZ state
-            if eavesdropper_basis == 'X':
-                temp_qc_for_eavesdrop.h(eavesdropped_qubit)
-            temp_qc_for_eavesdrop.measure(eavesdropped_qubit, eavesdropped_qubit) # Eavesdropper measures
-            temp_qc_for_eavesdrop.barrier(label=f"Eavesdrop_Q{eavesdropped_qubit}")
-            # The state of 'qc' is implicitly affected by this measurement on the shared quantum state
-            # For simulation, Qiskit executes sequentially. So, we apply eavesdropper ops to the main qc.
-            if eavesdropper_basis == 'X':
-                qc.h(eavesdropped_qubit)
-            qc.measure(eavesdropped_qubit, 0) # Eavesdropper measures (e.g. into classical bit 0, it will be overwritten)
-            # This is a simplification: the key is the disturbance. For a more accurate sim of eavesdropper's info,
-            # they'd have their own classical bit. Here, we focus on state disturbance.
-            # Let's simply say the disturbance happened. More accurate would be to run the eavesdropper's part first.
-            # For a simpler flow here, let's assume the _run_quantum_part handles this:
-            # The eavesdropper's measurement is added to the circuit *before* legitimate nodes' measurements.
-            
-        # Legitimate nodes apply their chosen basis gates and measure
-        self._apply_measurement_gates(qc, node_bases_choices)
-        
-        measurement_outcomes_str = self._run_quantum_part(qc, eavesdrop_this_round, eavesdropped_qubit, eavesdropper_basis)
-        # Note: if eavesdropping is enabled in _run_quantum_part, it applies *another* eavesdrop op.
-        # This needs to be structured carefully. Let's refine _run_quantum_part to take a fully formed qc.
-        # For now, let's assume eavesdropping for check round is handled before _apply_measurement_gates.
-        # The current _run_quantum_part adds its own eavesdrop logic. Let's simplify.
-
-        # Re-simplifying the eavesdropping for check rounds:
-        # The GHZ state is prepared.
-        # If eavesdropping: eavesdropper measures. The state of qc is now collapsed/disturbed.
-        # Then, legitimate nodes apply their basis choices and measure this (potentially) disturbed state.
-
-        qc_check = self._prepare_ghz_circuit_for_one_round(round_name="CheckRound_Internal") # Fresh circuit for clarity
-        # Simulate eavesdropper's action on this circuit state
-        eavesdropper_outcome_for_check = None
-        if eavesdrop_this_round:
-            print(f"    EAVESDROPPER (Check Round): Measuring qubit {eavesdropped_qubit} in {eavesdropper_basis}-basis.")
-            if eavesdropper_basis == 'X':
-                qc_check.h(eavesdropped_qubit)
-            # Eavesdropper measures into a dummy classical bit (e.g. the first one, it will be overwritten by node 0)
-            # This is just to enact the measurement and state collapse.
-            qc_check.measure(eavesdropped_qubit, 0) 
-            qc_check.barrier(label=f"E_Q{eavesdropped_qubit}")
-            # We don't run this sub-circuit, its purpose is to modify qc_check for the legitimate nodes.
-
-        # Nodes choose bases and apply gates to qc_check
-        for i in range(self.num_nodes):
-            if node_bases_choices[i] == 'X':
-                qc_check.h(i)
-            qc_check.measure(i, i)
-
-        # Now run the modified qc_check
-        self.last_circuit_diagram = qc_check.draw(output='text') # Save for printing
-        compiled_circuit_check = transpile(qc_check, self.q_simulator)
-        job_check = self.q_simulator.run(compiled_circuit_check, shots=1)
-        result_check = job_check.result()
-        counts_check = result_check.get_counts(qc_check)
-        outcome_str_qiskit_ordered_check = list(counts_check.keys())[0]
-        measurement_outcomes_str = outcome_str_qiskit_ordered_check[::-1] # (N0,N1,...)
-
-        print(f"    Circuit (Check Round):\n{self.last_circuit_diagram}")
-        print(f"    Measured outcomes (N0,N1,...): {measurement_outcomes_str} for bases {node_bases_choices}")
+        if self.log.enabled(DEBUG):
+            self.log.emit(DEBUG, "check_round",
+                          f"  Type: Quantum Disturbance Check Round\n    Nodes' chosen bases: {[(f'N{i}', basis) for i, basis in enumerate(node_bases_choices)]}\n"
+                          f"    Measured outcomes (N0,N1,...): {measurement_outcomes_str} for bases {node_bases_choices}",
+                          diagram=lambda: self.last_circuit_diagram, bases="".join(node_bases_choices), outcomes=measurement_outcomes_str)
 
         # Store outcomes for nodes
         for i, node in enumerate(self.nodes):
             node.outcome_for_check = int(measurement_outcomes_str[i])
             node.chosen_basis_for_check = node_bases_choices[i]
+        if self.round_outcomes is not None:
+            self.round_outcomes.add_check_round(node_bases_choices, measurement_outcomes_str)
 
         # Verification logic
         # 1. Z-basis checks: nodes that chose 'Z' should have identical outcomes
@@ -196,7 +861,7 @@ class SumOfColumnsSimulator:
         if len(z_basis_nodes_outcomes) > 1:
             first_z_outcome = z_basis_nodes_outcomes[0][1]
             if not all(outcome == first_z_outcome for _, outcome in z_basis_nodes_outcomes):
-                print(f"    TAMPERING DETECTED (Check Round): Z-basis outcomes inconsistent: {z_basis_nodes_outcomes}")
+                self._report_failed_check("z_consistency", lambda: f"Z-basis outcomes inconsistent: {z_basis_nodes_outcomes}")
                 self.eavesdropper_detected_by_check = True
         
         # 2. X-basis checks: for nodes that chose 'X', parity of outcomes should be even
@@ -208,109 +873,372 @@ class SumOfColumnsSimulator:
                 if parity != 0: # For GHZ: N0+N1+...+Nk = 0 (mod 2) if all measure in X
                                 # If a subset measure in X, this rule is more complex.
                                 # Simplified: if all participating in X-check have non-zero parity sum
-                    print(f"    TAMPERING DETECTED (Check Round): X-basis outcomes parity is ODD: {x_basis_nodes_outcomes} -> Sum = {sum(x_basis_nodes_outcomes)}")
+                    self._report_failed_check("x_parity", lambda: f"X-basis outcomes parity is ODD: {x_basis_nodes_outcomes} -> Sum = {sum(x_basis_nodes_outcomes)}")
                     self.eavesdropper_detected_by_check = True
         
         if not self.eavesdropper_detected_by_check:
-            print("    Check Round: No inconsistencies detected in chosen bases.")
-        print("-" * 40)
-        return not self.eavesdropper_detected_by_check
+            self.log.emit(DEBUG, "check_passed", "    Check Round: No inconsistencies detected in chosen bases.")
+        return node_bases_choices, measurement_outcomes_str, not self.eavesdropper_detected_by_check
+
+    def _report_failed_check(self, check, describe):
+        """
+        Without a check scheduler a failed check is the verdict (WARNING tampering_detected); with one it is
+        only evidence for the scheduler's test (DEBUG check_round_flagged), see _weigh_check_evidence.
+        describe: callable returning the details, only formatted when the event is logged.
+        """
+        if self.check_scheduler is None:
+            self.log.emit(WARNING, "tampering_detected", f"    TAMPERING DETECTED (Check Round): {describe()}", check=check, round=self.rounds_run)
+        elif self.log.enabled(DEBUG):
+            self.log.emit(DEBUG, "check_round_flagged", f"    Check round flagged (evidence for the check scheduler): {describe()}",
+                          check=check, round=self.rounds_run)
+
 
+    def generate_shared_sum(self, total_rounds, enable_eavesdropping_overall=False, eavesdropper_basis='Z', eavesdropped_qubit_idx=0, batched=False,
+                            pipelined=False, pipeline_depth=4, rounds_per_circuit=1, packed=False):
+        """
+        Runs the whole protocol (see iter_rounds for the arguments) and returns (agreed sum, leader index),
+        or (None, None) if it aborted or the nodes disagree.
+        """
+        for _ in self.iter_rounds(total_rounds, enable_eavesdropping_overall, eavesdropper_basis, eavesdropped_qubit_idx,
+                                  batched, pipelined, pipeline_depth, rounds_per_circuit, packed):
+            pass
+        return self.shared_sum_result()
 
-    def generate_shared_sum(self, total_rounds, enable_eavesdropping_overall=False, eavesdropper_basis='Z', eavesdropped_qubit_idx=0):
-        print(f"\n--- Starting Protocol: {total_rounds} total rounds ---")
-        print(f"--- Check rounds will occur approx every {self.check_round_frequency} sum rounds ---")
+    def iter_rounds(self, total_rounds, enable_eavesdropping_overall=False, eavesdropper_basis='Z', eavesdropped_qubit_idx=0, batched=False,
+                    pipelined=False, pipeline_depth=4, rounds_per_circuit=1, packed=False):
+        """
+        Returns a generator that runs the protocol round by round, yielding a RoundRecord as soon as each
+        round is evaluated. The arguments are checked here; the rounds run as the generator is consumed.
+        It ends after a check round detects tampering or once the target number of sum bits is collected;
+        the caller may also stop early. Afterwards shared_sum_result() gives the (sum, leader) outcome.
+        Records are not retained. With keep_round_history=False, sum_modulus_bits set and batched=False,
+        memory stays constant however long the run, as nodes keep only their sum modulo 2**sum_modulus_bits;
+        without sum_modulus_bits each node still keeps its packed sum bits (num_nodes * bits / 8 bytes).
+
+        batched: simulate all sum rounds up front as the shots of one job (see _run_sum_rounds_batched)
+                 instead of one transpile + run(shots=1) per round. Check rounds still run one by one,
+                 since every check round draws fresh random bases.
+        pipelined: build, transpile and start the next pipeline_depth rounds in a worker thread while the
+                 current one is simulated and evaluated (see _pipelined_rounds). Rounds prepared after an
+                 abort are wasted work, and their check bases have already been drawn from `random`.
+                 It only pays off with a spare core for the worker and rounds that cost real simulation
+                 time; on one core it runs at about the sequential rate, and rounds_per_circuit/packed are
+                 the faster choice for small rounds.
+        rounds_per_circuit: K > 1 runs K consecutive rounds as one dynamic circuit, resetting the qubits
+                 between rounds (see _multi_rounds); outcomes are decoded back per round. Rounds after an
+                 abort in the same circuit are wasted, as with pipelining, which it replaces.
+        packed: also place independent rounds side by side on disjoint qubit blocks of one wider circuit,
+                 as many as PACKING_QUBIT_BUDGET allows for the simulation method (e.g. 32 four-node
+                 rounds for the stabilizer method), so small networks do not pay a job per tiny round.
+                 Combines with rounds_per_circuit: each circuit then runs K layers of blocks. Check rounds
+                 do not break this up: their bases are bound per run, so a layer's circuit only depends on
+                 where its check rounds fall (see _multi_round_template).
+        """
+        blocks = self._packing_blocks() if packed else 1
+        if pipelined and (rounds_per_circuit > 1 or blocks > 1):
+            raise ValueError("pipelined and multi-round circuits (rounds_per_circuit > 1, packed) are alternative ways to run rounds; choose one")
+        if self.check_scheduler is not None and (pipelined or rounds_per_circuit > 1 or blocks > 1):
+            # Those prepare rounds ahead following the fixed schedule; an adaptive one depends on every check's outcome
+            raise ValueError("A check scheduler decides each round after the previous check; it cannot be combined with "
+                             "pipelined or multi-round circuits")
+        return self._iter_rounds(total_rounds, enable_eavesdropping_overall, eavesdropper_basis, eavesdropped_qubit_idx, batched,
+                                 pipelined, pipeline_depth, rounds_per_circuit, blocks)
+
+    def _iter_rounds(self, total_rounds, enable_eavesdropping_overall, eavesdropper_basis, eavesdropped_qubit_idx, batched,
+                     pipelined, pipeline_depth, rounds_per_circuit, blocks):
+        """Generator behind iter_rounds, once its arguments are validated: resets the run and drives _run_rounds."""
+        self.log.emit(INFO, "protocol_start",
+                      f"\n--- Starting Protocol: {total_rounds} total rounds ---\n"
+                      f"--- Simulation method: {self.simulation_method} ({self.simulation_method_reason}) ---\n"
+                      f"--- Noise: {self.noise.describe() if self.noise else 'ideal'} ---\n"
+                      f"--- Check rounds {self._check_policy_description()} ---",
+                      total_rounds=total_rounds, num_nodes=self.num_nodes, check_round_frequency=self.check_round_frequency,
+                      simulation_method=self.simulation_method, noise=self.noise.describe() if self.noise else "ideal", batched=batched)
         if enable_eavesdropping_overall:
-            print(f"WARNING: Eavesdropping enabled. E-basis: {eavesdropper_basis}, E-qubit target: Q{eavesdropped_qubit_idx}")
+            self.log.emit(WARNING, "eavesdropping_enabled", f"WARNING: Eavesdropping enabled. E-basis: {eavesdropper_basis}, E-qubit target: Q{eavesdropped_qubit_idx}",
+                          basis=eavesdropper_basis, qubit=eavesdropped_qubit_idx)
 
         # Reset nodes and simulator state
         for node in self.nodes:
             node.reset()
+        if self.round_outcomes is not None:
+            self.round_outcomes.clear()
         self.eavesdropper_detected_by_check = False
         self.actual_sum_bits_collected = 0
-        
+        self.discarded_sum_rounds = 0
+        self.rounds_run = 0
+        self.abort_round = None
+        if self.check_scheduler is not None:
+            self.check_scheduler.reset()
+
+        batched_sum_outcomes = None
+        if batched:
+            # The loop below runs at most total_rounds + 1 rounds, so that many shots covers every sum round
+            self.log.emit(DEBUG, "batched_sum_rounds", f"--- Batched mode: simulating up to {total_rounds + 1} sum rounds in one job ---", shots=total_rounds + 1)
+            batched_sum_outcomes = deque(self._run_sum_rounds_batched(
+                total_rounds + 1, enable_eavesdropping_overall, eavesdropped_qubit_idx, eavesdropper_basis))
+
+        pipeline = None # Rounds simulated ahead of the loop: pipelined or as multi-round circuits
+        if pipelined:
+            pipeline = self._pipelined_rounds(total_rounds, enable_eavesdropping_overall, eavesdropped_qubit_idx, eavesdropper_basis,
+                                              skip_sum_rounds=batched, depth=pipeline_depth)
+        elif rounds_per_circuit > 1 or blocks > 1:
+            self.log.emit(DEBUG, "multi_round_circuits", f"--- Multi-round circuits: {blocks} round(s) side by side x {rounds_per_circuit} "
+                          f"layer(s), reset between layers ---", rounds_per_circuit=rounds_per_circuit, blocks=blocks)
+            pipeline = self._multi_rounds(total_rounds, enable_eavesdropping_overall, eavesdropped_qubit_idx, eavesdropper_basis,
+                                          skip_sum_rounds=batched, rounds_per_circuit=rounds_per_circuit, blocks=blocks)
+        try:
+            yield from self._run_rounds(total_rounds, enable_eavesdropping_overall, eavesdropper_basis, eavesdropped_qubit_idx,
+                                        batched_sum_outcomes, pipeline)
+        finally:
+            if pipeline is not None:
+                pipeline.close()
+
+    def _run_rounds(self, total_rounds, enable_eavesdropping_overall, eavesdropper_basis, eavesdropped_qubit_idx, batched_sum_outcomes, pipeline):
+        """Generator behind iter_rounds: the round loop itself."""
         sum_round_counter = 0
         for r_idx in range(total_rounds + 1):
-            print(f"\nOverall Round {r_idx + 1}/{total_rounds}:")
+            self.log.emit(DEBUG, "round_start", f"\nOverall Round {r_idx + 1}/{total_rounds}:", round=r_idx + 1)
+            self.rounds_run = r_idx + 1
             
             # Decide if this is a check round
-            is_check_this_round = (sum_round_counter > 0 and sum_round_counter % self.check_round_frequency == 0)
+            if self.check_scheduler is not None:
+                is_check_this_round = self.check_scheduler.is_check_round(sum_round_counter)
+            else:
+                is_check_this_round = (sum_round_counter > 0 and sum_round_counter % self.check_round_frequency == 0)
             
             eavesdrop_attempt_this_round = enable_eavesdropping_overall # Eavesdropper tries every round if enabled
+            pipelined_bases, pipelined_outcome = None, None
+            if pipeline is not None:
+                _, pipelined_bases, pipelined_outcome = next(pipeline) # Same schedule, so the kinds line up
 
             if is_check_this_round:
-                if not self._perform_check_round(eavesdrop_attempt_this_round, eavesdropped_qubit_idx, eavesdropper_basis):
+                bases, outcomes, passed = self._perform_check_round(eavesdrop_attempt_this_round, eavesdropped_qubit_idx, eavesdropper_basis,
+                                                                    pipelined_bases, pipelined_outcome)
+                if self.check_scheduler is not None:
+                    self._weigh_check_evidence(passed, r_idx + 1)
+                yield RoundRecord(r_idx + 1, "check", "".join(bases), outcomes, passed, self.eavesdropper_detected_by_check, None)
+                if self.eavesdropper_detected_by_check:
                     # Eavesdropper was detected by the check round
-                    print("    PROTOCOL ABORT SUGGESTED: Eavesdropper detected by check round.")
+                    self.log.emit(WARNING, "protocol_abort", "    PROTOCOL ABORT SUGGESTED: Eavesdropper detected by check round.", round=r_idx + 1)
+                    self.abort_round = r_idx + 1
                     # Depending on policy, might halt or just note detection and continue cautiously
                     break # For this simulation, let's halt if a check fails
                 sum_round_counter = 0 # Reset counter after a check
             else:
                 if self.eavesdropper_detected_by_check: # If detected in a *previous* check round
-                    print("    Skipping sum bit generation: Eavesdropper previously detected by a check round.")
+                    self.log.emit(DEBUG, "sum_round_skipped", "    Skipping sum bit generation: Eavesdropper previously detected by a check round.", round=r_idx + 1)
                     # Optionally, could break here too or run dummy rounds
                 else:
-                    self._perform_sum_round(eavesdrop_attempt_this_round, eavesdropped_qubit_idx, eavesdropper_basis)
+                    pre_measured = batched_sum_outcomes.popleft() if batched_sum_outcomes is not None else pipelined_outcome
+                    outcomes, consistent = self._perform_sum_round(eavesdrop_attempt_this_round, eavesdropped_qubit_idx, eavesdropper_basis, pre_measured)
                     sum_round_counter += 1
+                    yield RoundRecord(r_idx + 1, "sum", 'Z' * self.num_nodes, outcomes, consistent, False,
+                                      int(outcomes[0]) if consistent else None)
             
             if self.actual_sum_bits_collected >= self.num_total_rounds: # Target number of sum bits achieved
-                 print(f"Target number of {self.num_total_rounds} sum bits collected.")
+                 self.log.emit(DEBUG, "target_reached", f"Target number of {self.num_total_rounds} sum bits collected.", bits=self.actual_sum_bits_collected)
                  break
 
+    def _weigh_check_evidence(self, passed, round_number):
+        """Feeds a check's outcome to the check scheduler; only its 'tampering' decision counts as detection."""
+        decision = self.check_scheduler.record_check(not passed)
+        self.log.emit(DEBUG, "check_evidence", f"    Check scheduler: {decision} ({self.check_scheduler.describe()})",
+                      decision=decision, round=round_number, flagged=not passed)
+        # A single failed check is only evidence; the sequential test decides when it is enough
+        self.eavesdropper_detected_by_check = decision == "tampering"
+        if self.eavesdropper_detected_by_check:
+            self.log.emit(WARNING, "tampering_detected", f"    TAMPERING DETECTED (check scheduler): {self.check_scheduler.describe()}",
+                          check="scheduler", round=round_number)
+
+    def _check_policy_description(self):
+        if self.check_scheduler is not None:
+            return f"scheduled adaptively: {self.check_scheduler.describe()}"
+        return f"will occur approx every {self.check_round_frequency} sum rounds"
 
+    def shared_sum_result(self):
+        """
+        (agreed sum, leader index) of the last run, or (None, None); logs the final protocol_result event.
+        With sum_modulus_bits the sum is reduced modulo 2**sum_modulus_bits.
+        """
         # Final Sum Calculation and Leader Election (only if no eavesdropper detected by checks)
         final_sums = []
-        print("\n--- Final Sum Calculation ---")
         if self.eavesdropper_detected_by_check:
-            print("Sums not calculated/trusted due to earlier eavesdropper detection by check round.")
+            self.log.emit(INFO, "protocol_result", "\n--- Final Sum Calculation ---\nSums not calculated/trusted due to earlier eavesdropper detection by check round.",
+                          status="aborted", rounds_run=self.rounds_run, abort_round=self.abort_round,
+                          discarded_sum_rounds=self.discarded_sum_rounds)
             return None, None
 
         for node in self.nodes:
             s = node.calculate_sum()
             final_sums.append(s)
-            print(f"Node {node.node_id}: Measured sum bits: {node.measured_bits_for_sum}, Calculated Sum: {s}")
+            if self.log.enabled(DEBUG):
+                bits = node.measured_bits_for_sum if self.sum_modulus_bits is None else f"(kept modulo 2^{self.sum_modulus_bits} only)"
+                self.log.emit(DEBUG, "node_sum", f"Node {node.node_id}: Measured sum bits: {bits}, Calculated Sum: {s}",
+                              node=node.node_id, sum=s)
 
         if not final_sums: # e.g. if protocol aborted early
-            print("No sum bits were successfully collected by nodes.")
+            self.log.emit(INFO, "protocol_result", "No sum bits were successfully collected by nodes.", status="no_bits", rounds_run=self.rounds_run,
+                          discarded_sum_rounds=self.discarded_sum_rounds)
             return None, None
 
         # Verify if all sums are identical (they should be if sum bits were recorded consistently)
         if len(set(final_sums)) == 1:
             final_agreed_sum = final_sums[0]
-            print(f"\nSUCCESS: All nodes calculated the same sum: {final_agreed_sum}")
-            leader_node_index = final_agreed_sum % self.num_nodes
-            print(f"Leader selected (0-indexed): Node {leader_node_index}")
+            leader_node_index = self.nodes[0].sum_mod_nodes # Full sum % self.num_nodes, tracked bit by bit
+            modulus = f" (mod 2^{self.sum_modulus_bits})" if self.sum_modulus_bits is not None else ""
+            self.log.emit(INFO, "protocol_result",
+                          f"\nSUCCESS: All nodes calculated the same sum{modulus}: {final_agreed_sum}\nLeader selected (0-indexed): Node {leader_node_index}"
+                          f"\nSum rounds discarded (Z outcomes disagreed): {self.discarded_sum_rounds}",
+                          status="success", sum=final_agreed_sum, leader=leader_node_index,
+                          bits=self.actual_sum_bits_collected, rounds_run=self.rounds_run, discarded_sum_rounds=self.discarded_sum_rounds)
             return final_agreed_sum, leader_node_index
         else:
-            print(f"\nERROR/INCONSISTENCY: Node sums are different: {final_sums}")
-            print("This might be due to an undetected issue or severe noise during sum bit rounds.")
+            self.log.emit(ERROR, "protocol_result",
+                          f"\nERROR/INCONSISTENCY: Node sums are different: {final_sums}\n"
+                          "This might be due to an undetected issue or severe noise during sum bit rounds.",
+                          status="inconsistent", sums=final_sums, rounds_run=self.rounds_run, discarded_sum_rounds=self.discarded_sum_rounds)
             return None, None
 
 
-# --- Simulation Parameters ---
-N_NODES = 4
-TARGET_SUM_BITS = 4  # Desired number of bits for the final sum
-CHECK_FREQUENCY = 2 # Run a check round after every 2 sum rounds
-TOTAL_ROUNDS_TO_RUN = TARGET_SUM_BITS + (TARGET_SUM_BITS // CHECK_FREQUENCY) # Approximate total rounds
-
-# --- Run Ideal Scenario (No Eavesdropping) ---
-print("*********************************************")
-print("* IDEAL SCENARIO (with Check Rounds)        *")
-print("*********************************************")
-simulator_ideal = SumOfColumnsSimulator(num_nodes=N_NODES, num_ghz_states_for_sum=TARGET_SUM_BITS, check_round_frequency=CHECK_FREQUENCY)
-simulator_ideal.generate_shared_sum(total_rounds=TOTAL_ROUNDS_TO_RUN, enable_eavesdropping_overall=False)
-
-# --- Run Tampering Scenario (Eavesdropper Present) ---
-print("\n\n*****************************************************")
-print("* TAMPERING SCENARIO (Eavesdropper, with Check Rounds) *")
-print("*****************************************************")
-# Eavesdropper always tries to measure qubit 0 in Z-basis
-simulator_tampered = SumOfColumnsSimulator(num_nodes=N_NODES, num_ghz_states_for_sum=TARGET_SUM_BITS, check_round_frequency=CHECK_FREQUENCY)
-simulator_tampered.generate_shared_sum(total_rounds=TOTAL_ROUNDS_TO_RUN, enable_eavesdropping_overall=True, eavesdropper_basis='Z', eavesdropped_qubit_idx=0)
-
-print("\n\n*****************************************************")
-print("* TAMPERING SCENARIO (Eavesdropper X, with Check Rounds) *")
-print("*****************************************************")
-# Eavesdropper always tries to measure qubit 0 in X-basis
-simulator_tampered_X = SumOfColumnsSimulator(num_nodes=N_NODES, num_ghz_states_for_sum=TARGET_SUM_BITS, check_round_frequency=CHECK_FREQUENCY)
-simulator_tampered_X.generate_shared_sum(total_rounds=TOTAL_ROUNDS_TO_RUN, enable_eavesdropping_overall=True, eavesdropper_basis='X', eavesdropped_qubit_idx=0)
\ No newline at end of file
+def generate_shared_sums(runs, max_workers=None):
+    """
+    Runs several independent protocols concurrently, one thread each, and returns their
+    (sum, leader) results in order. runs: [(simulator, generate_shared_sum kwargs), ...].
+    Give the simulators one shared backend (SumOfColumnsSimulator(backend=...)) so their jobs queue on
+    the same Aer executor and keep it busy while each thread builds, parses and evaluates its rounds.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or len(runs), thread_name_prefix="protocol-run") as pool:
+        futures = [pool.submit(simulator.generate_shared_sum, **kwargs) for simulator, kwargs in runs]
+        return [future.result() for future in futures]
+
+
+if __name__ == "__main__":
+    # --- Simulation Parameters ---
+    N_NODES = 4
+    TARGET_SUM_BITS = 4  # Desired number of bits for the final sum
+    CHECK_FREQUENCY = 2 # Run a check round after every 2 sum rounds
+    TOTAL_ROUNDS_TO_RUN = TARGET_SUM_BITS + (TARGET_SUM_BITS // CHECK_FREQUENCY) # Approximate total rounds
+
+    # --- Run Ideal Scenario (No Eavesdropping) ---
+    print("*********************************************")
+    print("* IDEAL SCENARIO (with Check Rounds)        *")
+    print("*********************************************")
+    simulator_ideal = SumOfColumnsSimulator(num_nodes=N_NODES, num_ghz_states_for_sum=TARGET_SUM_BITS, check_round_frequency=CHECK_FREQUENCY, event_log=verbose_log())
+    simulator_ideal.generate_shared_sum(total_rounds=TOTAL_ROUNDS_TO_RUN, enable_eavesdropping_overall=False)
+
+    # --- Run Tampering Scenario (Eavesdropper Present) ---
+    print("\n\n*****************************************************")
+    print("* TAMPERING SCENARIO (Eavesdropper, with Check Rounds) *")
+    print("*****************************************************")
+    # Eavesdropper always tries to measure qubit 0 in Z-basis
+    simulator_tampered = SumOfColumnsSimulator(num_nodes=N_NODES, num_ghz_states_for_sum=TARGET_SUM_BITS, check_round_frequency=CHECK_FREQUENCY, event_log=verbose_log())
+    simulator_tampered.generate_shared_sum(total_rounds=TOTAL_ROUNDS_TO_RUN, enable_eavesdropping_overall=True, eavesdropper_basis='Z', eavesdropped_qubit_idx=0)
+
+    print("\n\n*****************************************************")
+    print("* TAMPERING SCENARIO (Eavesdropper X, with Check Rounds) *")
+    print("*****************************************************")
+    # Eavesdropper always tries to measure qubit 0 in X-basis
+    simulator_tampered_X = SumOfColumnsSimulator(num_nodes=N_NODES, num_ghz_states_for_sum=TARGET_SUM_BITS, check_round_frequency=CHECK_FREQUENCY, event_log=verbose_log())
+    simulator_tampered_X.generate_shared_sum(total_rounds=TOTAL_ROUNDS_TO_RUN, enable_eavesdropping_overall=True, eavesdropper_basis='X', eavesdropped_qubit_idx=0)
+
+    print("\n\n*****************************************************")
+    print("* IDEAL SCENARIO (Batched sum rounds)               *")
+    print("*****************************************************")
+    # All sum bits come from a single multi-shot job
+    simulator_batched = SumOfColumnsSimulator(num_nodes=N_NODES, num_ghz_states_for_sum=TARGET_SUM_BITS, check_round_frequency=CHECK_FREQUENCY, event_log=verbose_log())
+    simulator_batched.generate_shared_sum(total_rounds=TOTAL_ROUNDS_TO_RUN, enable_eavesdropping_overall=False, batched=True)
+    print(f"Compiled-circuit cache: {simulator_batched.circuit_cache.stats()}")
+
+    print("\n\n*****************************************************")
+    print("* LARGE NETWORK SCENARIO (1000 nodes, stabilizer)   *")
+    print("*****************************************************")
+    # Far beyond statevector limits; the automatic method selection picks the stabilizer simulator
+    # Default log level: per-run summary only, no per-round text. Events are also recorded as dicts.
+    large_run_log = ProtocolEventLog(record=True)
+    simulator_large = SumOfColumnsSimulator(num_nodes=1000, num_ghz_states_for_sum=TARGET_SUM_BITS, check_round_frequency=CHECK_FREQUENCY, event_log=large_run_log)
+    simulator_large.generate_shared_sum(total_rounds=TOTAL_ROUNDS_TO_RUN, enable_eavesdropping_overall=True, eavesdropper_basis='Z', eavesdropped_qubit_idx=0)
+    print(f"Recorded events: {[record['event'] for record in large_run_log.events]}")
+
+    print("\n\n*****************************************************")
+    print("* NOISY CHANNEL SCENARIOS                           *")
+    print("*****************************************************")
+    # Depolarizing + readout noise is Pauli: still a stabilizer run. Amplitude damping is not: the
+    # single-shot check rounds use trajectories, the batched sum rounds (many shots) a density matrix.
+    from Prototype_Noise import ChannelNoise
+    for noise in (ChannelNoise(depolarizing_1q=0.001, depolarizing_2q=0.01, readout_error=0.01),
+                  ChannelNoise(depolarizing_2q=0.01, amplitude_damping=0.005)):
+        simulator_noisy = SumOfColumnsSimulator(num_nodes=N_NODES, num_ghz_states_for_sum=64, check_round_frequency=8, noise=noise)
+        simulator_noisy.generate_shared_sum(total_rounds=72, enable_eavesdropping_overall=False, batched=True)
+        print(f"Noise {noise.describe()}: runs per method {dict(simulator_noisy.method_runs)}")
+
+    print("\n\n*****************************************************")
+    print("* NEAR-CLIFFORD SCENARIO (120 nodes, cry, MPS)      *")
+    print("*****************************************************")
+    # cry rotations after the GHZ chain are non-Clifford and 120 qubits are too many for a statevector:
+    # 'automatic' picks matrix_product_state. The rotations also spoil the nodes' agreement, so few sum bits survive.
+    def add_cry_rotations(qc):
+        for i in range(0, qc.num_qubits - 1, 10):
+            qc.cry(0.2, i, i + 1)
+    simulator_mps = SumOfColumnsSimulator(num_nodes=120, num_ghz_states_for_sum=TARGET_SUM_BITS, check_round_frequency=CHECK_FREQUENCY, ghz_extension=add_cry_rotations)
+    simulator_mps.generate_shared_sum(total_rounds=TOTAL_ROUNDS_TO_RUN, enable_eavesdropping_overall=False, batched=True)
+    print(f"Max bond dimension reached: {simulator_mps.max_bond_dimension}")
+
+    print("\n\n*****************************************************")
+    print("* PIPELINED AND CONCURRENT RUNS (16 nodes)          *")
+    print("*****************************************************")
+    # Statevector runs, so each round costs real simulation time that building the next rounds can hide
+    from qiskit_aer import AerSimulator
+    shared_backend = AerSimulator(method="statevector")
+    shared_cache = CompiledCircuitCache()
+    for mode in ("sequential", "pipelined"):
+        simulator_pipe = SumOfColumnsSimulator(num_nodes=16, num_ghz_states_for_sum=60, check_round_frequency=1000,
+                                               simulation_method="statevector", backend=shared_backend, circuit_cache=shared_cache)
+        start = time.perf_counter()
+        simulator_pipe.generate_shared_sum(total_rounds=60, pipelined=(mode == "pipelined"))
+        elapsed = time.perf_counter() - start
+        print(f"{mode}: {simulator_pipe.rounds_run / elapsed:.1f} rounds/s")
+    simulators = [SumOfColumnsSimulator(num_nodes=16, num_ghz_states_for_sum=30, check_round_frequency=1000, simulation_method="statevector",
+                                        backend=shared_backend, circuit_cache=shared_cache) for _ in range(4)]
+    start = time.perf_counter()
+    results = generate_shared_sums([(simulator, {"total_rounds": 30, "pipelined": True}) for simulator in simulators])
+    print(f"4 concurrent pipelined runs on one backend: {sum(sim.rounds_run for sim in simulators) / (time.perf_counter() - start):.1f} rounds/s, "
+          f"results {results}")
+
+    print("\n\n*****************************************************")
+    print("* MULTI-ROUND CIRCUITS (4 nodes)                    *")
+    print("*****************************************************")
+    # One transpile and one job per K rounds (reset between rounds), or per layer of rounds packed
+    # side by side on disjoint qubits, instead of one per 4-qubit round
+    for rounds_per_circuit, packed in ((1, False), (50, False), (1, True)):
+        simulator_multi = SumOfColumnsSimulator(num_nodes=N_NODES, num_ghz_states_for_sum=2000, check_round_frequency=10**6)
+        start = time.perf_counter()
+        simulator_multi.generate_shared_sum(total_rounds=2000, rounds_per_circuit=rounds_per_circuit, packed=packed)
+        layout = f"{simulator_multi._packing_blocks()} rounds side by side" if packed else f"{rounds_per_circuit} round(s) per circuit"
+        print(f"{layout}: {simulator_multi.rounds_run / (time.perf_counter() - start):.0f} rounds/s")
+    # With a check every 3 sum rounds. Check bases are bound per run, so chunks with the same pattern of
+    # round kinds share one compiled circuit. The round source is driven directly: ideal check rounds are
+    # flagged ~31% of the time (see Prototype_Adaptive_Checks), which would otherwise end the run early.
+    for rounds_per_circuit, packed in ((1, False), (50, False), (1, True)):
+        simulator_multi = SumOfColumnsSimulator(num_nodes=N_NODES, num_ghz_states_for_sum=3000, check_round_frequency=3)
+        start = time.perf_counter()
+        rounds_run = sum(1 for _ in simulator_multi._multi_rounds(3000, False, 0, 'Z', skip_sum_rounds=False, rounds_per_circuit=rounds_per_circuit,
+                                                                  blocks=simulator_multi._packing_blocks() if packed else 1))
+        layout = f"{simulator_multi._packing_blocks()} rounds side by side" if packed else f"{rounds_per_circuit} round(s) per circuit"
+        print(f"{layout}, check rounds on: {rounds_run / (time.perf_counter() - start):.0f} rounds/s, "
+              f"compiled-circuit cache {simulator_multi.circuit_cache.stats()['hits']}/{simulator_multi.circuit_cache.stats()['hits'] + simulator_multi.circuit_cache.stats()['misses']} hits")
+
+    print("\n\n*****************************************************")
+    print("* STREAMING ROUNDS (iter_rounds, 64 nodes)          *")
+    print("*****************************************************")
+    # Records arrive as rounds complete; with no history kept, memory stays flat however long the run.
+    # Here the caller stops on its own after 50 sum bits, then asks for the sum collected so far.
+    simulator_stream = SumOfColumnsSimulator(num_nodes=64, num_ghz_states_for_sum=10**6, check_round_frequency=1000)
+    agreed = 0
+    for record in simulator_stream.iter_rounds(total_rounds=10**6):
+        if record.detected:
+            print(f"Round {record.round}: check failed for bases {record.bases}")
+        agreed += record.bit is not None
+        if agreed == 50:
+            break
+    print(f"Stopped after {simulator_stream.rounds_run} rounds: (sum, leader) = {simulator_stream.shared_sum_result()}")
@@ -0,0 +1,108 @@
+# Bloch vectors for many states at once, and headless rendering of Bloch figures to files.
+# The lessons (L05, L06, L08, Test_Visualization) draw every state with plot_bloch_multivector and a
+# blocking plt.show(). For batch work the numbers come from bloch_vectors (pure NumPy, no plotting),
+# and figures are written by render_bloch_batch onto explicit Agg canvases (pyplot's backend is never
+# switched, so calling it from an interactive session leaves plt.show() working), spread over a process pool.
+#
+# Statevectors use Qiskit's little-endian order: basis index = sum_q b_q * 2**q.
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+def reduced_density_matrices(statevectors):
+    """
+    Single-qubit reduced density matrices of a batch of pure states.
+    statevectors: array of shape (num_states, 2**n), or (2**n,) for one state.
+    Returns a complex array of shape (num_states, n, 2, 2); entry [s, q] is rho_q of state s.
+    """
+    states = np.asarray(statevectors, dtype=complex)
+    if states.ndim == 1:
+        states = states[None, :]
+    num_states, dim = states.shape
+    num_qubits = int(round(math.log2(dim)))
+    if 2 ** num_qubits != dim:
+        raise ValueError(f"Statevector length {dim} is not a power of two")
+
+    # After reshaping, axis 1 is the most significant qubit (n-1) and axis n is qubit 0
+    tensor = states.reshape((num_states,) + (2,) * num_qubits)
+    rhos = np.empty((num_states, num_qubits, 2, 2), dtype=complex)
+    for q in range(num_qubits):
+        axis = num_qubits - q
+        psi = np.moveaxis(tensor, axis, 1).reshape(num_states, 2, -1)
+        rhos[:, q] = np.einsum("sir,sjr->sij", psi, psi.conj()) # Trace out every other qubit
+    return rhos
+
+def bloch_vectors(statevectors):
+    """
+    Per-qubit Bloch vectors (x, y, z) = (<X>, <Y>, <Z>) of a batch of states.
+    Returns a float array of shape (num_states, n, 3). Entangled qubits have length < 1.
+    """
+    rhos = reduced_density_matrices(statevectors)
+    # rho = (I + xX + yY + zZ) / 2  =>  rho_01 = (x - iy) / 2, rho_00 - rho_11 = z
+    return np.stack([2 * rhos[..., 0, 1].real,
+                     -2 * rhos[..., 0, 1].imag,
+                     (rhos[..., 0, 0] - rhos[..., 1, 1]).real], axis=-1)
+
+def _render_chunk(jobs, dpi):
+    """Worker: draws one figure per (path, vectors, title) job and returns the paths written."""
+    # Figures built directly on an Agg canvas: headless, and they never touch pyplot's global backend
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from qiskit.visualization import plot_bloch_vector
+
+    written = []
+    for path, vectors, title in jobs:
+        num_qubits = len(vectors)
+        fig = Figure(figsize=(5 * num_qubits, 5))
+        FigureCanvasAgg(fig)
+        for q, vector in enumerate(vectors):
+            ax = fig.add_subplot(1, num_qubits, q + 1, projection="3d")
+            plot_bloch_vector(vector, title=f"qubit {q}", ax=ax)
+        if title:
+            fig.suptitle(title)
+        fig.savefig(path, dpi=dpi) # Not registered with pyplot, so nothing to close
+        written.append(path)
+    return written
+
+def render_bloch_batch(statevectors, output_dir, titles=None, filename_pattern="bloch_{index:05d}.png",
+                       max_workers=None, chunk_size=None, dpi=100):
+    """
+    Writes one Bloch figure per state (one sphere per qubit, like plot_bloch_multivector) into output_dir.
+    Bloch vectors are computed once here; the workers only draw. The file format follows the pattern's
+    extension. Returns the written paths in state order.
+    """
+    vectors = bloch_vectors(statevectors)
+    os.makedirs(output_dir, exist_ok=True)
+    titles = titles if titles is not None else [None] * len(vectors)
+    jobs = [(os.path.join(output_dir, filename_pattern.format(index=i)), vectors[i].tolist(), titles[i])
+            for i in range(len(vectors))]
+    if not jobs:
+        return []
+
+    max_workers = max_workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, math.ceil(len(jobs) / (4 * max_workers))) # A few chunks per worker
+    chunks = [jobs[start:start + chunk_size] for start in range(0, len(jobs), chunk_size)]
+    if max_workers == 1:
+        return [path for chunk in chunks for path in _render_chunk(chunk, dpi)]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        # map keeps chunk order, so paths come back in state order
+        return [path for written in pool.map(_render_chunk, chunks, [dpi] * len(chunks)) for path in written]
+
+
+if __name__ == "__main__":
+    import time
+    from QisGem_Parameter_Sweep import sweep_rotation
+
+    # Thousands of states from one compile-once sweep: CRY(theta) with the control in superposition
+    angles = np.linspace(0, 2 * np.pi, 5000)
+    states = sweep_rotation("cry", angles, prepare=lambda qc: qc.h(0))
+    start = time.perf_counter()
+    vectors = bloch_vectors(states)
+    print(f"Bloch vectors for {len(states)} two-qubit states in {time.perf_counter() - start:.4f} s, shape {vectors.shape}")
+    for i in (0, 1250, 2500):
+        print(f"  theta = {angles[i]:.3f}: qubit 0 {np.round(vectors[i, 0], 3)}, qubit 1 {np.round(vectors[i, 1], 3)}")
+
+    paths = render_bloch_batch(states[::500], "bloch_frames", titles=[f"CRY({a:.2f})" for a in angles[::500]])
+    print(f"Wrote {len(paths)} figures to bloch_frames/")
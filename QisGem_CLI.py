@@ -0,0 +1,161 @@
+# Single command-line entry point for the protocol scenarios and the lesson circuits.
+# Nothing heavy is imported at module level: each mode imports only what it needs, so
+#   - protocol --engine closed-form   needs NumPy only (closed-form GHZ sampler)
+#   - protocol --engine stabilizer    adds qiskit.quantum_info (Clifford tableau), no Aer
+#   - protocol --engine aer           adds qiskit_aer (SumOfColumnsSimulator)
+#   - lesson                          qiskit.quantum_info by default, Aer with --engine aer,
+#                                     matplotlib only with --plot
+# Every run reports its own startup time (module start until the selected mode is ready to work),
+# the time spent in each deferred import, and which heavy modules ended up loaded.
+#
+#   python QisGem_CLI.py protocol --engine closed-form --nodes 4 --sum-bits 16
+#   python QisGem_CLI.py lesson rotations --plot bloch_frames
+#
+# Interpreter start-up before this module runs is not included; `python -X importtime` covers that.
+import time
+
+_START = time.perf_counter()
+
+import argparse
+import importlib
+import json
+import sys
+
+from QisGem_Lesson_Circuits import LESSONS # Plain Python until a builder runs; the lesson names feed the parser
+
+HEAVY_MODULES = ("numpy", "qiskit", "qiskit_aer", "matplotlib")
+_import_seconds = {}
+
+def _import(module_name):
+    """importlib.import_module that records how long the (first) import took."""
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    _import_seconds.setdefault(module_name, time.perf_counter() - start)
+    return module
+
+# --- Modes ---
+
+def prepare_lesson(args):
+    """Imports what the lesson mode needs and returns a zero-argument callable doing the work."""
+    _import("qiskit") # Timed here; the lesson builders import QuantumCircuit from it
+    if args.engine == "aer":
+        run_statevectors = _import("QisGem_Statevector_Runner").run_statevectors
+    else:
+        np = _import("numpy")
+        Statevector = _import("qiskit.quantum_info").Statevector
+        run_statevectors = lambda circuits: np.array([Statevector(qc).data for qc in circuits])
+    bloch_batch = _import("QisGem_Bloch_Batch")
+
+    def run():
+        circuits = LESSONS[args.lesson]()
+        labels = [qc.name for qc in circuits]
+        states = run_statevectors(circuits)
+        vectors = bloch_batch.bloch_vectors(states)
+        for label, state, bloch in zip(labels, states, vectors):
+            amplitudes = " ".join(f"{a.real:+.3f}{a.imag:+.3f}j" for a in state)
+            per_qubit = ", ".join(f"q{q}=({x:+.3f}, {y:+.3f}, {z:+.3f})" for q, (x, y, z) in enumerate(bloch))
+            print(f"{label:<18} amplitudes [{amplitudes}]  Bloch {per_qubit}")
+        if args.plot:
+            paths = bloch_batch.render_bloch_batch(states, args.plot, titles=labels, max_workers=1)
+            print(f"Wrote {len(paths)} figures to {args.plot}")
+    return run
+
+def prepare_protocol(args):
+    """Imports what the selected protocol engine needs and returns a zero-argument callable doing the work."""
+    total_rounds = args.rounds or args.sum_bits + args.sum_bits // args.check_frequency
+    if args.engine == "aer":
+        random_module = _import("random")
+        event_log = _import("Prototype_Event_Log")
+        SumOfColumnsSimulator = _import("Prototype_Trial_2_Check_Rounds").SumOfColumnsSimulator
+        _import("qiskit_aer")
+
+        def run():
+            random_module.seed(args.seed)
+            log = event_log.ProtocolEventLog(level=event_log.DEBUG if args.verbose else event_log.INFO)
+            ghz_extension = None
+            if args.ghz_cry is not None:
+                def ghz_extension(qc):
+                    for i in range(qc.num_qubits - 1):
+                        qc.cry(args.ghz_cry, i, i + 1)
+            simulator = SumOfColumnsSimulator(num_nodes=args.nodes, num_ghz_states_for_sum=args.sum_bits,
+                                              check_round_frequency=args.check_frequency,
+                                              simulation_method=args.method, event_log=log, ghz_extension=ghz_extension,
+                                              seed=args.seed)
+            agreed_sum, leader = simulator.generate_shared_sum(
+                total_rounds=total_rounds, enable_eavesdropping_overall=args.eavesdrop_qubit is not None,
+                eavesdropper_basis=args.eavesdrop_basis, eavesdropped_qubit_idx=args.eavesdrop_qubit or 0)
+            bond = f" max_bond_dimension={simulator.max_bond_dimension}" if simulator.max_bond_dimension is not None else ""
+            print(f"engine=aer ({simulator.simulation_method}) rounds_run={simulator.rounds_run} "
+                  f"abort_round={simulator.abort_round} sum={agreed_sum} leader={leader}{bond}")
+        return run
+
+    _import("numpy") # Timed on its own; the prototype modules below would otherwise absorb it
+    if args.engine == "stabilizer":
+        _import("qiskit.quantum_info")
+    async_nodes = _import("Prototype_Async_Nodes")
+    engine_class = async_nodes.ClosedFormEngine if args.engine == "closed-form" else async_nodes.TableauEngine
+
+    def run():
+        engine = engine_class(args.nodes, args.eavesdrop_qubit, args.eavesdrop_basis, seed=args.seed)
+        # No link latency: the classical side only orders the protocol steps here
+        report = async_nodes.run_protocol(args.nodes, args.sum_bits, total_rounds, args.check_frequency,
+                                          default_link=async_nodes.LinkModel(latency_s=0.0),
+                                          quantum_engine=engine, seed=args.seed)
+        print(f"engine={args.engine} rounds_run={report['rounds_run']} abort_round={report['abort_round']} "
+              f"sum={report['agreed_sum']} leader={report['leader']}")
+    return run
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run a QMPC protocol scenario or a lesson circuit.")
+    parser.add_argument("--startup-report", choices=("text", "json", "none"), default="text",
+                        help="where/how to report startup time (text and json go to stderr)")
+    modes = parser.add_subparsers(dest="mode", required=True)
+
+    protocol = modes.add_parser("protocol", help="shared-sum generation with check rounds and leader election")
+    protocol.add_argument("--engine", choices=("closed-form", "stabilizer", "aer"), default="closed-form",
+                          help="closed-form: NumPy sampler; stabilizer: Clifford tableau without Aer; aer: AerSimulator circuits")
+    protocol.add_argument("--method", default="automatic", help="AerSimulator method for --engine aer")
+    protocol.add_argument("--ghz-cry", type=float, metavar="ANGLE",
+                          help="--engine aer: cry(ANGLE) between neighbouring qubits after GHZ preparation "
+                               "(non-Clifford; 'automatic' then uses matrix_product_state beyond 28 nodes)")
+    protocol.add_argument("--nodes", type=int, default=4)
+    protocol.add_argument("--sum-bits", type=int, default=4)
+    protocol.add_argument("--rounds", type=int, help="total rounds (default: sum bits + sum bits // check frequency)")
+    protocol.add_argument("--check-frequency", type=int, default=3)
+    protocol.add_argument("--eavesdrop-qubit", type=int)
+    protocol.add_argument("--eavesdrop-basis", choices=("Z", "X"), default="Z")
+    protocol.add_argument("--seed", type=int)
+    protocol.add_argument("--verbose", action="store_true", help="per-round events (--engine aer)")
+
+    lesson = modes.add_parser("lesson", help="statevectors and Bloch vectors of a lesson's circuits")
+    lesson.add_argument("lesson", choices=sorted(LESSONS))
+    lesson.add_argument("--engine", choices=("quantum-info", "aer"), default="quantum-info")
+    lesson.add_argument("--plot", metavar="DIR", help="write Bloch figures to DIR (imports matplotlib)")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    run = prepare_lesson(args) if args.mode == "lesson" else prepare_protocol(args)
+    ready = time.perf_counter()
+    run()
+    done = time.perf_counter()
+
+    report = {
+        "startup_seconds": ready - _START,
+        "run_seconds": done - ready,
+        "total_seconds": done - _START,
+        "import_seconds": dict(_import_seconds),
+        "heavy_modules_loaded": [name for name in HEAVY_MODULES if name in sys.modules],
+    }
+    if args.startup_report == "json":
+        print(json.dumps(report), file=sys.stderr)
+    elif args.startup_report == "text":
+        imports = ", ".join(f"{name} {seconds:.3f} s" for name, seconds in report["import_seconds"].items())
+        print(f"startup {report['startup_seconds']:.3f} s (imports: {imports or 'none'}), run {report['run_seconds']:.3f} s, "
+              f"total {report['total_seconds']:.3f} s; heavy modules loaded: {', '.join(report['heavy_modules_loaded']) or 'none'}",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
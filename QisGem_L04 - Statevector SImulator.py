@@ -1,31 +1,24 @@
 # 1. Import necessary components
-from qiskit import QuantumCircuit
-# Import the Aer provider from the qiskit_aer package
-from qiskit_aer import Aer
 from qiskit.quantum_info import Statevector
 import numpy as np # Often useful when working with statevectors
+# Shared runner around Aer's 'statevector_simulator' backend
+from QisGem_Statevector_Runner import run_statevector
+# The lesson circuits are built in QisGem_Lesson_Circuits, which QisGem_CLI runs too
+from QisGem_Lesson_Circuits import statevector_circuits
 
-# 2. Create the circuit
-qc_sv = QuantumCircuit(1) # No classical bits needed for statevector simulation
-
-# 3. Apply the Hadamard gate
-qc_sv.h(0)
+# 2./3. Create the circuit (one qubit, no classical bits) and apply the Hadamard gate
+qc_sv, = statevector_circuits()
 
 # 4. Visualize the circuit
 print("Statevector Simulator Example Circuit (Hadamard):")
 print(qc_sv.draw(output='text'))
 
-# 5. Get the statevector simulator backend from Aer
-simulator_sv = Aer.get_backend('statevector_simulator')
-
-# 6. Run the circuit on the statevector simulator
+# 5./6. Run the circuit on Aer's statevector simulator (created once, shared with the other lessons)
 # The statevector simulator doesn't use transpile in the same way for this basic case
 # and doesn't need shots.
-job_sv = simulator_sv.run(qc_sv)
 
-# 7. Get the result, which is the statevector
-result_sv = job_sv.result()
-statevector = result_sv.get_statevector(qc_sv)
+# 7. Get the result, which is the statevector (a NumPy array of amplitudes)
+statevector = Statevector(run_statevector(qc_sv)) # Prints as before: Statevector([...], dims=(2,))
 
 # 8. Print and interpret the statevector
 print("\nStatevector:", statevector)
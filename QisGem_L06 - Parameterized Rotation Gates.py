@@ -1,55 +1,46 @@
 # 1. Import necessary components
-from qiskit import QuantumCircuit
-from qiskit_aer import Aer
-from qiskit.quantum_info import Statevector
 from qiskit.visualization import plot_bloch_multivector
 import matplotlib.pyplot as plt
 import numpy as np # For using pi (np.pi)
-
-# Get the statevector simulator
-simulator_sv = Aer.get_backend('statevector_simulator')
+# Runs all example circuits on the statevector simulator in one job
+from QisGem_Statevector_Runner import run_statevector_objects
+# The lesson circuits are built in QisGem_Lesson_Circuits, which QisGem_CLI runs too
+from QisGem_Lesson_Circuits import rotation_circuits
 
 # --- Example 1: Ry(pi/2) on |0> ---
 # This rotation around the Y axis by pi/2 (90 degrees) takes |0> to |+>
-qc_ry = QuantumCircuit(1)
-qc_ry.ry(np.pi/2, 0) # Apply Ry(pi/2) gate to qubit 0
 
-# Get state vector and plot
-job_ry = simulator_sv.run(qc_ry)
-result_ry = job_ry.result()
-statevector_ry = result_ry.get_statevector(qc_ry)
+# --- Example 2: Rz(pi/2) on |+> ---
+# We first create the |+> state using H or Ry(pi/2), then apply Rz
 
-print("Bloch Sphere after Ry(pi/2) on |0>:")
-plot_bloch_multivector(statevector_ry)
-plt.show() # Should look like the |+> state (arrow on positive X axis)
+# --- Example 3: Rx(pi) on |0> ---
+# A rotation by pi (180 degrees) around X axis is equivalent to the X gate
+qc_ry, qc_rz, qc_rx = rotation_circuits()
 
 
-# --- Example 2: Rz(pi/2) on |+> ---
-# We first create the |+> state using H or Ry(pi/2), then apply Rz
-qc_rz = QuantumCircuit(1)
-qc_rz.h(0) # Create |+> state
-qc_rz.rz(np.pi/2, 0) # Apply Rz(pi/2) gate to qubit 0
+# Get state vectors and plot
+statevector_ry, statevector_rz, statevector_rx = run_statevector_objects([qc_ry, qc_rz, qc_rx])
 
-# Get state vector and plot
-job_rz = simulator_sv.run(qc_rz)
-result_rz = job_rz.result()
-statevector_rz = result_rz.get_statevector(qc_rz)
+print("Bloch Sphere after Ry(pi/2) on |0>:")
+plot_bloch_multivector(statevector_ry)
+plt.show() # Should look like the |+> state (arrow on positive X axis)
 
 print("\nBloch Sphere after H and Rz(pi/2) on |0>:")
 plot_bloch_multivector(statevector_rz)
 plt.show() # Should look like a state on the equator rotated by 90 deg from positive X
 
+print("\nBloch Sphere after Rx(pi) on |0>:")
+plot_bloch_multivector(statevector_rx)
+plt.show() # Should look like the |1> state (arrow pointing down)
 
-# --- Example 3: Rx(pi) on |0> ---
-# A rotation by pi (180 degrees) around X axis is equivalent to the X gate
-qc_rx = QuantumCircuit(1)
-qc_rx.rx(np.pi, 0) # Apply Rx(pi) gate to qubit 0
 
-# Get state vector and plot
-job_rx = simulator_sv.run(qc_rx)
-result_rx = job_rx.result()
-statevector_rx = result_rx.get_statevector(qc_rx)
+# --- Example 4: Sweeping the angle ---
+# Instead of one circuit per angle, build Ry(theta) once with a Parameter and bind many angles in one job.
+# <Z> should follow cos(theta): 1 at |0>, 0 on the equator, -1 at |1>.
+from QisGem_Parameter_Sweep import sweep_rotation
 
-print("\nBloch Sphere after Rx(pi) on |0>:")
-plot_bloch_multivector(statevector_rx)
-plt.show() # Should look like the |1> state (arrow pointing down)
\ No newline at end of file
+angles = np.linspace(0, np.pi, 5)
+z_values = sweep_rotation("ry", angles, "Z")
+print("\n<Z> after Ry(theta) on |0>:")
+for angle, z in zip(angles, z_values):
+    print(f"  theta = {angle:.3f}: <Z> = {z:+.3f}")
\ No newline at end of file
@@ -1,13 +1,10 @@
 # 1. Import necessary components
-from qiskit import QuantumCircuit
-from qiskit_aer import Aer
-from qiskit.quantum_info import Statevector
-import numpy as np
 from qiskit.visualization import plot_bloch_multivector
 import matplotlib.pyplot as plt
-
-# Get the statevector simulator
-simulator_sv = Aer.get_backend('statevector_simulator')
+# Runs both example circuits on the statevector simulator in one job
+from QisGem_Statevector_Runner import run_statevector_objects
+# The lesson circuits are built in QisGem_Lesson_Circuits, which QisGem_CLI runs too
+from QisGem_Lesson_Circuits import controlled_rotation_circuits
 
 # --- Example: CRY(pi/2) with control in superposition ---
 # Start with |00>
@@ -41,30 +38,6 @@ simulator_sv = Aer.get_backend('statevector_simulator')
 # So |10> becomes |1> tensored with (-i|1>) = -i|11>.
 # Combined state: (|00> - i|11>)/sqrt(2). This is another type of entangled Bell state!
 
-# Let's code the CRY(pi) example
-qc_cry = QuantumCircuit(2) # 2 qubits, no classical bits needed
-
-qc_cry.h(0)      # Put control in superposition
-qc_cry.cry(np.pi, 0, 1) # Apply CRY(pi) with control 0, target 1
-
-print("\nCRY(pi) Circuit with control in superposition:")
-print(qc_cry.draw(output='text'))
-
-# Get state vector and plot (plot_bloch_multivector can show 2 qubits but is harder to interpret)
-job_cry = simulator_sv.run(qc_cry)
-result_cry = job_cry.result()
-statevector_cry = result_cry.get_statevector(qc_cry)
-
-print("\nStatevector after CRY(pi) on |00> with H on qubit 0:", statevector_cry)
-# Expected statevector: [1/sqrt(2), 0, 0, -i/sqrt(2)] which is approx [0.707, 0, 0, -0.707j]
-
-# Let's also try visualizing the statevector. For 2 qubits, it's not a single point on a sphere,
-# plot_bloch_multivector shows the state of each qubit *individually*, ignoring entanglement,
-# but it can still be somewhat illustrative.
-print("\nBloch Sphere visualization (per qubit) for entangled state after CRY(pi):")
-plot_bloch_multivector(statevector_cry)
-plt.show() # Note: This visualization doesn't show entanglement!
-
 # --- Example: CRZ(pi/2) on |+0> ---
 # Similar to Rz(pi/2) on |+>, but controlled.
 # Initial state |00>
@@ -81,20 +54,28 @@ plt.show() # Note: This visualization doesn't show entanglement!
 # So |11> becomes |1> tensored with i|1> = i|11>.
 # Combined state: (|01> + i|11>)/sqrt(2). This is another entangled state.
 
-# Let's code the CRZ(pi/2) example
-qc_crz = QuantumCircuit(2) # 2 qubits
+# Let's code both examples: CRY(pi) with the control in superposition, and CRZ(pi/2) with the target in |1>
+qc_cry, qc_crz = controlled_rotation_circuits()
+
+# Get both state vectors
+statevector_cry, statevector_crz = run_statevector_objects([qc_cry, qc_crz])
+
+print("\nCRY(pi) Circuit with control in superposition:")
+print(qc_cry.draw(output='text'))
 
-qc_crz.x(1)      # Set target qubit 1 to |1>
-qc_crz.h(0)      # Put control qubit 0 in superposition (|0> -> |+>)
-qc_crz.crz(np.pi/2, 0, 1) # Apply CRZ(pi/2) with control 0, target 1
+print("\nStatevector after CRY(pi) on |00> with H on qubit 0:", statevector_cry)
+# Expected statevector: [1/sqrt(2), 0, 0, -i/sqrt(2)] which is approx [0.707, 0, 0, -0.707j]
+
+# Let's also try visualizing the statevector. For 2 qubits, it's not a single point on a sphere,
+# plot_bloch_multivector shows the state of each qubit *individually*, ignoring entanglement,
+# but it can still be somewhat illustrative.
+# (plot_bloch_multivector can show 2 qubits but is harder to interpret)
+print("\nBloch Sphere visualization (per qubit) for entangled state after CRY(pi):")
+plot_bloch_multivector(statevector_cry)
+plt.show() # Note: This visualization doesn't show entanglement!
 
 print("\nCRZ(pi/2) Circuit with control in superposition and target in |1>:")
 print(qc_crz.draw(output='text'))
 
-# Get state vector
-job_crz = simulator_sv.run(qc_crz)
-result_crz = job_crz.result()
-statevector_crz = result_crz.get_statevector(qc_crz)
-
 print("\nStatevector after CRZ(pi/2) on |01> with H on qubit 0:", statevector_crz)
 # Expected statevector: [0, 1/sqrt(2), 0, i/sqrt(2)] which is approx [0, 0.707, 0, 0.707j]
\ No newline at end of file
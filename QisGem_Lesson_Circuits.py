@@ -0,0 +1,95 @@
+# The circuits of the statevector/Bloch lessons, built in one place.
+# The lesson scripts (L04, L05, both L06 files, L08 CRY, Test_Visualization) and `QisGem_CLI.py lesson`
+# both call these builders, so the CLI always runs exactly the circuits the lessons teach.
+# Each builder returns the lesson's circuits in example order; qc.name is the short label the CLI prints.
+# Qiskit is imported inside the builders: QisGem_CLI imports this module for the lesson names alone.
+import math
+
+def statevector_circuits():
+    """L04: the Hadamard example."""
+    from qiskit import QuantumCircuit
+    qc_sv = QuantumCircuit(1, name="H|0>") # No classical bits needed for statevector simulation
+    qc_sv.h(0) # Apply the Hadamard gate
+    return [qc_sv]
+
+def bloch_circuits():
+    """L05: |0>, H|0> = |+>, X|0> = |1> and HZ|0> = |->."""
+    from qiskit import QuantumCircuit
+    qc0 = QuantumCircuit(1, name="|0>") # Start with |0>
+
+    qc_h = QuantumCircuit(1, name="H|0> (|+>)")
+    qc_h.h(0) # Apply Hadamard
+
+    qc_x = QuantumCircuit(1, name="X|0> (|1>)")
+    qc_x.x(0) # Apply Pauli-X
+
+    qc_hz = QuantumCircuit(1, name="HZ|0> (|->)")
+    qc_hz.h(0) # Apply H
+    qc_hz.z(0) # Apply Z
+    return [qc0, qc_h, qc_x, qc_hz]
+
+def rotation_circuits():
+    """L06 Parameterized Rotation Gates: Ry(pi/2) on |0>, Rz(pi/2) on |+>, Rx(pi) on |0>."""
+    from qiskit import QuantumCircuit
+    qc_ry = QuantumCircuit(1, name="Ry(pi/2)|0>")
+    qc_ry.ry(math.pi/2, 0) # Apply Ry(pi/2) gate to qubit 0
+
+    qc_rz = QuantumCircuit(1, name="Rz(pi/2)H|0>")
+    qc_rz.h(0) # Create |+> state
+    qc_rz.rz(math.pi/2, 0) # Apply Rz(pi/2) gate to qubit 0
+
+    qc_rx = QuantumCircuit(1, name="Rx(pi)|0>")
+    qc_rx.rx(math.pi, 0) # Apply Rx(pi) gate to qubit 0
+    return [qc_ry, qc_rz, qc_rx]
+
+def phase_circuits():
+    """L06 Phase Gates: S and T on |+>."""
+    from qiskit import QuantumCircuit
+    qc_s = QuantumCircuit(1, name="SH|0>")
+    qc_s.h(0) # Create |+> state
+    qc_s.s(0) # Apply S gate (equivalent to Rz(pi/2))
+
+    qc_t = QuantumCircuit(1, name="TH|0>")
+    qc_t.h(0) # Create |+> state
+    qc_t.t(0) # Apply T gate (equivalent to Rz(pi/4))
+    return [qc_s, qc_t]
+
+def controlled_rotation_circuits():
+    """L08 Controlled Rotation Gates: CRY(pi) on |+0> and CRZ(pi/2) on |+1>."""
+    from qiskit import QuantumCircuit
+    qc_cry = QuantumCircuit(2, name="CRY(pi) H|00>") # 2 qubits, no classical bits needed
+    qc_cry.h(0)      # Put control in superposition
+    qc_cry.cry(math.pi, 0, 1) # Apply CRY(pi) with control 0, target 1
+
+    qc_crz = QuantumCircuit(2, name="CRZ(pi/2) H|01>") # 2 qubits
+    qc_crz.x(1)      # Set target qubit 1 to |1>
+    qc_crz.h(0)      # Put control qubit 0 in superposition (|0> -> |+>)
+    qc_crz.crz(math.pi/2, 0, 1) # Apply CRZ(pi/2) with control 0, target 1
+    return [qc_cry, qc_crz]
+
+def visualization_circuits():
+    """Test_Visualization: HH|0>, HZH|0> and XYZ|0>."""
+    from qiskit import QuantumCircuit
+    qc_hh = QuantumCircuit(1, name="HH|0>") # Start with |0>
+    qc_hh.h(0)
+    qc_hh.h(0)
+
+    qc_hzh = QuantumCircuit(1, name="HZH|0>") # Start with |0>
+    qc_hzh.h(0)
+    qc_hzh.z(0)
+    qc_hzh.h(0)
+
+    qc_xyz = QuantumCircuit(1, name="ZYX|0>") # Start with |0>
+    qc_xyz.x(0)
+    qc_xyz.y(0)
+    qc_xyz.z(0)
+    return [qc_hh, qc_hzh, qc_xyz]
+
+LESSONS = {
+    "statevector": statevector_circuits,                   # L04
+    "bloch": bloch_circuits,                               # L05
+    "rotations": rotation_circuits,                        # L06 Parameterized Rotation Gates
+    "phase": phase_circuits,                               # L06 Phase Gates (S and T)
+    "controlled-rotations": controlled_rotation_circuits,  # L08 Controlled Rotation Gates
+    "visualization": visualization_circuits,               # Test_Visualization
+}
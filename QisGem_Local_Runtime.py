@@ -0,0 +1,568 @@
+# In-process stand-in for qiskit_ibm_runtime, so the runtime-style code of episode2/episode3
+# (QiskitRuntimeService, service.backend("ibm_brisbane"), EstimatorV2 + EstimatorOptions, Session,
+# Batch, service.job(job_id)) runs offline:
+#
+#   service = LocalRuntimeService(max_workers=2, max_queue=32)
+#   backend = service.backend("ibm_brisbane")            # 127-qubit Eagle-style fake backend
+#   pass_manager = generate_preset_pass_manager(optimization_level=1, backend=backend)
+#   with Batch(backend=backend) as batch:
+#       job = EstimatorV2(mode=batch, options=options).run([(isa_circuit, isa_observables)])
+#   job.result()[0].data.evs, job.metrics()["latency"], service.latency_report()
+#
+# Jobs go through one bounded queue served by a pool of worker threads (Aer and the NumPy tableau
+# maths release the GIL). Concurrency is limited three ways: max_workers for the whole service,
+# one job at a time per Session (like a dedicated session), and an optional max_concurrent_jobs per
+# Batch. A full queue blocks submit() for up to queue_timeout seconds, then raises RuntimeError.
+# Every job records its queue wait and execution time; job_overhead_s adds a fixed sleep per job to
+# mimic hardware latency when load-testing orchestration code.
+#
+# Execution is local: EstimatorV2 returns exact expectation values from QisGem_Stabilizer_Estimator
+# (tableau for Clifford ISA circuits, statevector or MPS otherwise), SamplerV2 samples with Aer.
+# With noisy=True both use Aer with the fake backend's noise model instead (small circuits only).
+# Error mitigation, twirling and dynamical decoupling options are accepted and recorded, not emulated.
+import threading
+import time
+import uuid
+from collections import deque
+
+import numpy as np
+from qiskit.providers.exceptions import QiskitBackendNotFoundError
+from qiskit.providers.fake_provider import GenericBackendV2
+
+from QisGem_Stabilizer_Estimator import expectation_values
+
+EAGLE_BASIS_GATES = ["ecr", "id", "rz", "sx", "x"]
+EAGLE_BACKENDS = ("ibm_brisbane", "ibm_kyiv", "ibm_sherbrooke")
+DEFAULT_MAX_QUEUE = 64
+
+def eagle_coupling_map():
+    """Edges of a 127-qubit heavy-hex lattice laid out like IBM's Eagle processors."""
+    rows = [(0, 14), (18, 15), (37, 15), (56, 15), (75, 15), (94, 15), (113, 14)] # (first qubit, length)
+    edges = [(start + k, start + k + 1) for start, length in rows for k in range(length - 1)]
+    # Bridge qubit -> (qubit in the row above, qubit in the row below)
+    bridges = {14: (0, 18), 15: (4, 22), 16: (8, 26), 17: (12, 30),
+               33: (20, 39), 34: (24, 43), 35: (28, 47), 36: (32, 51),
+               52: (37, 56), 53: (41, 60), 54: (45, 64), 55: (49, 68),
+               71: (58, 77), 72: (62, 81), 73: (66, 85), 74: (70, 89),
+               90: (75, 94), 91: (79, 98), 92: (83, 102), 93: (87, 106),
+               109: (96, 114), 110: (100, 118), 111: (104, 122), 112: (108, 126)}
+    for bridge, (above, below) in bridges.items():
+        edges += [(above, bridge), (bridge, below)]
+    return edges
+
+class LocalBackend(GenericBackendV2):
+    """A GenericBackendV2 with an Eagle name, basis and coupling map; usable with the preset pass managers."""
+    def __init__(self, name, service, seed=None):
+        super().__init__(127, EAGLE_BASIS_GATES, coupling_map=eagle_coupling_map(), seed=seed)
+        self.name = name
+        self.service = service
+        self._noise_model = None
+
+    def noise_model(self):
+        """Aer NoiseModel built from the backend's (randomly generated) gate errors and durations."""
+        if self._noise_model is None:
+            from qiskit_aer.noise import NoiseModel
+            self._noise_model = NoiseModel.from_backend(self)
+        return self._noise_model
+
+    def __repr__(self):
+        return f"<LocalBackend('{self.name}')>"
+
+# --- Options ---
+
+class _OptionGroup:
+    """Attribute bag with a fixed set of fields: assigning an unknown one raises, like the runtime's options."""
+    def __init__(self, **defaults):
+        object.__setattr__(self, "_fields", dict(defaults))
+
+    def __getattr__(self, name):
+        try:
+            return self._fields[name]
+        except KeyError:
+            raise AttributeError(f"{type(self).__name__} has no option '{name}'") from None
+
+    def __setattr__(self, name, value):
+        if name not in self._fields:
+            raise AttributeError(f"{type(self).__name__} has no option '{name}'")
+        if isinstance(self._fields[name], _OptionGroup) and isinstance(value, dict):
+            self._fields[name].update(value)
+        else:
+            self._fields[name] = value
+
+    def update(self, values):
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    def to_dict(self):
+        return {name: value.to_dict() if isinstance(value, _OptionGroup) else value for name, value in self._fields.items()}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()})"
+
+def _common_option_groups():
+    return dict(
+        dynamical_decoupling=_OptionGroup(enable=False, sequence_type="XX", extra_slack_distribution="middle", scheduling_method="alap"),
+        twirling=_OptionGroup(enable_gates=False, enable_measure=True, num_randomizations="auto", shots_per_randomization="auto", strategy="active-accum"),
+        environment=_OptionGroup(log_level="WARNING", callback=None, job_tags=None),
+        simulator=_OptionGroup(noise_model=None, seed_simulator=None, coupling_map=None, basis_gates=None),
+        max_execution_time=None,
+    )
+
+class EstimatorOptions(_OptionGroup):
+    def __init__(self):
+        super().__init__(default_precision=0.015625, default_shots=None, seed_estimator=None, resilience_level=1,
+                         resilience=_OptionGroup(measure_mitigation=True, zne_mitigation=False, pec_mitigation=False),
+                         **_common_option_groups())
+
+class SamplerOptions(_OptionGroup):
+    def __init__(self):
+        super().__init__(default_shots=4096, **_common_option_groups())
+
+# --- Jobs ---
+
+class LocalRuntimeJob:
+    def __init__(self, primitive_id, backend, mode, work):
+        self._job_id = uuid.uuid4().hex[:20]
+        self.primitive_id = primitive_id
+        self._backend = backend
+        self.mode = mode # Session, Batch or None (job mode)
+        self._work = work
+        self._status = "QUEUED"
+        self._result = None
+        self._error = None
+        self._done = threading.Event()
+        self.created = time.time()
+        self._queued_at = time.perf_counter()
+        self._started_at = None
+        self._finished_at = None
+
+    def job_id(self):
+        return self._job_id
+
+    def backend(self):
+        return self._backend
+
+    @property
+    def session_id(self):
+        return self.mode.session_id if self.mode is not None else None
+
+    def status(self):
+        return self._status
+
+    def done(self):
+        return self._status == "DONE"
+
+    def running(self):
+        return self._status == "RUNNING"
+
+    def in_final_state(self):
+        return self._status in ("DONE", "ERROR", "CANCELLED")
+
+    def cancel(self):
+        """Cancels a queued job; returns False if it already started."""
+        return self._backend.service._cancel(self)
+
+    def result(self, timeout=None):
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"Job {self._job_id} did not finish within {timeout} s")
+        if self._status == "CANCELLED":
+            raise RuntimeError(f"Job {self._job_id} was cancelled")
+        if self._error is not None:
+            raise RuntimeError(f"Job {self._job_id} failed: {self._error!r}") from self._error
+        return self._result
+
+    @property
+    def queue_wait_seconds(self):
+        """Seconds between submission and the start of execution (so far, while still queued)."""
+        end = self._started_at if self._started_at is not None else time.perf_counter()
+        return end - self._queued_at
+
+    @property
+    def execution_seconds(self):
+        """Seconds spent executing; None until the job has started."""
+        if self._started_at is None:
+            return None
+        end = self._finished_at if self._finished_at is not None else time.perf_counter()
+        return end - self._started_at
+
+    def metrics(self):
+        return {
+            "status": self._status,
+            "session_id": self.session_id,
+            "latency": {"queue_wait_seconds": self.queue_wait_seconds, "execution_seconds": self.execution_seconds},
+        }
+
+    def _execute(self, job_overhead_s):
+        self._status = "RUNNING"
+        self._started_at = time.perf_counter()
+        try:
+            if job_overhead_s:
+                time.sleep(job_overhead_s)
+            self._result = self._work()
+            self._status = "DONE"
+        except Exception as error: # Reported through result(), like a failed runtime job
+            self._error = error
+            self._status = "ERROR"
+        finally:
+            self._finished_at = time.perf_counter()
+            self._done.set()
+
+    def __repr__(self):
+        return f"<LocalRuntimeJob('{self._job_id}', '{self.primitive_id}', {self._status})>"
+
+# --- Execution modes ---
+
+_active_mode = threading.local() # Session/Batch entered with `with` on this thread
+
+class _ExecutionMode:
+    def __init__(self, backend, max_time=None, max_concurrent_jobs=None):
+        self._backend = backend
+        self.service = backend.service
+        self.max_time = max_time
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.session_id = uuid.uuid4().hex[:20]
+        self._accepting = True
+        self._running = 0
+
+    def backend(self):
+        return self._backend.name
+
+    def status(self):
+        return "Open" if self._accepting else "Closed"
+
+    def close(self):
+        """Stops accepting jobs; queued and running jobs still complete."""
+        self._accepting = False
+
+    def cancel(self):
+        """Closes the mode and cancels its queued jobs."""
+        self.close()
+        self.service._cancel_mode(self)
+
+    def _has_capacity(self):
+        return self.max_concurrent_jobs is None or self._running < self.max_concurrent_jobs
+
+    def __enter__(self):
+        self._previous_mode = getattr(_active_mode, "mode", None)
+        _active_mode.mode = self
+        return self
+
+    def __exit__(self, *exc_info):
+        _active_mode.mode = self._previous_mode
+        self.close()
+
+class Session(_ExecutionMode):
+    """Jobs run one after another in submission order, as on a dedicated session."""
+    def __init__(self, backend, max_time=None):
+        super().__init__(backend, max_time, max_concurrent_jobs=1)
+
+class Batch(_ExecutionMode):
+    """Jobs run in parallel, up to max_concurrent_jobs of them (default: as many as there are workers)."""
+    def __init__(self, backend, max_time=None, max_concurrent_jobs=None):
+        super().__init__(backend, max_time, max_concurrent_jobs)
+
+# --- Primitives ---
+
+class _LocalPrimitive:
+    _options_class = None
+    _primitive_id = None
+
+    def __init__(self, mode=None, options=None):
+        mode = mode if mode is not None else getattr(_active_mode, "mode", None)
+        if mode is None:
+            raise ValueError("A backend, Session or Batch is required as mode (or use the primitive inside `with Session(...)`)")
+        self._mode = mode if isinstance(mode, _ExecutionMode) else None
+        self._backend = mode._backend if isinstance(mode, _ExecutionMode) else mode
+        self.options = self._options_class()
+        if isinstance(options, _OptionGroup):
+            self.options.update(options._fields)
+        elif options:
+            self.options.update(options)
+
+    @property
+    def mode(self):
+        return self._mode
+
+    def backend(self):
+        return self._backend
+
+    def _submit(self, work):
+        return self._backend.service._submit(LocalRuntimeJob(self._primitive_id, self._backend, self._mode, work))
+
+class EstimatorV2(_LocalPrimitive):
+    _options_class = EstimatorOptions
+    _primitive_id = "estimator"
+
+    def run(self, pubs, *, precision=None):
+        """pubs: [(circuit, observables[, parameter_values[, precision]]), ...] as for qiskit_ibm_runtime.EstimatorV2."""
+        from qiskit.primitives.containers.estimator_pub import EstimatorPub
+        # Coerce (and so validate) now, in the caller's thread, like the runtime client does
+        coerced = [EstimatorPub.coerce(pub, precision if precision is not None else self.options.default_precision) for pub in pubs]
+        noisy = self._backend.service.noisy
+        options = self.options.to_dict()
+        return self._submit(lambda: self._run_noisy(coerced, options) if noisy else self._run_exact(coerced, options))
+
+    def _run_exact(self, pubs, options):
+        from qiskit.primitives.containers import DataBin, PrimitiveResult, PubResult
+        from qiskit.quantum_info import SparsePauliOp
+        pub_results = []
+        for pub in pubs:
+            circuits = pub.parameter_values.bind_all(pub.circuit) # Object array over the parameter shape
+            circuit_index, observable_index = np.broadcast_arrays(np.arange(circuits.size).reshape(circuits.shape),
+                                                                  np.arange(pub.observables.size).reshape(pub.observables.shape))
+            flat_observables = pub.observables.ravel()
+            evs = np.empty(pub.shape)
+            methods = set()
+            # Every distinct bound circuit is simulated once for all the observables paired with it
+            for c in np.unique(circuit_index):
+                positions = np.argwhere(circuit_index == c)
+                ops = [SparsePauliOp.from_list(list(flat_observables[observable_index[tuple(p)]].items()))
+                       for p in positions]
+                values, metadata = expectation_values(circuits.ravel()[c], ops)
+                methods.add(metadata["method"])
+                for p, value in zip(positions, values):
+                    evs[tuple(p)] = value
+            pub_results.append(PubResult(DataBin(evs=evs, stds=np.zeros_like(evs), shape=pub.shape),
+                                         metadata={"target_precision": pub.precision, "simulation_methods": sorted(methods)}))
+        return PrimitiveResult(pub_results, metadata={"version": 2, "options": options})
+
+    def _run_noisy(self, pubs, options):
+        from qiskit_aer.primitives import EstimatorV2 as AerEstimatorV2
+        estimator = AerEstimatorV2(options={"backend_options": {"noise_model": self._backend.noise_model()},
+                                            "run_options": {"seed_simulator": options["simulator"]["seed_simulator"]}})
+        return estimator.run(pubs).result()
+
+class SamplerV2(_LocalPrimitive):
+    _options_class = SamplerOptions
+    _primitive_id = "sampler"
+
+    def run(self, pubs, *, shots=None):
+        """pubs: [(circuit[, parameter_values[, shots]]), ...] as for qiskit_ibm_runtime.SamplerV2."""
+        from qiskit.primitives.containers.sampler_pub import SamplerPub
+        shots = shots if shots is not None else self.options.default_shots
+        coerced = [SamplerPub.coerce(pub, shots) for pub in pubs]
+        backend_options = {"noise_model": self._backend.noise_model()} if self._backend.service.noisy else {}
+        seed = self.options.simulator.seed_simulator
+
+        def work():
+            from qiskit_aer.primitives import SamplerV2 as AerSamplerV2
+            return AerSamplerV2(default_shots=shots, seed=seed, options={"backend_options": backend_options}).run(coerced).result()
+        return self._submit(work)
+
+# --- Service ---
+
+class LocalRuntimeService:
+    _saved_accounts = {} # In memory only: tokens are never written anywhere
+
+    def __init__(self, channel="local", token=None, instance=None, max_workers=2, max_queue=DEFAULT_MAX_QUEUE,
+                 queue_timeout=None, job_overhead_s=0.0, noisy=False, seed=None, **_ignored):
+        """
+        channel, token, instance: accepted for drop-in compatibility and ignored; nothing goes over the network.
+        max_workers: jobs executing at the same time across the service.
+        max_queue: jobs waiting to start; submitting to a full queue blocks for up to queue_timeout seconds
+            (None: indefinitely) and then raises RuntimeError.
+        job_overhead_s: fixed sleep added to every job's execution, to mimic hardware latency.
+        noisy: run primitives with each fake backend's noise model instead of exactly.
+        """
+        self.channel = channel
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.job_overhead_s = job_overhead_s
+        self.noisy = noisy
+        self.seed = seed
+        self._backends = {}
+        self._jobs = {}
+        self._pending = deque()
+        self._condition = threading.Condition()
+        self._workers = []
+        self._closed = False
+
+    @classmethod
+    def save_account(cls, channel="local", token=None, name=None, overwrite=False, **kwargs):
+        cls._saved_accounts[name or f"default-{channel}"] = {"channel": channel, **kwargs}
+
+    @classmethod
+    def saved_accounts(cls, **_filters):
+        return dict(cls._saved_accounts)
+
+    def backend(self, name="ibm_brisbane"):
+        if name not in EAGLE_BACKENDS:
+            raise QiskitBackendNotFoundError(f"No local backend named '{name}'; available: {EAGLE_BACKENDS}")
+        if name not in self._backends:
+            self._backends[name] = LocalBackend(name, self, seed=self.seed)
+        return self._backends[name]
+
+    def backends(self, **_filters):
+        return [self.backend(name) for name in EAGLE_BACKENDS]
+
+    def least_busy(self, **_filters):
+        with self._condition:
+            queued = {name: 0 for name in EAGLE_BACKENDS}
+            for job in self._pending:
+                queued[job.backend().name] += 1
+        return self.backend(min(EAGLE_BACKENDS, key=queued.get))
+
+    def job(self, job_id):
+        try:
+            return self._jobs[job_id]
+        except KeyError:
+            raise ValueError(f"No job with id '{job_id}' in this local service") from None
+
+    def jobs(self, limit=10, backend_name=None, session_id=None, pending=None):
+        """Most recent jobs first, optionally filtered."""
+        selected = [job for job in reversed(list(self._jobs.values()))
+                    if (backend_name is None or job.backend().name == backend_name)
+                    and (session_id is None or job.session_id == session_id)
+                    and (pending is None or pending == (job.status() in ("QUEUED", "RUNNING")))]
+        return selected[:limit] if limit is not None else selected
+
+    def latency_report(self, jobs=None):
+        """Queue-wait and execution statistics (seconds) over finished jobs."""
+        finished = [job for job in (jobs if jobs is not None else self._jobs.values()) if job.in_final_state() and job.execution_seconds is not None]
+        report = {"jobs": len(finished)}
+        for name, values in (("queue_wait", [job.queue_wait_seconds for job in finished]),
+                             ("execution", [job.execution_seconds for job in finished])):
+            if values:
+                report[name] = {"mean": float(np.mean(values)), "p50": float(np.percentile(values, 50)),
+                                "p95": float(np.percentile(values, 95)), "max": float(np.max(values))}
+        return report
+
+    def close(self, wait=True):
+        """Stops the workers once the queue has drained (wait=True) or after their current job."""
+        with self._condition:
+            self._closed = True
+            if not wait:
+                for job in list(self._pending):
+                    self._cancel_locked(job)
+            self._condition.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # --- Queue and workers ---
+
+    def _submit(self, job):
+        mode = job.mode
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The local runtime service is closed")
+            if mode is not None and not mode._accepting:
+                raise RuntimeError(f"{type(mode).__name__} {mode.session_id} is closed and accepts no new jobs")
+            if not self._condition.wait_for(lambda: len(self._pending) < self.max_queue, timeout=self.queue_timeout):
+                raise RuntimeError(f"Job queue is full ({self.max_queue} pending jobs)")
+            job._queued_at = time.perf_counter() # Queue wait starts once the job is actually queued
+            self._pending.append(job)
+            self._jobs[job.job_id()] = job
+            if len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._worker_loop, name=f"local-runtime-{len(self._workers)}", daemon=True)
+                self._workers.append(worker)
+                worker.start()
+            self._condition.notify_all()
+        return job
+
+    def _next_job_locked(self):
+        """First queued job whose Session/Batch has capacity (FIFO otherwise)."""
+        for job in self._pending:
+            if job.mode is None or job.mode._has_capacity():
+                return job
+        return None
+
+    def _worker_loop(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._next_job_locked() is not None or (self._closed and not self._pending))
+                job = self._next_job_locked()
+                if job is None: # Closed and drained
+                    return
+                self._pending.remove(job)
+                if job.mode is not None:
+                    job.mode._running += 1
+                self._condition.notify_all() # A queue slot is free
+            job._execute(self.job_overhead_s)
+            with self._condition:
+                if job.mode is not None:
+                    job.mode._running -= 1
+                self._condition.notify_all()
+
+    def _cancel_locked(self, job):
+        if job.status() != "QUEUED":
+            return False
+        self._pending.remove(job)
+        job._status = "CANCELLED"
+        job._done.set()
+        return True
+
+    def _cancel(self, job):
+        with self._condition:
+            cancelled = self._cancel_locked(job)
+            self._condition.notify_all()
+        return cancelled
+
+    def _cancel_mode(self, mode):
+        with self._condition:
+            for job in [job for job in self._pending if job.mode is mode]:
+                self._cancel_locked(job)
+            self._condition.notify_all()
+
+# Drop-in alias: `from QisGem_Local_Runtime import QiskitRuntimeService`
+QiskitRuntimeService = LocalRuntimeService
+
+
+if __name__ == "__main__":
+    from qiskit import QuantumCircuit
+    from qiskit.quantum_info import SparsePauliOp
+    from qiskit.transpiler.preset_passmanagers import generate_preset_pass_manager
+
+    # episode3: 100-qubit GHZ and its 99 <Z_0 Z_i> correlators, on the offline "ibm_brisbane"
+    # 20 ms of simulated hardware latency per job makes the Session/Batch difference visible below
+    service = QiskitRuntimeService(max_workers=4, max_queue=16, job_overhead_s=0.02)
+    backend = service.backend(name="ibm_brisbane")
+    print(f"{backend.name}: {backend.num_qubits} qubits")
+
+    n = 100
+    qc = QuantumCircuit(n)
+    qc.h(0)
+    for i in range(n - 1):
+        qc.cx(i, i + 1)
+    operators = [SparsePauliOp('Z' + 'I' * i + 'Z' + 'I' * (n - 2 - i)) for i in range(n - 1)]
+    pass_manager = generate_preset_pass_manager(optimization_level=1, backend=backend)
+    qc_transpiled = pass_manager.run(qc)
+    operators_transpiled_list = [op.apply_layout(qc_transpiled.layout) for op in operators]
+
+    options = EstimatorOptions()
+    options.resilience_level = 1
+    options.dynamical_decoupling.enable = True
+    options.dynamical_decoupling.sequence_type = "XY4"
+    estimator = EstimatorV2(backend, options=options)
+    job = estimator.run([(qc_transpiled, operators_transpiled_list)])
+    job_id = job.job_id()
+    values = service.job(job_id).result()[0].data.evs
+    print(f"Job {job_id}: {len(values)} correlators, all equal 1: {bool(np.all(np.isclose(values, 1)))}; {job.metrics()['latency']}")
+
+    # Load test: 40 small sampler jobs through a Batch (up to 4 in parallel) and a Session (one at a time).
+    # 40 jobs > max_queue, so submission also blocks while the queue is full.
+    bell = QuantumCircuit(2)
+    bell.h(0)
+    bell.cx(0, 1)
+    bell.measure_all()
+    isa_bell = pass_manager.run(bell)
+    for mode_class in (Batch, Session):
+        start = time.perf_counter()
+        with mode_class(backend=backend) as mode:
+            sampler = SamplerV2(mode=mode)
+            jobs = [sampler.run([isa_bell], shots=256) for _ in range(40)]
+            counts = jobs[-1].result()[0].data.meas.get_counts()
+        for job in jobs:
+            job.result()
+        report = service.latency_report(jobs)
+        print(f"{mode_class.__name__}: 40 jobs in {time.perf_counter() - start:.2f} s, last counts {counts}; "
+              f"queue wait p50/p95 {report['queue_wait']['p50']:.3f}/{report['queue_wait']['p95']:.3f} s, "
+              f"execution p50 {report['execution']['p50']:.3f} s")
+    service.close()
@@ -0,0 +1,119 @@
+# Compile-once angle sweeps for the rotation gates of L06 (rx, ry, rz) and L08 (cry, crz).
+# The circuit is built with a Qiskit Parameter in place of the angle and transpiled a single time.
+# Every angle of the scan is then bound through Aer's parameter_binds, so the whole scan is one
+# job with one experiment per angle, instead of one build + transpile + run per angle.
+# Results are NumPy arrays whose first axis is the angle index.
+import numpy as np
+from qiskit import QuantumCircuit, transpile
+from qiskit.circuit import Parameter
+from qiskit.quantum_info import SparsePauliOp
+from qiskit_aer import AerSimulator
+
+ROTATION_GATES = {"rx": 1, "ry": 1, "rz": 1, "cry": 2, "crz": 2} # gate -> number of qubits
+
+# Aer 0.16 silently ignores parameter_binds on its native controlled rotations (every experiment
+# comes back with the angle unbound), so these are decomposed into rotations + CX at compile time.
+_UNBINDABLE_GATES = {"crx", "cry", "crz", "cp", "cu", "cu1", "cu3", "mcrx", "mcry", "mcrz", "mcp", "mcu1", "mcu3"}
+
+def build_rotation_circuit(gate, prepare=None, name="theta"):
+    """
+    Returns (qc, theta): a circuit applying gate(theta) and its Parameter.
+    Single-qubit gates act on qubit 0; cry/crz use qubit 0 as control and qubit 1 as target.
+    prepare: optional callable prepare(qc) adding state-preparation gates before the rotation,
+             e.g. lambda qc: qc.h(0) for the L06 Rz-on-|+> example.
+    """
+    if gate not in ROTATION_GATES:
+        raise ValueError(f"Unknown rotation gate '{gate}', expected one of {sorted(ROTATION_GATES)}")
+    theta = Parameter(name)
+    qc = QuantumCircuit(ROTATION_GATES[gate], name=f"{gate}_sweep")
+    if prepare is not None:
+        prepare(qc)
+    getattr(qc, gate)(theta, *range(ROTATION_GATES[gate]))
+    return qc, theta
+
+def _observable_matrix(observable, num_qubits):
+    """Pauli label (Qiskit order: rightmost character is qubit 0) or SparsePauliOp -> dense matrix."""
+    operator = SparsePauliOp(observable) if isinstance(observable, str) else observable
+    if operator.num_qubits != num_qubits:
+        raise ValueError(f"Observable acts on {operator.num_qubits} qubits, circuit has {num_qubits}")
+    return operator.to_matrix()
+
+class ParameterSweep:
+    def __init__(self, qc, parameter=None, backend=None):
+        """
+        qc: circuit with exactly one free Parameter (or pass parameter explicitly), no measurements.
+        The circuit is copied, given a save_statevector instruction and transpiled once here.
+        """
+        if parameter is None:
+            if len(qc.parameters) != 1:
+                raise ValueError(f"Circuit has {len(qc.parameters)} parameters; pass the one to sweep explicitly")
+            parameter = next(iter(qc.parameters))
+        self.parameter = parameter
+        self.num_qubits = qc.num_qubits
+        self.backend = backend or AerSimulator(method="statevector")
+        circuit = qc.copy()
+        circuit.save_statevector()
+        basis_gates = [g for g in self.backend.configuration().basis_gates if g not in _UNBINDABLE_GATES]
+        self.compiled = transpile(circuit, basis_gates=basis_gates)
+
+    def statevectors(self, angles, **run_options):
+        """Final states for every angle in one job: complex array of shape (len(angles), 2**num_qubits)."""
+        angles = np.asarray(angles, dtype=float).reshape(-1)
+        if angles.size == 0:
+            return np.empty((0, 2 ** self.num_qubits), dtype=complex)
+        # parameter_binds wants a plain list; a NumPy array is taken as a single value
+        result = self.backend.run(self.compiled, parameter_binds=[{self.parameter: angles.tolist()}], **run_options).result()
+        statevectors = np.empty((angles.size, 2 ** self.num_qubits), dtype=complex)
+        for i, experiment in enumerate(result.results):
+            statevectors[i] = np.asarray(experiment.data.statevector)
+        return statevectors
+
+    def probabilities(self, angles, **run_options):
+        """Measurement probabilities of every basis state: array of shape (len(angles), 2**num_qubits)."""
+        return np.abs(self.statevectors(angles, **run_options)) ** 2
+
+    def expectation_values(self, angles, observables, **run_options):
+        """
+        <psi(theta)|O|psi(theta)> for every angle.
+        observables: one Pauli label / SparsePauliOp, giving shape (len(angles),),
+                     or a list of them, giving shape (len(angles), len(observables)).
+        """
+        single = isinstance(observables, (str, SparsePauliOp))
+        matrices = np.stack([_observable_matrix(o, self.num_qubits) for o in ([observables] if single else observables)])
+        states = self.statevectors(angles, **run_options)
+        values = np.einsum("ai,oij,aj->ao", states.conj(), matrices, states).real
+        return values[:, 0] if single else values
+
+def sweep_rotation(gate, angles, observables=None, prepare=None, backend=None):
+    """
+    One-call scan of a single rotation gate (see build_rotation_circuit).
+    Returns the statevectors, or the expectation values of observables when given.
+    """
+    qc, theta = build_rotation_circuit(gate, prepare)
+    sweep = ParameterSweep(qc, theta, backend)
+    if observables is None:
+        return sweep.statevectors(angles)
+    return sweep.expectation_values(angles, observables)
+
+
+if __name__ == "__main__":
+    import time
+
+    angles = np.linspace(0, 2 * np.pi, 2001)
+
+    # L06: Ry(theta)|0> has <Z> = cos(theta), <X> = sin(theta)
+    start = time.perf_counter()
+    values = sweep_rotation("ry", angles, ["Z", "X"])
+    print(f"ry sweep over {len(angles)} angles in {time.perf_counter() - start:.3f} s")
+    print(f"  max |<Z> - cos| = {np.abs(values[:, 0] - np.cos(angles)).max():.2e}, "
+          f"max |<X> - sin| = {np.abs(values[:, 1] - np.sin(angles)).max():.2e}")
+
+    # L06: Rz(theta) on |+> rotates around the equator: <X> = cos(theta), <Y> = sin(theta)
+    values = sweep_rotation("rz", angles, ["X", "Y"], prepare=lambda qc: qc.h(0))
+    print(f"rz on |+>: max |<X> - cos| = {np.abs(values[:, 0] - np.cos(angles)).max():.2e}, "
+          f"max |<Y> - sin| = {np.abs(values[:, 1] - np.sin(angles)).max():.2e}")
+
+    # L08: CRY(theta) with control in superposition: P(target = 1) = sin^2(theta/2) / 2
+    states = sweep_rotation("cry", angles, prepare=lambda qc: qc.h(0))
+    p_target_one = (np.abs(states) ** 2)[:, [2, 3]].sum(axis=1) # basis index = 2*q1 + q0
+    print(f"cry: max |P(q1=1) - sin^2(theta/2)/2| = {np.abs(p_target_one - np.sin(angles / 2) ** 2 / 2).max():.2e}")
@@ -0,0 +1,283 @@
+# Persistent, content-addressed cache of simulation results.
+# A deterministic run is fully described by the circuits (QPY-serialized), the backend name and the
+# options that change results, the shots, the seed and the library versions. The SHA-256 of that
+# description is the key; the stored value is an .npz file of NumPy arrays (counts, memory,
+# statevectors, ...). Repeated regression and notebook runs then load results instead of simulating.
+#
+# Safe for several processes sharing one directory:
+#   - entries are written to a temporary file and renamed into place with os.replace (atomic), so a
+#     reader sees either no entry or a complete one;
+#   - eviction and the shared hit/miss counters run under an exclusive fcntl lock on a lock file.
+# Eviction is least-recently-used by file mtime (a hit touches the entry) once the total size
+# exceeds max_bytes. Scanning the directory costs O(entries), so puts do not evict every time: each
+# instance tracks the size seen at its last scan plus what it wrote since, and rescans when that
+# estimate passes max_bytes or every evict_interval puts (other processes write too). Hit/miss
+# counts likewise collect in memory and reach stats.json every stats_flush_interval lookups, on
+# stats() and at exit.
+#
+# Entries are meant to be whole jobs (a batched run, a lesson's circuit list), not single 1-shot
+# rounds: a round simulates faster than its entry is written.
+#
+# Set QIS_RESULT_CACHE=<directory> to enable the cache in QisGem_Statevector_Runner without code changes.
+import atexit
+import contextlib
+import hashlib
+import io
+import json
+import os
+import tempfile
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError: # Windows: entries stay atomic, eviction and shared stats are just not serialised
+    fcntl = None
+
+ENV_VAR = "QIS_RESULT_CACHE"
+DEFAULT_MAX_BYTES = 256 * 2**20
+# Backend options that only affect how fast a run is, not its result
+_EXECUTION_ONLY_OPTIONS = {"max_parallel_threads", "max_parallel_experiments", "max_parallel_shots", "max_memory_mb",
+                           "max_job_size", "max_shot_size", "executor", "fusion_verbose", "mps_log_data",
+                           "mps_omp_threads", "num_threads_per_device", "statevector_parallel_threshold",
+                           "mps_parallel_threshold", "extended_stabilizer_parallel_threshold"}
+
+def circuit_digest(circuits):
+    """
+    SHA-256 hex digest of the QPY serialization of one circuit or a list of circuits.
+    Circuit names are left out: Qiskit numbers unnamed circuits ('circuit-123'), so the same
+    circuit built twice would otherwise never hit.
+    """
+    from qiskit import qpy
+    if not isinstance(circuits, (list, tuple)):
+        circuits = [circuits]
+    buffer = io.BytesIO()
+    qpy.dump([qc.copy(name="qc") for qc in circuits], buffer)
+    return hashlib.sha256(buffer.getvalue()).hexdigest()
+
+def _option_value(value):
+    if hasattr(value, "to_dict"): # NoiseModel: describe it by content, not by object identity
+        description = value.to_dict(serializable=True)
+        # Every QuantumError carries a random id, so the same noise built twice would never hit
+        for error in description.get("errors", []):
+            error.pop("id", None)
+        return description
+    return value
+
+def backend_fingerprint(backend, **run_options):
+    """JSON-able description of the backend and every option that can change a result."""
+    options = dict(backend.options.items())
+    options.update(run_options)
+    return {
+        "backend": backend.name,
+        "options": {k: _option_value(v) for k, v in sorted(options.items()) if k not in _EXECUTION_ONLY_OPTIONS},
+    }
+
+def _library_versions():
+    versions = {}
+    for package in ("qiskit", "qiskit_aer"):
+        try:
+            versions[package] = __import__(package).__version__
+        except ImportError:
+            versions[package] = None
+    return versions
+
+class ResultCache:
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, evict_interval=64, stats_flush_interval=64):
+        """
+        evict_interval: rescan the directory for eviction at least every this many puts.
+        stats_flush_interval: write the shared hit/miss counters every this many lookups.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.evict_interval = evict_interval
+        self.stats_flush_interval = stats_flush_interval
+        os.makedirs(directory, exist_ok=True)
+        self._lock_path = os.path.join(directory, ".lock")
+        self._stats_path = os.path.join(directory, "stats.json")
+        self.hits = 0
+        self.misses = 0
+        self._unflushed = {"hits": 0, "misses": 0} # Lookups not yet added to stats.json
+        self._size_estimate = None # Bytes at the last scan plus bytes put since; None until the first scan
+        self._puts_since_evict = 0
+        atexit.register(self.flush_stats)
+
+    def key(self, circuits=None, backend=None, shots=None, seed=None, circuits_digest=None, **run_options):
+        """
+        Cache key for a run. Pass circuits, or circuits_digest (from circuit_digest) when the caller
+        already has one. run_options are folded into the backend options.
+        """
+        description = {
+            "circuits": circuits_digest or circuit_digest(circuits),
+            "backend": backend_fingerprint(backend, **run_options) if backend is not None else None,
+            "shots": shots,
+            "seed": seed,
+            "versions": _library_versions(),
+        }
+        return hashlib.sha256(json.dumps(description, sort_keys=True, default=repr).encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".npz")
+
+    @contextlib.contextmanager
+    def _locked(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _record(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self._unflushed["hits" if hit else "misses"] += 1
+        if self._unflushed["hits"] + self._unflushed["misses"] >= self.stats_flush_interval:
+            self.flush_stats()
+
+    def flush_stats(self):
+        """Adds this instance's unwritten hits/misses to the counters shared through stats.json."""
+        if not self._unflushed["hits"] and not self._unflushed["misses"]:
+            return
+        with self._locked():
+            stats = self._read_shared_stats()
+            for name, count in self._unflushed.items():
+                stats[name] += count
+            with open(self._stats_path, "w") as f:
+                json.dump(stats, f)
+        self._unflushed = {"hits": 0, "misses": 0}
+
+    def _read_shared_stats(self):
+        try:
+            with open(self._stats_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"hits": 0, "misses": 0}
+
+    def get(self, key):
+        """Returns the stored dict of arrays, or None on a miss."""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+        except (OSError, ValueError): # Missing, or evicted between listing and loading
+            self._record(False)
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path) # Mark as recently used for eviction
+        self._record(True)
+        return arrays
+
+    def put(self, key, **arrays):
+        """Stores arrays under key (atomically) and evicts old entries if the cache may be over budget."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, **arrays)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+        self._puts_since_evict += 1
+        if (self._size_estimate is None or self._size_estimate + size > self.max_bytes
+                or self._puts_since_evict >= self.evict_interval):
+            self.evict()
+        else:
+            self._size_estimate += size
+
+    def _entries(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".npz"):
+                    path = os.path.join(root, name)
+                    with contextlib.suppress(OSError): # Another process may evict it meanwhile
+                        st = os.stat(path)
+                        entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def evict(self):
+        """Removes least recently used entries until the cache fits in max_bytes. Returns the number removed."""
+        with self._locked():
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+                    removed += 1
+                total -= size
+        self._size_estimate = total
+        self._puts_since_evict = 0
+        return removed
+
+    def stats(self):
+        """This instance's hits/misses, the counters shared by every process, and the current size."""
+        self.flush_stats()
+        entries = self._entries()
+        with self._locked():
+            shared = self._read_shared_stats()
+        lookups = self.hits + self.misses
+        shared_lookups = shared["hits"] + shared["misses"]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "shared_hits": shared["hits"],
+            "shared_misses": shared["misses"],
+            "shared_hit_rate": shared["hits"] / shared_lookups if shared_lookups else 0.0,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self):
+        with self._locked():
+            for _, _, path in self._entries():
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+            with contextlib.suppress(OSError):
+                os.remove(self._stats_path)
+        self.hits = 0
+        self.misses = 0
+        self._unflushed = {"hits": 0, "misses": 0}
+        self._size_estimate = 0
+        self._puts_since_evict = 0
+
+_default_cache = None
+
+def default_cache():
+    """The cache in $QIS_RESULT_CACHE, or None when the variable is not set."""
+    global _default_cache
+    directory = os.environ.get(ENV_VAR)
+    if not directory:
+        return None
+    if _default_cache is None or _default_cache.directory != directory:
+        _default_cache = ResultCache(directory)
+    return _default_cache
+
+def memory_to_array(memory):
+    """Aer memory (list of bitstrings) -> fixed-width bytes array, stored without pickling."""
+    width = max((len(shot) for shot in memory), default=1)
+    return np.array(memory, dtype=f"S{width}")
+
+def array_to_memory(array):
+    return [shot.decode() for shot in array.tolist()]
+
+def counts_to_arrays(counts):
+    """{'0101': 12, ...} -> (keys bytes array, values int64 array)."""
+    return memory_to_array(list(counts)), np.array(list(counts.values()), dtype=np.int64)
+
+def arrays_to_counts(keys, values):
+    return dict(zip(array_to_memory(keys), values.tolist()))
@@ -0,0 +1,72 @@
+# Shared statevector runner for the lesson circuits.
+# The lessons used to call simulator_sv.run(qc).result().get_statevector(qc) once per circuit, paying
+# the job set-up cost (backend options, result object, thread pool) every time. Here the whole list
+# of circuits is submitted as one multi-experiment job and the statevectors come back as one stacked
+# NumPy array: row i is the final state of circuits[i], in Qiskit's little-endian basis order.
+# A lesson that batches its examples builds every circuit first, fetches all the states with one
+# run_statevector_objects call, and then prints or plots each example's state in its own section.
+# With a QisGem_Result_Cache.ResultCache (or QIS_RESULT_CACHE set), repeated runs of the same
+# circuits load their statevectors from disk instead of simulating.
+import numpy as np
+from qiskit.quantum_info import Statevector
+from qiskit_aer import Aer
+from QisGem_Result_Cache import default_cache
+
+_backend = None
+
+def get_statevector_backend():
+    """The 'statevector_simulator' backend, created once and shared by every caller."""
+    global _backend
+    if _backend is None:
+        _backend = Aer.get_backend('statevector_simulator')
+    return _backend
+
+def _is_deterministic(circuits, backend, run_options):
+    """Measurements and resets make the final state random unless the simulator seed is fixed."""
+    if "seed_simulator" in run_options or backend.options.get("seed_simulator") is not None:
+        return True
+    return not any(instruction.operation.name in ("measure", "reset") for qc in circuits for instruction in qc.data)
+
+def run_statevectors(circuits, backend=None, cache=None, **run_options):
+    """
+    Runs every circuit in one job and returns a complex array of shape (len(circuits), 2**num_qubits).
+    All circuits must have the same number of qubits so the rows can be stacked; run separate
+    batches for circuits of different widths.
+    run_options are passed on to backend.run, e.g. max_parallel_experiments=0 to let Aer simulate
+    the experiments of the job in parallel.
+    cache: ResultCache for deterministic runs; defaults to the one in $QIS_RESULT_CACHE, if set.
+    """
+    circuits = list(circuits)
+    if not circuits:
+        return np.empty((0, 0), dtype=complex)
+    widths = {qc.num_qubits for qc in circuits}
+    if len(widths) > 1:
+        raise ValueError(f"Circuits have different qubit counts {sorted(widths)}; batch them separately")
+
+    backend = backend or get_statevector_backend()
+    cache = cache if cache is not None else default_cache()
+    key = None
+    if cache is not None and _is_deterministic(circuits, backend, run_options):
+        key = cache.key(circuits, backend, seed=run_options.get("seed_simulator"), **run_options)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached["statevectors"]
+
+    result = backend.run(circuits, **run_options).result()
+    statevectors = np.empty((len(circuits), 2 ** widths.pop()), dtype=complex)
+    for i in range(len(circuits)):
+        statevectors[i] = np.asarray(result.get_statevector(i))
+    if key is not None:
+        cache.put(key, statevectors=statevectors)
+    return statevectors
+
+def run_statevector(qc, backend=None, cache=None, **run_options):
+    """Single-circuit convenience wrapper; returns a 1-D array."""
+    return run_statevectors([qc], backend, cache, **run_options)[0]
+
+def run_statevector_objects(circuits, backend=None, cache=None, **run_options):
+    """
+    Like run_statevectors (still one job), but returns a list of qiskit Statevector objects, which
+    print as Statevector([...], dims=...) the way result.get_statevector(qc) did in the lessons.
+    """
+    return [Statevector(row) for row in run_statevectors(circuits, backend, cache, **run_options)]